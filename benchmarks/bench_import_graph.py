@@ -0,0 +1,67 @@
+import sys
+import time
+import random
+import argparse
+
+from src.analysis.import_graph import build_import_graph
+
+# Import graph resolution, strongly connected components and transitive
+# closure on a synthetic package tree. Most imports point at modules
+# earlier in the same or a parent package, with a few back edges, so the
+# graph has long chains, hubs and some import cycles.
+# Run with: python -m benchmarks.bench_import_graph --modules 50000
+
+def synthetic_results(modules, imports=6, back_edges=0.01, packages=200, seed=0):
+    rng = random.Random(seed)
+    results = {}
+    names = []
+    for i in range(modules):
+        package = f"pkg_{i % packages}"
+        path = f"{package}/module_{i}.py"
+        dependencies = {"os", "typing"}
+        for _ in range(imports):
+            if names and rng.random() < back_edges:
+                # A module a little later: closes a small cycle
+                target = rng.randrange(i, min(modules, i + 10))
+            elif names:
+                target = rng.randrange(max(0, i - 500), i)
+            else:
+                break
+            dependencies.add(f"pkg_{target % packages}.module_{target}")
+        if rng.random() < 0.1:
+            dependencies.add(f"third_party_{rng.randrange(50)}")
+        results[path] = {"language": "python", "dependencies": sorted(dependencies)}
+        names.append(path)
+    for package in range(min(packages, modules)):
+        results[f"pkg_{package}/__init__.py"] = {"language": "python", "dependencies": []}
+    return results
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+def run(modules, imports=6, seed=0):
+    results = synthetic_results(modules, imports, seed=seed)
+    graph, build = timed(build_import_graph, results)
+    (_, components), scc = timed(graph.components)
+    _, closure = timed(graph.transitive_counts)
+    _, reverse_closure = timed(graph.transitive_counts, reverse=True)
+    return graph, components, {"build": build, "components": scc, "closure": closure,
+                               "reverse_closure": reverse_closure}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the import graph algorithms")
+    parser.add_argument("--modules", type=int, default=50000)
+    parser.add_argument("--imports", type=int, default=6, help="internal imports per module")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    graph, components, timings = run(args.modules, args.imports, args.seed)
+    print(f"{len(graph)} modules, {graph.edge_count()} internal imports, {components} components, "
+          f"{len(graph.cycles())} cycles")
+    for name, seconds in timings.items():
+        print(f"  {name:<16} {seconds * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import sys
+import time
+import random
+import argparse
+
+from src.visualization.graph_builder import DependencyIndex
+
+# Knowledge-graph edge construction: inverted index versus the previous
+# all-pairs comparison. The pairwise version is timed on a sample and
+# extrapolated, since it is quadratic.
+# Run with: python -m benchmarks.bench_knowledge_graph --files 10000
+
+def synthetic_results(file_count, dependency_count=2000, deps_per_file=8, seed=0):
+    rng = random.Random(seed)
+    # Zipf-like popularity so a few dependencies (os, sys, ...) are everywhere
+    dependencies = [f"dep_{i}" for i in range(dependency_count)]
+    popularity = [1.0 / (rank + 1) for rank in range(dependency_count)]
+    return {
+        f"pkg_{i // 100}/module_{i}.py": {"dependencies": sorted(set(rng.choices(dependencies, popularity, k=deps_per_file)))}
+        for i in range(file_count)
+    }
+
+def pairwise_edges(results):
+    edges = {}
+    files = list(results)
+    for file1 in files:
+        for file2 in files:
+            if file1 != file2:
+                shared = set(results[file1]['dependencies']) & set(results[file2]['dependencies'])
+                if shared:
+                    edges[(file1, file2)] = len(shared)
+    return edges
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark knowledge graph edge construction")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--pairwise-sample", type=int, default=500)
+    parser.add_argument("--max-fanout", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--max-pairs", type=int, default=5000000)
+    args = parser.parse_args(argv)
+
+    results = synthetic_results(args.files)
+    index = DependencyIndex()
+    _, build_time = timed(index.update, results)
+    print(f"{args.files} files: index build {build_time:.2f}s")
+    pairs = index.pair_count()
+    if pairs <= args.max_pairs:
+        edges, full_time = timed(index.shared_dependency_edges)
+        print(f"  all shared-dependency edges: {len(edges)} edges in {full_time:.2f}s")
+    else:
+        print(f"  all shared-dependency edges: skipped, {pairs} co-occurrences (raise --max-pairs to run)")
+    sparse, sparse_time = timed(index.shared_dependency_edges, args.max_fanout, args.top_k)
+    print(f"  fanout <= {args.max_fanout}, top {args.top_k} per node: {len(sparse)} edges in {sparse_time:.2f}s")
+
+    sample = dict(list(results.items())[:args.pairwise_sample])
+    _, sample_time = timed(pairwise_edges, sample)
+    estimate = sample_time * (args.files / args.pairwise_sample) ** 2
+    print(f"  pairwise on {args.pairwise_sample} files: {sample_time:.2f}s, "
+          f"extrapolated to {args.files} files: ~{estimate:.0f}s")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import sys
+import argparse
+
+from src.analysis.file_analyzer import FileAnalyzer
+from .synthetic import LANGUAGE_TEMPLATES, generate_language_source, generate_source
+from .bench_engine import best_of
+
+# Per-language cost of FileAnalyzer.analyze_content on large generated
+# sources, with Python through the AST engine as the reference point.
+# Run with: python -m benchmarks.bench_languages --functions 5000
+
+def language_sources(functions):
+    sources = {".py": generate_source(functions)}
+    for extension in LANGUAGE_TEMPLATES:
+        sources[extension] = generate_language_source(extension, functions)
+    return sources
+
+def run(functions, repeat, include_comments=False):
+    analyzer = FileAnalyzer(include_comments, case_sensitive=False)
+    rows = []
+    for extension, content in language_sources(functions).items():
+        file_path = f"generated{extension}"
+        seconds = best_of(repeat, analyzer.analyze_content, content, file_path)
+        lines = content.count('\n')
+        rows.append((analyzer.languages.for_path(file_path).name, extension, lines, seconds))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the per-language analyzers")
+    parser.add_argument("--functions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--include-comments", action="store_true")
+    args = parser.parse_args(argv)
+
+    for name, extension, lines, seconds in run(args.functions, args.repeat, args.include_comments):
+        print(f"{name:<12} {extension:<6} {lines:>8} lines {seconds * 1000:10.1f} ms "
+              f"{lines / seconds if seconds > 0 else 0:12.0f} lines/s")
+
+if __name__ == "__main__":
+    sys.exit(main())
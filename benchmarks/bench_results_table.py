@@ -0,0 +1,56 @@
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from src.analysis.results_table import ResultsTable
+
+# Whole-tree aggregation over the columnar results table: statistics,
+# top-N and full rankings, and the .npz export. The table is built straight
+# from random columns, so a million files do not need a million result dicts.
+# Run with: python -m benchmarks.bench_results_table --files 1000000
+
+def synthetic_table(files, dependencies=5000, deps_per_file=8, seed=0):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, deps_per_file * 2, size=files)
+    offsets = np.zeros(files + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # Zipf-like popularity so a few dependencies are everywhere
+    dependency_ids = np.minimum(rng.zipf(1.3, size=int(offsets[-1])) - 1, dependencies - 1)
+    return ResultsTable([f"pkg_{i // 1000}/module_{i}.py" for i in range(files)],
+                        rng.integers(1, 2000, size=files), rng.integers(1, 10000, size=files),
+                        rng.integers(1, 200, size=files), ["python", "javascript"],
+                        rng.integers(0, 2, size=files), [f"dep_{i}" for i in range(dependencies)], offsets,
+                        dependency_ids)
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+def run(files, top=50):
+    table = synthetic_table(files)
+    timings = {}
+    _, timings["statistics"] = timed(table.statistics)
+    _, timings["top"] = timed(table.top, "complexity", top)
+    _, timings["full_ranking"] = timed(table.ranking, "complexity")
+    _, timings["dependency_counts"] = timed(table.dependency_counts)
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, timings["save"] = timed(table.save, output_dir)
+    return table, timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark aggregation over the columnar results table")
+    parser.add_argument("--files", type=int, default=1000000)
+    parser.add_argument("--top", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    table, timings = run(args.files, args.top)
+    print(f"{len(table)} files, {len(table.dependency_ids)} dependency references")
+    for name, seconds in timings.items():
+        print(f"  {name:<18} {seconds * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.import_graph import build_import_graph
+from src.visualization.knowledge_graph import KnowledgeGraphGenerator
+from src.visualization.word_cloud import WordCloudGenerator
+from .synthetic import generate_codebase, generate_source
+
+# End-to-end benchmark of the analysis, summary, knowledge graph and word
+# cloud stages on a synthetic codebase. The QThread classes are driven by
+# calling run() directly, so no Qt event loop is needed.
+# Run with: python -m benchmarks.run_benchmarks --files 2000 --output bench.json
+# and later: python -m benchmarks.run_benchmarks --files 2000 --baseline bench.json
+
+STAGES = ("analyze_directory", "analyze_content", "generate_summary_report", "function_hotspots", "import_graph",
+          "knowledge_graph", "word_cloud")
+DEFAULT_THRESHOLD = 0.2
+
+class BenchmarkContext:
+    def __init__(self, source_dir, output_dir, args):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.args = args
+        self.results = None
+        self.word_frequencies = None
+        self.function_index = None
+        self.source_bytes = sum(os.path.getsize(os.path.join(root, name))
+                                for root, _, names in os.walk(source_dir) for name in names)
+
+    def analyzer(self):
+        return CodeAnalyzer(self.source_dir, self.output_dir, ['.py'], 0, True, False,
+                            workers=self.args.workers, keep_results=True)
+
+# Each stage returns the number of items it processed, used for throughput
+
+def stage_analyze_directory(context):
+    analyzer = context.analyzer()
+    context.results = analyzer.analyze_directory(context.source_dir)
+    context.word_frequencies = analyzer.token_statistics.frequencies
+    context.function_index = analyzer.function_index
+    return len(context.results)
+
+def stage_analyze_content(context):
+    analyzer = context.analyzer()
+    source = generate_source(context.args.content_functions)
+    analyzer.analyze_content(source)
+    return source.count('\n')
+
+def stage_generate_summary_report(context):
+    context.analyzer().generate_summary_report(context.results)
+    return len(context.results)
+
+def stage_function_hotspots(context):
+    context.function_index.top("cyclomatic", 50)
+    context.function_index.top("cognitive", 50)
+    return len(context.function_index)
+
+def stage_import_graph(context):
+    graph = build_import_graph(context.results, context.source_dir)
+    graph.summary()
+    return len(graph)
+
+def stage_knowledge_graph(context):
+    KnowledgeGraphGenerator(context.results, context.output_dir).run()
+    return len(context.results)
+
+def stage_word_cloud(context):
+    WordCloudGenerator(context.word_frequencies, context.output_dir, "Rectangle").run()
+    return len(context.word_frequencies)
+
+STAGE_FUNCTIONS = {
+    "analyze_directory": (stage_analyze_directory, "files"),
+    "analyze_content": (stage_analyze_content, "lines"),
+    "generate_summary_report": (stage_generate_summary_report, "files"),
+    "function_hotspots": (stage_function_hotspots, "functions"),
+    "import_graph": (stage_import_graph, "modules"),
+    "knowledge_graph": (stage_knowledge_graph, "files"),
+    "word_cloud": (stage_word_cloud, "words"),
+}
+
+def run_stage(name, context, repeat, measure_memory):
+    func, unit = STAGE_FUNCTIONS[name]
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func(context)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    record = {
+        "seconds": best,
+        "runs": timings,
+        "items": items,
+        "unit": unit,
+        "throughput": items / best if best > 0 else None,
+    }
+    if measure_memory:
+        # A separate traced run; tracemalloc slows everything down, so it must
+        # not be part of the timings. Worker processes are not traced.
+        tracemalloc.start()
+        try:
+            func(context)
+            record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    if name == "analyze_directory":
+        record["bytes_per_second"] = context.source_bytes / best if best > 0 else None
+    return record
+
+def run_benchmarks(args):
+    work_dir = tempfile.mkdtemp(prefix="codebase_bench_")
+    try:
+        source_dir = os.path.join(work_dir, "src")
+        output_dir = os.path.join(work_dir, "out")
+        os.makedirs(output_dir)
+        start = time.perf_counter()
+        generate_codebase(source_dir, files=args.files, functions=args.functions, imports=args.imports,
+                          depth=args.depth, fanout=args.fanout, seed=args.seed)
+        generation_time = time.perf_counter() - start
+
+        context = BenchmarkContext(source_dir, output_dir, args)
+        # Later stages consume the analysis results, so it always runs first
+        stages = ["analyze_directory"] + [name for name in args.stages if name != "analyze_directory"]
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "generation_seconds": generation_time,
+                "source_bytes": context.source_bytes,
+            },
+            "params": workload_params(args),
+            "stages": {},
+        }
+        for name in stages:
+            record = run_stage(name, context, args.repeat, not args.no_memory)
+            if name in args.stages:
+                report["stages"][name] = record
+            print(format_record(name, record))
+        return report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def workload_params(args):
+    return {key: getattr(args, key) for key in
+            ("files", "functions", "imports", "depth", "fanout", "seed", "workers", "content_functions")}
+
+def format_record(name, record):
+    line = f"{name:<25} {record['seconds'] * 1000:10.1f} ms"
+    if record["throughput"]:
+        line += f"  {record['throughput']:12.1f} {record['unit']}/s"
+    if "peak_memory_bytes" in record:
+        line += f"  peak {record['peak_memory_bytes'] / (1024 * 1024):8.1f} MiB"
+    return line
+
+def compare_reports(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # Returns a list of human-readable regressions: stages that got slower or
+    # used more memory than the baseline by more than `threshold` (a fraction)
+    regressions = []
+    for name, record in current["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if previous is None:
+            continue
+        for key, label in (("seconds", "time"), ("peak_memory_bytes", "peak memory")):
+            if key not in record or not previous.get(key):
+                continue
+            change = record[key] / previous[key] - 1
+            if change > threshold:
+                regressions.append(f"{name}: {label} {change:+.0%} ({previous[key]:.4g} -> {record[key]:.4g})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis, graph and word cloud pipelines")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--functions", type=int, default=20, help="functions per synthetic module")
+    parser.add_argument("--imports", type=int, default=6, help="stdlib imports per synthetic module")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--content-functions", type=int, default=2000,
+                        help="functions in the single source timed by analyze_content")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory runs")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a stage is flagged (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            print("Warning: baseline was recorded with different parameters", file=sys.stderr)
+        regressions = compare_reports(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import os
+import random
+
+# Synthetic codebases for the benchmarks. Everything is derived from the seed,
+# so two runs with the same parameters analyze byte-identical trees.
+
+FUNCTION_TEMPLATE = '''
+# Helper number {i}
+def function_{i}(items, limit={i}):
+    """Process items for case {i}."""
+    total = 0
+    for item in items:  # iterate
+        if item > limit and item % 3 == 0:
+            total += item
+        elif item == "case {i}":
+            continue
+    while total > limit:
+        total -= limit
+    return total
+'''
+
+STDLIB_MODULES = ("os", "sys", "re", "json", "math", "time", "itertools", "functools", "collections",
+                  "logging", "pathlib", "typing", "subprocess", "random", "hashlib", "datetime")
+
+def generate_source(functions, imports=("os", "sys", "collections")):
+    header = "".join(f"import {module}\n" for module in imports)
+    return header + "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(functions))
+
+# One representative function per language for the per-language analyzer
+# benchmarks: an import header line and a body with comments, strings and the
+# branches and loops the complexity patterns look for.
+LANGUAGE_TEMPLATES = {
+    ".js": ('import {{ {module} }} from "{module}";\n', '''
+// Helper number {i}
+export function function_{i}(items, limit = {i}) {{
+  let total = 0; /* running sum */
+  for (const item of items) {{
+    if (item > limit && item % 3 === 0) {{
+      total += item;
+    }} else if (item === "case {i}") {{
+      continue;
+    }}
+  }}
+  while (total > limit) total -= limit;
+  return items.map((x) => x + total);
+}}
+'''),
+    ".java": ("import java.util.{module};\n", '''
+    // Helper number {i}
+    public static int function{i}(List<Integer> items, int limit) {{
+        int total = 0; /* running sum */
+        for (int item : items) {{
+            if (item > limit && item % 3 == 0) {{
+                total += item;
+            }} else if (String.valueOf(item).equals("case {i}")) {{
+                continue;
+            }}
+        }}
+        while (total > limit) total -= limit;
+        return total;
+    }}
+'''),
+    ".cpp": ("#include <{module}>\n", '''
+// Helper number {i}
+static int function_{i}(const std::vector<int>& items, int limit = {i}) {{
+    int total = 0; /* running sum */
+    for (int item : items) {{
+        if (item > limit && item % 3 == 0) {{
+            total += item;
+        }} else if (item == '{digit}') {{
+            continue;
+        }}
+    }}
+    while (total > limit) total -= limit;
+    return total;
+}}
+'''),
+    ".go": ('import "{module}"\n', '''
+// Helper number {i}
+func function{i}(items []int, limit int) int {{
+	total := 0 /* running sum */
+	for _, item := range items {{
+		if item > limit && item%3 == 0 {{
+			total += item
+		}} else if fmt.Sprint(item) == "case {i}" {{
+			continue
+		}}
+	}}
+	for total > limit {{
+		total -= limit
+	}}
+	return total
+}}
+'''),
+    ".rs": ("use std::{module};\n", '''
+// Helper number {i}
+fn function_{i}<'a>(items: &'a [i32], limit: i32) -> i32 {{
+    let mut total = 0; /* running sum */
+    for item in items {{
+        if *item > limit && item % 3 == 0 {{
+            total += item;
+        }} else if format!("{{}}", item) == "case {i}" {{
+            continue;
+        }}
+    }}
+    while total > limit {{ total -= limit; }}
+    total
+}}
+'''),
+    ".rb": ("require '{module}'\n", '''
+# Helper number {i}
+def function_{i}(items, limit = {i})
+  total = 0
+  items.each do |item|
+    if item > limit && item % 3 == 0
+      total += item
+    elsif item == "case {i}"
+      next
+    end
+  end
+  while total > limit
+    total -= limit
+  end
+  total
+end
+'''),
+}
+
+def generate_language_source(extension, functions, modules=("io", "json", "collections")):
+    header, template = LANGUAGE_TEMPLATES[extension]
+    body = "".join(template.format(i=i, digit=i % 10) for i in range(functions))
+    if extension == ".java":
+        body = "public class Generated {\n" + body + "}\n"
+    return "".join(header.format(module=module) for module in modules) + body
+
+def module_layout(files, depth=3, fanout=4):
+    # Relative module paths spread over a directory tree `depth` levels deep
+    # with `fanout` subdirectories per level
+    paths = []
+    for i in range(files):
+        parts = []
+        n = i
+        for _ in range(depth):
+            parts.append(f"pkg_{n % fanout}")
+            n //= fanout
+        paths.append(os.path.join(*parts, f"module_{i}.py"))
+    return paths
+
+def generate_codebase(root, files=200, functions=20, imports=6, depth=3, fanout=4, seed=0):
+    # Writes the tree under root and returns the list of written paths. Each
+    # module imports a few stdlib modules plus some sibling modules, so the
+    # dependency graph has both hubs and local clusters.
+    rng = random.Random(seed)
+    layout = module_layout(files, depth, fanout)
+    written = []
+    for i, rel_path in enumerate(layout):
+        stdlib = rng.sample(STDLIB_MODULES, min(imports, len(STDLIB_MODULES)))
+        siblings = [f"module_{rng.randrange(files)}" for _ in range(max(1, imports // 3))]
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_source(functions + rng.randrange(max(1, functions // 2)), stdlib + siblings))
+        written.append(path)
+    return written
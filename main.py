@@ -1,8 +1,7 @@
 import sys
 import logging
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
-from src.gui.main_window import MainWindow
+import multiprocessing
+import time
 
 VERSION = "1.0.0"
 
@@ -23,10 +22,20 @@ def check_version():
     return VERSION
 
 def main():
+    if "--headless" in sys.argv[1:]:
+        # The CLI never imports Qt, so it runs without a display
+        from src.cli import main as cli_main
+        sys.exit(cli_main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
+    started = time.perf_counter()
     setup_logging()
     logger = logging.getLogger(__name__)
     
     try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+        from src.gui.main_window import MainWindow
+
         app = QApplication(sys.argv)
         
         current_version = check_version()
@@ -38,7 +47,11 @@ def main():
         
         window = MainWindow(initial_path)
         window.show()
-        
+        logger.info(f"Main window shown {time.perf_counter() - started:.2f}s after start")
+
+        # Load the deferred LLM and plotting libraries in the background
+        QTimer.singleShot(0, window.start_warm_up)
+
         # Check for updates after a short delay to allow the main window to load
         QTimer.singleShot(1000, window.check_for_updates)
         
@@ -48,4 +61,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Needed for the analysis process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
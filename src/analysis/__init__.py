@@ -1,3 +1,21 @@
-from .code_analyzer import CodeAnalyzer
-from .dependency_analyzer import DependencyAnalyzer
-from .complexity_analyzer import ComplexityAnalyzer
\ No newline at end of file
+import importlib
+
+# Resolved on first access so that importing the plain analysis modules (the
+# pipeline, the CLI) does not pull in PyQt through CodeAnalyzer
+_EXPORTS = {
+    "CodeAnalyzer": ".code_analyzer",
+    "AnalysisPipeline": ".pipeline",
+    "FileAnalyzer": ".file_analyzer",
+    "DependencyAnalyzer": ".dependency_analyzer",
+    "ComplexityAnalyzer": ".complexity_analyzer",
+    "LanguageRegistry": ".languages",
+    "ImportGraph": ".import_graph",
+    "ResultsTable": ".results_table",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
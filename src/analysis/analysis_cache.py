@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = ".codebase_analyzer_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def content_hash(content, language=None):
+    digest = hashlib.blake2b(digest_size=20)
+    if language is not None:
+        digest.update(language.encode('utf-8') + b'\0')
+    digest.update(content.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+def stat_path(file_path):
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+# Per-file analysis results keyed by content hash plus the analyzer options, with
+# a path -> (mtime, size, hash) table so unchanged files are served without being read.
+class AnalysisCache:
+    def __init__(self, db_path, options, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.options_key = json.dumps(options, sort_keys=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._used_hashes = set()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS results (
+                content_hash TEXT NOT NULL,
+                options_key TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, options_key)
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT NOT NULL,
+                options_key TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (path, options_key)
+            );
+        ''')
+
+    def lookup_path(self, file_path, stat=None):
+        # Fast path: if mtime and size match the last run, trust the stored hash
+        if stat is None:
+            stat = stat_path(file_path)
+            if stat is None:
+                return None
+        row = self.connection.execute(
+            "SELECT f.content_hash, r.result FROM files f JOIN results r "
+            "ON r.content_hash = f.content_hash AND r.options_key = f.options_key "
+            "WHERE f.path = ? AND f.options_key = ? AND f.mtime_ns = ? AND f.size = ?",
+            (file_path, self.options_key, stat.st_mtime_ns, stat.st_size)).fetchone()
+        if row is None:
+            return None
+        return self._hit(row[0], row[1])
+
+    def lookup_content(self, digest):
+        row = self.connection.execute(
+            "SELECT result FROM results WHERE content_hash = ? AND options_key = ?",
+            (digest, self.options_key)).fetchone()
+        if row is None:
+            return None
+        return self._hit(digest, row[0])
+
+    def previous_result(self, file_path):
+        # Whatever was last recorded for the path, even if the file has changed
+        # since; incremental runs use it to retract the old contribution
+        row = self.connection.execute(
+            "SELECT r.result FROM files f JOIN results r "
+            "ON r.content_hash = f.content_hash AND r.options_key = f.options_key "
+            "WHERE f.path = ? AND f.options_key = ?",
+            (file_path, self.options_key)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    # stat is taken before the file is read: a write that lands during the
+    # read then leaves the recorded mtime behind and the file is read again
+    # on the next run, where a later stat would vouch for the new content
+    def store(self, file_path, digest, result, stat):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (content_hash, options_key, result, last_used) VALUES (?, ?, ?, ?)",
+            (digest, self.options_key, json.dumps(result), time.time()))
+        self.remember_path(file_path, digest, stat)
+
+    def remember_path(self, file_path, digest, stat):
+        if stat is None:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, options_key, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?, ?)",
+            (file_path, self.options_key, stat.st_mtime_ns, stat.st_size, digest))
+
+    def analyze_file(self, file_path, file_analyzer):
+        stat = stat_path(file_path)
+        result = self.lookup_path(file_path, stat) if stat is not None else None
+        if result is not None:
+            return result
+
+        content = file_analyzer.read_file(file_path)
+        if content is None:
+            return None
+        digest = file_analyzer.content_key(content, file_path)
+        result = self.lookup_content(digest)
+        if result is not None:
+            # Same content under a new mtime (touched, checked out again, renamed)
+            self.remember_path(file_path, digest, stat)
+            return result
+
+        self.misses += 1
+        result = file_analyzer.analyze_content(content, file_path)
+        self.store(file_path, digest, result, stat)
+        return result
+
+    def _hit(self, digest, payload):
+        self.hits += 1
+        self._used_hashes.add(digest)
+        return json.loads(payload)
+
+    def evict(self):
+        count, total_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(result)), 0) FROM results").fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        rows = self.connection.execute(
+            "SELECT content_hash, options_key, LENGTH(result) FROM results ORDER BY last_used ASC").fetchall()
+        for digest, options_key, size in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            self.connection.execute(
+                "DELETE FROM results WHERE content_hash = ? AND options_key = ?", (digest, options_key))
+            count -= 1
+            total_bytes -= size
+            evicted += 1
+
+        self.connection.execute(
+            "DELETE FROM files WHERE NOT EXISTS (SELECT 1 FROM results r "
+            "WHERE r.content_hash = files.content_hash AND r.options_key = files.options_key)")
+        return evicted
+
+    def close(self):
+        if self._used_hashes:
+            now = time.time()
+            self.connection.executemany(
+                "UPDATE results SET last_used = ? WHERE content_hash = ? AND options_key = ?",
+                ((now, digest, self.options_key) for digest in self._used_hashes))
+            self._used_hashes.clear()
+        evicted = self.evict()
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from analysis cache {self.db_path}")
+        self.connection.commit()
+        self.connection.close()
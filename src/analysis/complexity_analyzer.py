@@ -1,28 +1,197 @@
 import ast
+from .engine import MetricVisitor
 
 class ComplexityAnalyzer:
     def calculate_complexity(self, code):
         tree = ast.parse(code)
         analyzer = ComplexityVisitor()
-        analyzer.visit(tree)
-        return analyzer.complexity
+        return analyzer.visit(tree)
+
+# File complexity: 1, plus one per function, plus the decision points of
+# McCabe's cyclomatic complexity (branches, loops, except clauses, match
+# cases, conditional expressions, comprehension loops and filters, and each
+# extra operand of `and`/`or`).
+class ComplexityVisitor(MetricVisitor):
+    name = "complexity"
 
-class ComplexityVisitor(ast.NodeVisitor):
     def __init__(self):
         self.complexity = 1
 
+    def result(self):
+        return self.complexity
+
     def visit_If(self, node):
         self.complexity += 1
-        self.generic_visit(node)
 
     def visit_For(self, node):
         self.complexity += 1
-        self.generic_visit(node)
 
     def visit_While(self, node):
         self.complexity += 1
-        self.generic_visit(node)
 
     def visit_FunctionDef(self, node):
         self.complexity += 1
-        self.generic_visit(node)
\ No newline at end of file
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_AsyncFor = visit_For
+    visit_IfExp = visit_If
+    visit_ExceptHandler = visit_If
+    visit_match_case = visit_If
+
+    def visit_BoolOp(self, node):
+        self.complexity += len(node.values) - 1
+
+    def visit_comprehension(self, node):
+        self.complexity += 1 + len(node.ifs)
+
+FUNCTION_KINDS = ("function", "method", "class")
+# Layout of a row in FunctionMetricsVisitor results (and the cached results)
+FUNCTION_FIELDS = ("name", "kind", "line", "end_line", "statements", "cyclomatic", "cognitive", "nesting")
+
+class _Scope:
+    __slots__ = ("name", "kind", "node", "cyclomatic", "cognitive", "nesting", "max_nesting")
+
+    def __init__(self, name, kind, node):
+        self.name = name
+        self.kind = kind
+        self.node = node
+        self.cyclomatic = 1 if kind != "class" else 0
+        self.cognitive = 0
+        self.nesting = 0
+        self.max_nesting = 0
+
+def count_statements(node, into_functions=False):
+    # Statements in a definition's body, not descending into nested
+    # functions unless asked to (a class counts its methods)
+    count = 0
+    stack = list(node.body)
+    while stack:
+        statement = stack.pop()
+        count += 1
+        if not into_functions and isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for field in ('body', 'orelse', 'finalbody'):
+            children = getattr(statement, field, None)
+            if isinstance(children, list):
+                stack.extend(children)
+        for clause in getattr(statement, 'handlers', None) or getattr(statement, 'cases', None) or ():
+            stack.extend(clause.body)
+    return count
+
+# One row per function, method and class, computed in the engine's walk:
+# cyclomatic complexity (as above, per function), cognitive complexity (each
+# branch or loop costs 1 plus its nesting level; `elif`/`else` and each
+# boolean operator sequence cost 1), the deepest control-flow nesting, the
+# number of statements and the line span. Decisions in a nested function
+# count towards it, not the enclosing one. A class row sums its methods.
+class FunctionMetricsVisitor(MetricVisitor):
+    name = "functions"
+
+    def __init__(self):
+        self.rows = []
+        self.scopes = []
+        # If nodes that are the `elif` of their parent
+        self._elifs = set()
+
+    def result(self):
+        return self.rows
+
+    def _open(self, node, kind):
+        parent = self.scopes[-1] if self.scopes else None
+        if kind == "function" and parent is not None and parent.kind == "class":
+            kind = "method"
+        name = f"{parent.name}.{node.name}" if parent is not None else node.name
+        self.scopes.append(_Scope(name, kind, node))
+
+    def _close(self, node):
+        scope = self.scopes.pop()
+        parent = self.scopes[-1] if self.scopes else None
+        if parent is not None and parent.kind == "class" and scope.kind == "method":
+            parent.cyclomatic += scope.cyclomatic
+            parent.cognitive += scope.cognitive
+            parent.max_nesting = max(parent.max_nesting, scope.max_nesting)
+        statements = count_statements(node, into_functions=scope.kind == "class")
+        self.rows.append([scope.name, scope.kind, node.lineno, node.end_lineno, statements,
+                          scope.cyclomatic, scope.cognitive, scope.max_nesting])
+
+    def visit_FunctionDef(self, node):
+        self._open(node, "function")
+
+    def leave_FunctionDef(self, node):
+        self._close(node)
+
+    def visit_ClassDef(self, node):
+        self._open(node, "class")
+
+    def leave_ClassDef(self, node):
+        self._close(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    # Structures that nest: If, loops, except clauses and match
+
+    def _enter_block(self, cyclomatic=1):
+        if not self.scopes:
+            return
+        scope = self.scopes[-1]
+        scope.cyclomatic += cyclomatic
+        scope.cognitive += 1 + scope.nesting
+        scope.nesting += 1
+        scope.max_nesting = max(scope.max_nesting, scope.nesting)
+
+    def _leave_block(self, node=None):
+        if self.scopes:
+            self.scopes[-1].nesting -= 1
+
+    def visit_If(self, node):
+        orelse = node.orelse
+        if len(orelse) == 1 and isinstance(orelse[0], ast.If):
+            self._elifs.add(id(orelse[0]))
+        elif orelse and self.scopes:
+            self.scopes[-1].cognitive += 1  # else
+        if id(node) in self._elifs:
+            # Same nesting as its `if`, which is still open
+            if self.scopes:
+                self.scopes[-1].cyclomatic += 1
+                self.scopes[-1].cognitive += 1
+            return
+        self._enter_block()
+
+    def leave_If(self, node):
+        if id(node) in self._elifs:
+            self._elifs.discard(id(node))
+            return
+        self._leave_block()
+
+    def visit_For(self, node):
+        self._enter_block()
+
+    visit_AsyncFor = visit_While = visit_ExceptHandler = visit_For
+    leave_For = leave_AsyncFor = leave_While = leave_ExceptHandler = _leave_block
+
+    def visit_Match(self, node):
+        # The cases add to cyclomatic complexity, the match to cognitive
+        self._enter_block(cyclomatic=0)
+
+    leave_Match = _leave_block
+
+    def visit_match_case(self, node):
+        if self.scopes:
+            self.scopes[-1].cyclomatic += 1
+
+    def visit_IfExp(self, node):
+        if self.scopes:
+            scope = self.scopes[-1]
+            scope.cyclomatic += 1
+            scope.cognitive += 1 + scope.nesting
+
+    def visit_BoolOp(self, node):
+        if self.scopes:
+            self.scopes[-1].cyclomatic += len(node.values) - 1
+            self.scopes[-1].cognitive += 1
+
+    def visit_comprehension(self, node):
+        if self.scopes:
+            self.scopes[-1].cyclomatic += 1 + len(node.ifs)
+            self.scopes[-1].cognitive += 1 + len(node.ifs)
@@ -1,14 +1,38 @@
 import re
+from .engine import MetricVisitor
+
+IMPORT_PATTERN = re.compile(r'^(?:from\s+(\S+)\s+)?import\s+(.+)$', re.MULTILINE)
 
 class DependencyAnalyzer:
     def analyze_dependencies(self, code):
         dependencies = []
-        import_pattern = re.compile(r'^(?:from\s+(\S+)\s+)?import\s+(.+)$', re.MULTILINE)
-        
-        for match in import_pattern.finditer(code):
+        for match in IMPORT_PATTERN.finditer(code):
             if match.group(1):  # from ... import ...
                 dependencies.append(match.group(1))
-            else:  # import ...
-                dependencies.extend(name.strip() for name in match.group(2).split(','))
+            else:  # import ..., keeping the module of `module as alias`
+                dependencies.extend(name.split()[0] for name in match.group(2).split(',') if name.strip())
         
-        return list(set(dependencies))  # Remove duplicates
\ No newline at end of file
+        return sorted(set(dependencies))  # Remove duplicates, keep output deterministic
+
+# AST-based import collection used by the analysis engine. Unlike the regex it
+# sees imports nested in functions.
+class ImportVisitor(MetricVisitor):
+    name = "dependencies"
+
+    def __init__(self):
+        self.modules = set()
+
+    def result(self):
+        return sorted(self.modules)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.modules.add(alias.name)
+
+    def visit_ImportFrom(self, node):
+        if node.module is None:
+            # `from . import name`: name is usually a sibling module, which the
+            # import graph resolves (or falls back to the package) from here
+            self.modules.update('.' * node.level + alias.name for alias in node.names)
+        else:
+            self.modules.add('.' * node.level + node.module)
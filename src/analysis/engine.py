@@ -0,0 +1,181 @@
+import ast
+import gc
+import re
+from contextlib import contextmanager
+from ..utils.metrics import NULL_METRICS
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# A single scan that recognises string literals, triple-quoted strings and
+# comments together, so a '#' inside a string is never mistaken for a comment.
+# Ordinary strings are kept; comments and triple-quoted strings are dropped.
+_LEXER_PATTERN = re.compile(r'''
+    (?P<triple>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\')
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<comment>\#[^\n]*)
+''', re.VERBOSE)
+
+def strip_comments(content):
+    # Unmatched groups expand to '' so only ordinary strings survive the substitution
+    return _LEXER_PATTERN.sub(r'\g<string>', content)
+
+def count_lines(content):
+    if not content:
+        return 0
+    return content.count('\n') + (not content.endswith('\n'))
+
+# Base class for metrics computed during the engine's single AST walk. Subclasses
+# define visit_<NodeType>(node) hooks, called when the walk enters a node, and
+# optionally leave_<NodeType>(node) hooks, called after its children. Hooks must
+# not recurse themselves. Unless some visitor has a leave_ hook on an expression
+# type, expression hooks run right after their statement's visit_ hooks, in no
+# particular order among themselves.
+class MetricVisitor:
+    name = None
+
+    def result(self):
+        raise NotImplementedError
+
+    def visit(self, tree):
+        walk_tree(tree, [self])
+        return self.result()
+
+_hook_cache = {}
+
+# Node types that can contain statements. When every hook targets one of these
+# the walk never descends into expressions, which are most of the tree.
+# match_case only exists from Python 3.10.
+_STATEMENT_LEVEL_TYPES = (ast.mod, ast.stmt, ast.excepthandler)
+if hasattr(ast, 'match_case'):
+    _STATEMENT_LEVEL_TYPES += (ast.match_case,)
+_STATEMENT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+def _is_statement_level(node_type):
+    node_class = getattr(ast, node_type, None)
+    return isinstance(node_class, type) and issubclass(node_class, _STATEMENT_LEVEL_TYPES)
+
+def _iter_child_statements(node):
+    for field in _STATEMENT_FIELDS:
+        children = getattr(node, field, None)
+        if children and isinstance(children, list):
+            yield from children
+
+def _hooks_for(visitor_class):
+    hooks = _hook_cache.get(visitor_class)
+    if hooks is None:
+        hooks = [(attr.split('_', 1)[0], attr.split('_', 1)[1], attr)
+                 for attr in dir(visitor_class)
+                 if attr.startswith(('visit_', 'leave_')) and callable(getattr(visitor_class, attr))]
+        _hook_cache[visitor_class] = hooks
+    return hooks
+
+_expression_fields = {}
+
+def _fields_of(node_class):
+    fields = _expression_fields.get(node_class)
+    if fields is None:
+        # The Load/Store context is a shared leaf on every name
+        fields = _expression_fields[node_class] = tuple(field for field in node_class._fields if field != 'ctx')
+    return fields
+
+def _walk_expressions(node, enter):
+    # The expressions below a statement, in no particular order (a stack is
+    # much cheaper than recursion here and expression hooks only count).
+    # Expressions cannot contain statements, so nothing is missed.
+    stack = []
+    for field in node._fields:
+        if field not in _STATEMENT_FIELDS:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                stack.extend(value)
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+    while stack:
+        node = stack.pop()
+        node_class = type(node)
+        # Lists also hold names (Global, MatchClass) and None (dict unpacking)
+        if not issubclass(node_class, ast.AST):
+            continue
+        hooks = enter.get(node_class.__name__)
+        if hooks:
+            for hook in hooks:
+                hook(node)
+        for field in _fields_of(node_class):
+            value = getattr(node, field, None)
+            if type(value) is list:
+                stack.extend(value)
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+
+def walk_tree(tree, visitors):
+    enter = {}
+    leave = {}
+    for visitor in visitors:
+        for kind, node_type, attr in _hooks_for(type(visitor)):
+            table = enter if kind == 'visit' else leave
+            table.setdefault(node_type, []).append(getattr(visitor, attr))
+
+    statement_walk = all(_is_statement_level(node_type) for node_type in leave)
+    expression_hooks = {node_type: hooks for node_type, hooks in enter.items() if not _is_statement_level(node_type)}
+    if not statement_walk:
+        iter_child_nodes = ast.iter_child_nodes
+    else:
+        # Statements are walked with enter and leave hooks; expression hooks
+        # (enter only) run over each statement's expressions once its own
+        # enter hooks have run, so they see the same enclosing state
+        iter_child_nodes = _iter_child_statements
+
+    def walk(node):
+        node_type = type(node).__name__
+        hooks = enter.get(node_type)
+        if hooks:
+            for hook in hooks:
+                hook(node)
+        if statement_walk and expression_hooks:
+            _walk_expressions(node, expression_hooks)
+        for child in iter_child_nodes(node):
+            walk(child)
+        hooks = leave.get(node_type)
+        if hooks:
+            for hook in hooks:
+                hook(node)
+
+    walk(tree)
+
+# ast.parse allocates hundreds of thousands of acyclic nodes on large files and
+# the cyclic collector repeatedly rescans them; pausing it roughly halves parse time.
+@contextmanager
+def gc_paused():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+# Parses a file once and runs every registered MetricVisitor over the same tree,
+# so adding a metric adds a hook rather than another pass over the source.
+class AnalysisEngine:
+    def __init__(self, visitor_classes=()):
+        self.visitor_classes = list(visitor_classes)
+
+    def register(self, visitor_class):
+        if visitor_class not in self.visitor_classes:
+            self.visitor_classes.append(visitor_class)
+
+    def analyze(self, content, metrics=NULL_METRICS):
+        with gc_paused():
+            with metrics.timer("parse"):
+                tree = ast.parse(content)
+            with metrics.timer("visit"):
+                result = self.analyze_tree(tree)
+            # Free the tree while collection is still paused, otherwise the
+            # first collection after gc.enable() traverses the whole AST
+            del tree
+        return result
+
+    def analyze_tree(self, tree):
+        visitors = [visitor_class() for visitor_class in self.visitor_classes]
+        walk_tree(tree, visitors)
+        return {visitor.name: visitor.result() for visitor in visitors}
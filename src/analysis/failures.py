@@ -0,0 +1,100 @@
+import signal
+import threading
+from contextlib import contextmanager
+
+# Per-file failure isolation. A file that raises, runs past its time budget
+# or is too large to analyze gets a None result and an entry in the run's
+# FailureLog; the rest of the run carries on.
+
+DEFAULT_TIME_BUDGET = 30.0
+# Failures listed by name in the report; the rest are only counted
+REPORT_LIMIT = 20
+
+ERROR = "error"
+TIMEOUT = "timeout"
+TOO_LARGE = "too_large"
+
+class AnalysisTimeout(Exception):
+    pass
+
+class FileTooLarge(Exception):
+    pass
+
+# Interrupts the block with AnalysisTimeout after `seconds`. It relies on
+# SIGALRM, so it only applies on the main thread of a process: the CLI and
+# the worker processes of a parallel run. Elsewhere (the GUI's analysis
+# thread) the block runs unbounded. The alarm is delivered between Python
+# bytecodes, so a single long C call (ast.parse of a huge file) finishes
+# first; the size budget keeps those calls bounded.
+@contextmanager
+def time_budget(seconds):
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise AnalysisTimeout(f"took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def describe_failure(error):
+    # (reason, message) for a failed file; plain tuples so they pickle back
+    # from worker processes
+    if isinstance(error, AnalysisTimeout):
+        return TIMEOUT, str(error)
+    if isinstance(error, FileTooLarge):
+        return TOO_LARGE, str(error)
+    return ERROR, f"{type(error).__name__}: {error}"
+
+class FailureLog:
+    def __init__(self):
+        # file_path -> (reason, message)
+        self.failures = {}
+        # Set when the run itself stopped early; its results are partial
+        self.aborted = None
+
+    def add(self, file_path, reason, message):
+        self.failures[file_path] = (reason, message)
+
+    def discard(self, file_path):
+        self.failures.pop(file_path, None)
+
+    def __len__(self):
+        return len(self.failures)
+
+    def counts(self):
+        counts = {}
+        for reason, _ in self.failures.values():
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+    def summary(self):
+        parts = [f"{count} {reason.replace('_', ' ')}" for reason, count in sorted(self.counts().items())]
+        line = f"{len(self.failures)} files not analyzed ({', '.join(parts)})" if parts else ""
+        if self.aborted:
+            line = f"{line}; analysis stopped early: {self.aborted}" if line else f"Analysis stopped early: {self.aborted}"
+        return line
+
+    def report(self):
+        if not self.failures and not self.aborted:
+            return ""
+        report = f"\nFiles not analyzed\n------------------\n{self.summary()}\n"
+        for file_path, (reason, message) in sorted(self.failures.items())[:REPORT_LIMIT]:
+            report += f"  {file_path}: {message}\n"
+        if len(self.failures) > REPORT_LIMIT:
+            report += f"  ... and {len(self.failures) - REPORT_LIMIT} more\n"
+        return report
+
+    def as_dict(self):
+        return {
+            "counts": self.counts(),
+            "aborted": self.aborted,
+            "files": [{"path": file_path, "reason": reason, "message": message}
+                      for file_path, (reason, message) in sorted(self.failures.items())],
+        }
@@ -0,0 +1,118 @@
+from collections import Counter
+from ..utils.file_utils import safe_read_file
+from ..utils.metrics import NULL_METRICS
+from .dependency_analyzer import DependencyAnalyzer
+from .complexity_analyzer import ComplexityAnalyzer
+from .analysis_cache import content_hash
+from .engine import WORD_PATTERN, count_lines
+from .languages import default_registry
+from .failures import DEFAULT_TIME_BUDGET, FileTooLarge, time_budget, describe_failure
+
+# Bump whenever analyze_content output changes so cached results are invalidated
+ANALYZER_VERSION = 6
+
+# Plain (non-Qt) per-file analysis, kept separate from CodeAnalyzer so it can be
+# pickled and shipped to worker processes.
+class FileAnalyzer:
+    def __init__(self, include_comments, case_sensitive, metrics=NULL_METRICS, time_budget=DEFAULT_TIME_BUDGET,
+                 max_content_size=None):
+        self.include_comments = include_comments
+        self.case_sensitive = case_sensitive
+        self.metrics = metrics
+        # Per-file budgets: seconds of analysis and characters of content;
+        # 0 or None means unlimited
+        self.time_budget = time_budget
+        self.max_content_size = max_content_size
+        self.dependency_analyzer = DependencyAnalyzer()
+        self.complexity_analyzer = ComplexityAnalyzer()
+        # Dependencies and complexity come from the analyzer registered for the
+        # file's extension; Python (and content without a path) uses the engine
+        self.languages = default_registry()
+        self.engine = self.languages.get("python").engine
+
+    def __getstate__(self):
+        # Metrics (and their profiler) stay in the parent process
+        state = self.__dict__.copy()
+        state["metrics"] = NULL_METRICS
+        return state
+
+    def read_file(self, file_path):
+        with self.metrics.timer("read"):
+            content = safe_read_file(file_path)
+        if content is not None:
+            self.metrics.count("chars_read", len(content))
+        return content
+
+    def analyze_file(self, file_path):
+        content = self.read_file(file_path)
+        if content is None:
+            return None
+        return self.analyze_content(content, file_path)
+
+    def analyze_file_with_hash(self, file_path):
+        content = self.read_file(file_path)
+        if content is None:
+            return None, None
+        return self.content_key(content, file_path), self.analyze_content(content, file_path)
+
+    # What a worker process runs: (digest, result, failure) where failure is
+    # None or a (reason, message) pair, so one bad file cannot fail its chunk
+    def analyze_file_isolated(self, file_path):
+        try:
+            with time_budget(self.time_budget):
+                digest, result = self.analyze_file_with_hash(file_path)
+        except Exception as e:
+            return None, None, describe_failure(e)
+        return digest, result, None
+
+    # Cache key for content read from file_path. The same text is analyzed
+    # differently depending on its language, so the language is part of it.
+    def content_key(self, content, file_path=None):
+        return content_hash(content, self.languages.for_path(file_path).name)
+
+    def cache_options(self):
+        return {
+            "include_comments": self.include_comments,
+            "case_sensitive": self.case_sensitive,
+            "analyzer_version": ANALYZER_VERSION
+        }
+
+    # file_path only selects the language; without one the content is Python
+    def analyze_content(self, content, file_path=None):
+        # Imports and complexity come from one pass over the original source;
+        # comment stripping and case folding only affect the text metrics.
+        if self.max_content_size and len(content) > self.max_content_size:
+            raise FileTooLarge(f"{len(content)} characters is over the {self.max_content_size} limit")
+        language = self.languages.for_path(file_path)
+        metrics = language.analyze(content, self.metrics)
+        dependencies = metrics["dependencies"]
+
+        if not self.include_comments:
+            with self.metrics.timer("remove_comments"):
+                content = language.strip_comments(content)
+
+        if not self.case_sensitive:
+            content = content.lower()
+            dependencies = sorted({dependency.lower() for dependency in dependencies})
+
+        with self.metrics.timer("tokenize"):
+            words = WORD_PATTERN.findall(content)
+            word_frequencies = dict(Counter(words))
+
+        result = {
+            "language": language.name,
+            "dependencies": dependencies,
+            "complexity": metrics["complexity"],
+            "lines_of_code": count_lines(content),
+            "word_count": len(words),
+            # Merged into TokenStatistics by CodeAnalyzer instead of keeping the content
+            "word_frequencies": word_frequencies
+        }
+        if "functions" in metrics:
+            # Rows of complexity_analyzer.FUNCTION_FIELDS, moved into the
+            # pipeline's FunctionIndex
+            result["functions"] = metrics["functions"]
+        return result
+
+    def remove_comments(self, content, file_path=None):
+        return self.languages.for_path(file_path).strip_comments(content)
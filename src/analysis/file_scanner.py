@@ -0,0 +1,196 @@
+import os
+import re
+import fnmatch
+
+DEFAULT_EXCLUDED_DIRS = (
+    '.git', '.hg', '.svn', 'node_modules', 'venv', '.venv', 'env', '__pycache__',
+    'build', 'dist', 'target', '.tox', '.nox', '.mypy_cache', '.pytest_cache',
+    '.ruff_cache', '.idea', '.vscode', '*.egg-info'
+)
+DEFAULT_MAX_FILE_SIZE = 5 * 1024 * 1024
+IGNORE_FILENAMES = ('.gitignore',)
+BINARY_SNIFF_BYTES = 4096
+
+def _translate_glob(pattern):
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            regex += '[' + pattern[i + 1:end].replace('!', '^', 1) + ']'
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+# The commonly used subset of .gitignore syntax: comments, `!` negation,
+# trailing `/` for directories only, leading or inner `/` anchoring and `**`.
+class IgnorePatterns:
+    def __init__(self, lines, base=''):
+        self.base = base
+        self.rules = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            prefix = '^' if anchored else '^(?:.*/)?'
+            self.rules.append((re.compile(prefix + _translate_glob(line) + '$'), negated, dir_only))
+
+    @classmethod
+    def from_file(cls, path, base=''):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f.readlines(), base)
+        except OSError:
+            return cls([], base)
+
+    # True if ignored, False if re-included by a negation, None if no rule applies
+    def match(self, rel_path, is_dir):
+        if self.base:
+            rel_path = rel_path[len(self.base) + 1:]
+        decision = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                decision = not negated
+        return decision
+
+# Directory walker built on os.scandir that prunes excluded and ignored
+# directories before descending into them.
+class FileScanner:
+    def __init__(self, file_extensions, excluded_dirs=DEFAULT_EXCLUDED_DIRS, max_depth=None,
+                 max_file_size=DEFAULT_MAX_FILE_SIZE, skip_binary=True, use_ignore_files=True):
+        self.file_extensions = tuple(file_extensions)
+        # Single-dot extensions are looked up by suffix; anything else (".tar.gz")
+        # falls back to endswith
+        self._suffixes = {ext for ext in self.file_extensions if ext.startswith('.') and ext.count('.') == 1}
+        self._other_extensions = tuple(ext for ext in self.file_extensions if ext not in self._suffixes)
+        excluded_dirs = tuple(excluded_dirs or ())
+        self._excluded_names = {name for name in excluded_dirs if not any(c in name for c in '*?[')}
+        globs = [fnmatch.translate(name) for name in excluded_dirs if name not in self._excluded_names]
+        self._excluded_glob = re.compile('|'.join(globs)) if globs else None
+        self.max_depth = max_depth or None
+        self.max_file_size = max_file_size
+        self.skip_binary = skip_binary
+        self.use_ignore_files = use_ignore_files
+        self.skipped = {"excluded": 0, "ignored": 0, "too_large": 0, "binary": 0}
+
+    def matches(self, name):
+        dot = name.rfind('.')
+        if dot >= 0 and name[dot:] in self._suffixes:
+            return True
+        return bool(self._other_extensions) and name.endswith(self._other_extensions)
+
+    def is_excluded_dir(self, name):
+        return name in self._excluded_names or (self._excluded_glob is not None and self._excluded_glob.match(name) is not None)
+
+    # The scan() rules for a '/'-separated path that is not on the local disk,
+    # such as an archive member
+    def matches_path(self, rel_path):
+        parts = rel_path.split('/')
+        if self.max_depth is not None and len(parts) > self.max_depth:
+            return False
+        if any(self.is_excluded_dir(part) for part in parts[:-1]):
+            return False
+        return self.matches(parts[-1])
+
+    # Yields matching file paths in the same top-down order as os.walk
+    def scan(self, root):
+        self.skipped = dict.fromkeys(self.skipped, 0)
+        stack = [(root, '', 1, ())]
+        while stack:
+            directory, rel_dir, depth, ignore_rules = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+
+            if self.use_ignore_files:
+                for entry in entries:
+                    if entry.name in IGNORE_FILENAMES:
+                        ignore_rules = ignore_rules + (IgnorePatterns.from_file(entry.path, rel_dir),)
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+                if is_dir:
+                    if self.is_excluded_dir(entry.name):
+                        self.skipped["excluded"] += 1
+                    elif self._is_ignored(ignore_rules, rel_path, True):
+                        self.skipped["ignored"] += 1
+                    elif not entry.is_symlink() and (self.max_depth is None or depth < self.max_depth):
+                        subdirs.append((entry.path, rel_path, depth + 1, ignore_rules))
+                elif self.matches(entry.name):
+                    if self._is_ignored(ignore_rules, rel_path, False):
+                        self.skipped["ignored"] += 1
+                    elif self._accept_entry(entry):
+                        yield entry.path
+
+            stack.extend(reversed(subdirs))
+
+    def _is_ignored(self, ignore_rules, rel_path, is_dir):
+        ignored = False
+        for rules in ignore_rules:
+            decision = rules.match(rel_path, is_dir)
+            if decision is not None:
+                ignored = decision
+        return ignored
+
+    def _accept_entry(self, entry):
+        try:
+            size = entry.stat().st_size if self.max_file_size else None
+        except OSError:
+            return False
+        return self.accept_file(entry.path, size)
+
+    # Size and binary checks for a file that has already matched by name
+    def accept_file(self, path, size=None):
+        if self.max_file_size:
+            if size is None:
+                try:
+                    size = os.stat(path).st_size
+                except OSError:
+                    return False
+            if size > self.max_file_size:
+                self.skipped["too_large"] += 1
+                return False
+        if self.skip_binary and is_binary_file(path):
+            self.skipped["binary"] += 1
+            return False
+        return True
+
+def is_binary_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return b'\0' in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return False
@@ -0,0 +1,109 @@
+import heapq
+from array import array
+from .complexity_analyzer import FUNCTION_FIELDS, FUNCTION_KINDS
+
+# Repository-wide table of the per-function rows from FunctionMetricsVisitor,
+# stored by column (one array of machine integers per metric) so a 30k-file
+# tree costs a few bytes per function and a top-N query is a single pass
+# over one column. Rows are appended per file; replacing or removing a file
+# only marks its rows dead, and the arrays are compacted once dead rows
+# outnumber live ones.
+
+# What hotspots can be ranked by; "lines" is end_line - line + 1. The start
+# line is kept alongside to point at the function.
+METRICS = ("statements", "lines", "cyclomatic", "cognitive", "nesting")
+COLUMNS = ("line",) + METRICS
+_FIELD_INDEX = {field: index for index, field in enumerate(FUNCTION_FIELDS)}
+DEFAULT_TOP = 50
+_KIND_INDEX = {kind: index for index, kind in enumerate(FUNCTION_KINDS)}
+
+class FunctionIndex:
+    def __init__(self):
+        self.paths = []
+        self.names = []
+        self.file_ids = array('l')
+        self.kinds = array('b')
+        self.columns = {column: array('l') for column in COLUMNS}
+        # file path -> id of its live rows; ids of removed files are dead
+        self._live_files = {}
+        self._live_ids = set()
+        self._dead_rows = 0
+        self._row_counts = []
+
+    def __len__(self):
+        return len(self.names) - self._dead_rows
+
+    def file_count(self):
+        return len(self._live_files)
+
+    # Rows as produced by FunctionMetricsVisitor; replaces any earlier rows
+    # for the file
+    def add(self, file_path, rows):
+        self.remove(file_path)
+        file_id = len(self.paths)
+        self.paths.append(file_path)
+        self._row_counts.append(len(rows))
+        self._live_files[file_path] = file_id
+        self._live_ids.add(file_id)
+        self.file_ids.extend([file_id] * len(rows))
+        self.names.extend(row[0] for row in rows)
+        self.kinds.extend(_KIND_INDEX.get(row[1], 0) for row in rows)
+        line, end_line = _FIELD_INDEX["line"], _FIELD_INDEX["end_line"]
+        self.columns["lines"].extend(row[end_line] - row[line] + 1 for row in rows)
+        for column in COLUMNS:
+            if column != "lines":
+                offset = _FIELD_INDEX[column]
+                self.columns[column].extend(row[offset] for row in rows)
+
+    def remove(self, file_path):
+        file_id = self._live_files.pop(file_path, None)
+        if file_id is None:
+            return
+        self._live_ids.discard(file_id)
+        self._dead_rows += self._row_counts[file_id]
+        if self._dead_rows > len(self.names) - self._dead_rows:
+            self.compact()
+
+    def compact(self):
+        keep = [row for row, file_id in enumerate(self.file_ids) if file_id in self._live_ids]
+        self.names = [self.names[row] for row in keep]
+        self.kinds = array('b', (self.kinds[row] for row in keep))
+        for metric, column in self.columns.items():
+            self.columns[metric] = array('l', (column[row] for row in keep))
+        # Renumber the surviving files densely
+        renumber = {file_id: new_id for new_id, file_id in enumerate(sorted(self._live_ids))}
+        self.file_ids = array('l', (renumber[self.file_ids[row]] for row in keep))
+        self.paths = [self.paths[file_id] for file_id in sorted(self._live_ids)]
+        self._row_counts = [self._row_counts[file_id] for file_id in sorted(self._live_ids)]
+        self._live_files = {path: file_id for file_id, path in enumerate(self.paths)}
+        self._live_ids = set(range(len(self.paths)))
+        self._dead_rows = 0
+
+    def row(self, index):
+        record = {"file": self.paths[self.file_ids[index]], "name": self.names[index],
+                  "kind": FUNCTION_KINDS[self.kinds[index]]}
+        for column in COLUMNS:
+            record[column] = self.columns[column][index]
+        return record
+
+    # The n rows with the highest value of `metric`, as dicts, optionally
+    # restricted to some kinds ("function", "method", "class")
+    def top(self, metric="cyclomatic", n=DEFAULT_TOP, kinds=("function", "method")):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRICS)}")
+        column = self.columns[metric]
+        wanted = {_KIND_INDEX[kind] for kind in kinds} if kinds else None
+        candidates = range(len(column))
+        if self._dead_rows:
+            live, file_ids = self._live_ids, self.file_ids
+            candidates = (row for row in candidates if file_ids[row] in live)
+        if wanted is not None and len(wanted) < len(FUNCTION_KINDS):
+            kind_column = self.kinds
+            candidates = (row for row in candidates if kind_column[row] in wanted)
+        return [self.row(row) for row in heapq.nlargest(n, candidates, key=column.__getitem__)]
+
+    def rows_for(self, file_path):
+        file_id = self._live_files.get(file_path)
+        if file_id is None:
+            return []
+        return [self.row(row) for row, row_file in enumerate(self.file_ids) if row_file == file_id]
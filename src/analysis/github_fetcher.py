@@ -0,0 +1,135 @@
+import os
+import base64
+import tarfile
+import posixpath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_BASE = "https://api.github.com"
+FETCH_MODES = ("tarball", "tree")
+DEFAULT_FETCH_WORKERS = 8
+REQUEST_TIMEOUT = 30
+
+def parse_repo_url(repo_url):
+    # https://github.com/owner/name[.git][/tree/ref] -> (owner, name, ref or None)
+    path = repo_url.split('github.com/', 1)[-1].strip('/')
+    parts = path.split('/')
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        raise ValueError(f"Not a GitHub repository URL: {repo_url}")
+    owner, name = parts[0], parts[1]
+    if name.endswith('.git'):
+        name = name[:-4]
+    ref = '/'.join(parts[3:]) if len(parts) > 3 and parts[2] == 'tree' else None
+    return owner, name, ref
+
+def _safe_path(path):
+    # Archive member names are untrusted; refuse anything that could land
+    # outside the output directory
+    path = posixpath.normpath(path)
+    if path.startswith(('/', '../')) or path in ('.', '..'):
+        return None
+    return path
+
+# Fetches a whole repository in one request instead of walking it with one
+# contents call per directory and file. "tarball" streams the archive and
+# extracts matching members as they arrive; "tree" lists every blob with one
+# recursive git tree call and downloads the matching blobs on a thread pool.
+class GitHubFetcher:
+    def __init__(self, repo_url, api_base=GITHUB_API_BASE, token=None, mode="tarball",
+                 workers=DEFAULT_FETCH_WORKERS, session=None):
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {mode}")
+        self.owner, self.name, self.ref = parse_repo_url(repo_url)
+        self.api_base = api_base.rstrip('/')
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.session = session or requests.Session()
+        # One pooled connection per fetch thread
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.setdefault("Accept", "application/vnd.github+json")
+        token = token or os.environ.get("GITHUB_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    @property
+    def repo_api(self):
+        return f"{self.api_base}/repos/{self.owner}/{self.name}"
+
+    def close(self):
+        self.session.close()
+
+    # Yields (path, bytes) for every file whose repository-relative path is
+    # accepted by `matches` and is not larger than max_file_size
+    def iter_files(self, matches, max_file_size=None):
+        if self.mode == "tree":
+            return self.iter_tree(matches, max_file_size)
+        return self.iter_tarball(matches, max_file_size)
+
+    def iter_tarball(self, matches, max_file_size=None):
+        url = f"{self.repo_api}/tarball" + (f"/{self.ref}" if self.ref else "")
+        with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # "r|gz" reads the archive as a stream, so files are analyzed while
+            # the rest of it is still downloading
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    # Members live under a single "<owner>-<repo>-<sha>/" directory
+                    path = _safe_path(member.name.split('/', 1)[-1])
+                    if path is None or not matches(path):
+                        continue
+                    if max_file_size and member.size > max_file_size:
+                        continue
+                    yield path, archive.extractfile(member).read()
+
+    def default_branch(self):
+        response = self.session.get(self.repo_api, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()["default_branch"]
+
+    def list_tree(self):
+        ref = self.ref or self.default_branch()
+        response = self.session.get(f"{self.repo_api}/git/trees/{ref}", params={"recursive": "1"},
+                                    timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        tree = response.json()
+        return tree.get("tree", []), tree.get("truncated", False)
+
+    def fetch_blob(self, sha):
+        response = self.session.get(f"{self.repo_api}/git/blobs/{sha}", timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return base64.b64decode(response.json()["content"])
+
+    def iter_tree(self, matches, max_file_size=None):
+        entries, truncated = self.list_tree()
+        if truncated:
+            # Very large trees are cut off by the API; the archive is complete
+            yield from self.iter_tarball(matches, max_file_size)
+            return
+        blobs = [(path, entry["sha"]) for entry in entries if entry.get("type") == "blob"
+                 for path in (_safe_path(entry["path"]),)
+                 if path is not None and matches(path)
+                 and not (max_file_size and entry.get("size", 0) > max_file_size)]
+
+        # Keep a bounded window of requests in flight and yield in tree order
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            window = deque()
+            blob_iter = iter(blobs)
+            try:
+                for path, sha in blob_iter:
+                    window.append((path, executor.submit(self.fetch_blob, sha)))
+                    if len(window) >= self.workers * 2:
+                        path, future = window.popleft()
+                        yield path, future.result()
+                while window:
+                    path, future = window.popleft()
+                    yield path, future.result()
+            finally:
+                for _, future in window:
+                    future.cancel()
@@ -0,0 +1,469 @@
+import os
+import sys
+import json
+import hashlib
+import heapq
+from array import array
+from collections import Counter
+
+# Module-level import graph of the analyzed Python files. Each file is named
+# the way the interpreter would import it: its directories up to the first one
+# without an __init__.py, so a src/ layout gives `pkg.mod` (the path relative
+# to the scanned root is kept as an alias). Imports are resolved, relative
+# ones against the importing package, to the longest known module prefix, so
+# `pkg.mod.func` lands on pkg.mod. What does not resolve is stdlib,
+# third-party, or unresolved when it is relative or names an internal
+# package. Edges are kept as CSR arrays (offsets into one array of target
+# ids), so the graph algorithms below are linear passes over machine integers.
+
+GRAPH_VERSION = 1
+GRAPH_FILENAME = "import_graph.json"
+SUMMARY_LIMIT = 20
+
+INTERNAL = "internal"
+STDLIB = "stdlib"
+THIRD_PARTY = "third_party"
+UNRESOLVED = "unresolved"
+IMPORT_KINDS = (INTERNAL, STDLIB, THIRD_PARTY, UNRESOLVED)
+
+def _stdlib_modules():
+    names = getattr(sys, "stdlib_module_names", None)
+    if names is None:
+        # Before Python 3.10: what is installed in the standard library
+        # directories
+        import pkgutil
+        import sysconfig
+        paths = sysconfig.get_paths()
+        names = [module.name for module in
+                 pkgutil.iter_modules([paths["stdlib"], os.path.join(paths["platstdlib"], "lib-dynload")])]
+    return frozenset(names) | frozenset(sys.builtin_module_names)
+
+# Lowercased names are included because case-insensitive analysis lowercases
+# imports (cProfile arrives as cprofile)
+STDLIB_MODULES = _stdlib_modules()
+STDLIB_MODULES |= frozenset(name.lower() for name in STDLIB_MODULES)
+# Nodes per block of the transitive closure; each block keeps one int of this
+# many bits per strongly connected component
+CLOSURE_BLOCK = 8192
+# int.bit_count is new in Python 3.10
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
+def is_python_file(file_path, result):
+    if result is not None and "language" in result:
+        return result["language"] == "python"
+    return file_path.endswith(".py")
+
+# {file_path: dotted module name}, following __init__.py files up from each file
+def module_names(file_paths):
+    packages = {os.path.dirname(file_path) for file_path in file_paths
+                if os.path.basename(file_path) == "__init__.py"}
+    names = {}
+    for file_path in file_paths:
+        directory, filename = os.path.split(file_path)
+        stem = os.path.splitext(filename)[0]
+        parts = [] if stem == "__init__" else [stem]
+        while directory in packages:
+            directory, package = os.path.split(directory)
+            if not package:
+                break
+            parts.append(package)
+        names[file_path] = ".".join(reversed(parts)) or stem
+    return names
+
+# The dotted path of a file relative to the scanned root, or None when a
+# directory in it is not a valid identifier
+def path_module_name(file_path, root):
+    rel_path = os.path.splitext(os.path.relpath(file_path, root))[0]
+    parts = rel_path.replace(os.sep, "/").split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    if not parts or not all(part.isidentifier() for part in parts):
+        return None
+    return ".".join(parts)
+
+# Maps import strings to node ids (or an external kind). Absolute imports are
+# resolved once per distinct string; relative ones depend on the importer.
+class ImportResolver:
+    def __init__(self, modules):
+        # dotted name -> node id
+        self.modules = modules
+        self.top_level = {name.partition(".")[0] for name in modules}
+        self._absolute = {}
+
+    def resolve(self, spec, importer, is_package=False):
+        # (kind, node id or None) for `spec` imported by module `importer`
+        resolved = self._absolute.get(spec)
+        if resolved is not None:
+            return resolved
+        if spec.startswith("."):
+            level = len(spec) - len(spec.lstrip("."))
+            package = importer if is_package else importer.rpartition(".")[0]
+            parts = package.split(".") if package else []
+            if level > len(parts):
+                return UNRESOLVED, None
+            name = ".".join(parts[:len(parts) - level + 1] + ([spec[level:]] if spec[level:] else []))
+            node = self.longest_prefix(name)
+            return (INTERNAL, node) if node is not None else (UNRESOLVED, None)
+
+        node = self.longest_prefix(spec)
+        top = spec.partition(".")[0]
+        if node is not None:
+            resolved = INTERNAL, node
+        elif top in self.top_level:
+            resolved = UNRESOLVED, None
+        elif top in STDLIB_MODULES:
+            resolved = STDLIB, None
+        else:
+            resolved = THIRD_PARTY, None
+        self._absolute[spec] = resolved
+        return resolved
+
+    def longest_prefix(self, name):
+        while name:
+            node = self.modules.get(name)
+            if node is not None:
+                return node
+            name = name.rpartition(".")[0]
+        return None
+
+class ImportGraph:
+    def __init__(self, files, modules, offsets, targets, external=None):
+        # node id -> file path and module name
+        self.files = files
+        self.modules = modules
+        # Out-edges of node i are targets[offsets[i]:offsets[i + 1]], sorted
+        self.offsets = offsets
+        self.targets = targets
+        # node id -> [(import, kind)] for the imports that are not internal
+        self.external = external if external is not None else {}
+        self.fingerprint = None
+        self._nodes = None
+        self._reverse = None
+        self._components = None
+        self._reach = {}
+
+    def __len__(self):
+        return len(self.files)
+
+    def edge_count(self):
+        return len(self.targets)
+
+    # Node id of a module name or file path
+    def node(self, name_or_path):
+        if self._nodes is None:
+            self._nodes = {}
+            for node, module in enumerate(self.modules):
+                self._nodes.setdefault(module, node)
+            self._nodes.update((file_path, node) for node, file_path in enumerate(self.files))
+        return self._nodes[name_or_path]
+
+    def imports_of(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def fan_out(self):
+        offsets = self.offsets
+        return array('l', (offsets[node + 1] - offsets[node] for node in range(len(self.files))))
+
+    def fan_in(self):
+        counts = array('l', bytes(array('l').itemsize * len(self.files)))
+        for target in self.targets:
+            counts[target] += 1
+        return counts
+
+    def reverse(self):
+        # The graph with every edge flipped, in the same CSR form
+        if self._reverse is None:
+            fan_in = self.fan_in()
+            offsets = array('l', [0])
+            for count in fan_in:
+                offsets.append(offsets[-1] + count)
+            targets = array('l', bytes(array('l').itemsize * len(self.targets)))
+            fill = array('l', offsets[:-1])
+            for node in range(len(self.files)):
+                for target in self.imports_of(node):
+                    targets[fill[target]] = node
+                    fill[target] += 1
+            self._reverse = (offsets, targets)
+        return self._reverse
+
+    # (component of each node, component count) by Tarjan's algorithm with an
+    # explicit stack, so deep import chains do not hit the recursion limit.
+    # Components are numbered in reverse topological order: every edge goes
+    # to a component with an equal or lower id.
+    def components(self):
+        if self._components is not None:
+            return self._components
+        n = len(self.files)
+        offsets, targets = self.offsets, self.targets
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        component = array('l', [-1]) * n
+        stack = []
+        counter = count = 0
+        for start in range(n):
+            if index[start] != -1:
+                continue
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack[start] = True
+            work = [(start, offsets[start])]
+            while work:
+                node, edge = work[-1]
+                end = offsets[node + 1]
+                while edge < end:
+                    target = targets[edge]
+                    edge += 1
+                    if index[target] == -1:
+                        work[-1] = (node, edge)
+                        index[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, offsets[target]))
+                        break
+                    if on_stack[target] and index[target] < low[node]:
+                        low[node] = index[target]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == index[node]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component[member] = count
+                            if member == node:
+                                break
+                        count += 1
+        self._components = (component, count)
+        return self._components
+
+    # Import cycles: the strongly connected components with more than one
+    # module, largest first
+    def cycles(self):
+        component, count = self.components()
+        members = [[] for _ in range(count)]
+        for node, group in enumerate(component):
+            members[group].append(node)
+        cycles = [sorted(self.modules[node] for node in group) for group in members if len(group) > 1]
+        return sorted(cycles, key=lambda cycle: (-len(cycle), cycle))
+
+    # For every node, how many other modules it imports directly or
+    # indirectly (or, with reverse=True, how many import it). The closure is
+    # computed on the component DAG with one bitset (a Python int) per
+    # component, processed CLOSURE_BLOCK nodes at a time so memory stays at
+    # components * block bits however large the graph is.
+    def transitive_counts(self, reverse=False):
+        if reverse in self._reach:
+            return self._reach[reverse]
+        component, count = self.components()
+        neighbours = [set() for _ in range(count)]
+        for node in range(len(self.files)):
+            source = component[node]
+            for target in self.imports_of(node):
+                target = component[target]
+                if target != source:
+                    if reverse:
+                        neighbours[target].add(source)
+                    else:
+                        neighbours[source].add(target)
+        neighbours = [tuple(group) for group in neighbours]
+        # Imported components have lower ids, so they are finished first
+        order = range(count - 1, -1, -1) if reverse else range(count)
+
+        totals = [0] * count
+        for low in range(0, len(self.files), CLOSURE_BLOCK):
+            own = [0] * count
+            for node in range(low, min(low + CLOSURE_BLOCK, len(self.files))):
+                own[component[node]] |= 1 << (node - low)
+            reach = [0] * count
+            for group in order:
+                bits = own[group]
+                for other in neighbours[group]:
+                    bits |= reach[other]
+                reach[group] = bits
+                totals[group] += _popcount(bits)
+        # Every node reaches itself in the reflexive closure above
+        counts = array('l', (totals[component[node]] - 1 for node in range(len(self.files))))
+        self._reach[reverse] = counts
+        return counts
+
+    # Module names reachable from `name_or_path` through imports (or that
+    # reach it, with reverse=True), by breadth-first search
+    def reachable(self, name_or_path, reverse=False):
+        offsets, targets = self.reverse() if reverse else (self.offsets, self.targets)
+        start = self.node(name_or_path)
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            following = []
+            for node in frontier:
+                for target in targets[offsets[node]:offsets[node + 1]]:
+                    if target not in seen:
+                        seen.add(target)
+                        following.append(target)
+            frontier = following
+        seen.discard(start)
+        return sorted(self.modules[node] for node in seen)
+
+    def import_counts(self):
+        counts = Counter({INTERNAL: len(self.targets)})
+        for imports in self.external.values():
+            counts.update(kind for _, kind in imports)
+        return {kind: counts[kind] for kind in IMPORT_KINDS}
+
+    # External top-level packages of one kind and the number of modules
+    # importing each
+    def external_packages(self, kind=THIRD_PARTY):
+        counts = Counter()
+        for imports in self.external.values():
+            counts.update({spec.partition(".")[0] for spec, import_kind in imports if import_kind == kind})
+        return counts
+
+    def ranked(self, values, limit=SUMMARY_LIMIT):
+        top = heapq.nlargest(limit, range(len(values)), key=values.__getitem__)
+        return [{"module": self.modules[node], "file": self.files[node], "count": values[node]}
+                for node in top if values[node]]
+
+    def summary(self, limit=SUMMARY_LIMIT):
+        cycles = self.cycles()
+        return {
+            "modules": len(self.files),
+            "edges": len(self.targets),
+            "imports_by_kind": self.import_counts(),
+            "cycle_count": len(cycles),
+            "cycles": cycles[:limit],
+            "most_imported": self.ranked(self.fan_in(), limit),
+            "most_imports": self.ranked(self.fan_out(), limit),
+            "most_transitive_dependents": self.ranked(self.transitive_counts(reverse=True), limit),
+            "most_transitive_dependencies": self.ranked(self.transitive_counts(), limit),
+            "third_party": dict(self.external_packages(THIRD_PARTY).most_common(limit)),
+        }
+
+    # Everything needed to rebuild the graph, with the per-module metrics;
+    # this is also the exported file format
+    def as_dict(self):
+        component, _ = self.components()
+        fan_in, fan_out = self.fan_in(), self.fan_out()
+        dependencies, dependents = self.transitive_counts(), self.transitive_counts(reverse=True)
+        modules = []
+        for node, (module, file_path) in enumerate(zip(self.modules, self.files)):
+            modules.append({
+                "module": module,
+                "file": file_path,
+                "imports": list(self.imports_of(node)),
+                "external": [list(entry) for entry in self.external.get(node, ())],
+                "fan_in": fan_in[node],
+                "fan_out": fan_out[node],
+                "transitive_dependencies": dependencies[node],
+                "transitive_dependents": dependents[node],
+                "component": component[node],
+            })
+        return {"version": GRAPH_VERSION, "fingerprint": self.fingerprint, "modules": modules,
+                "cycles": self.cycles(), "imports_by_kind": self.import_counts()}
+
+    @classmethod
+    def from_dict(cls, data):
+        offsets, targets = array('l', [0]), array('l')
+        external = {}
+        for node, entry in enumerate(data["modules"]):
+            targets.extend(entry["imports"])
+            offsets.append(len(targets))
+            if entry["external"]:
+                external[node] = [tuple(item) for item in entry["external"]]
+        modules = data["modules"]
+        graph = cls([entry["file"] for entry in modules], [entry["module"] for entry in modules],
+                     offsets, targets, external)
+        graph.fingerprint = data.get("fingerprint")
+        component = array('l', (entry["component"] for entry in modules))
+        graph._components = (component, max(component) + 1 if component else 0)
+        graph._reach = {False: array('l', (entry["transitive_dependencies"] for entry in modules)),
+                        True: array('l', (entry["transitive_dependents"] for entry in modules))}
+        return graph
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f)
+        return path
+
+    def write_dot(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("digraph imports {\n")
+            for node, module in enumerate(self.modules):
+                f.write(f'  {node} [label="{module}"];\n')
+            for node in range(len(self.files)):
+                for target in self.imports_of(node):
+                    f.write(f"  {node} -> {target};\n")
+            f.write("}\n")
+        return path
+
+# Digest of everything the graph depends on: the Python files and their raw
+# imports. An unchanged digest means a saved graph can be reused as is.
+def graph_fingerprint(results, root=None):
+    digest = hashlib.sha1(f"{GRAPH_VERSION}\0{root or ''}".encode('utf-8', 'surrogateescape'))
+    for file_path in sorted(results):
+        result = results[file_path]
+        if is_python_file(file_path, result):
+            dependencies = result.get("dependencies", ()) if result is not None else ()
+            digest.update(f"\0{file_path}\0{chr(1).join(dependencies)}".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+# Builds the graph of the Python files in an {file_path: result} mapping.
+# Files that failed analysis are modules without imports.
+def build_import_graph(results, root=None, fingerprint=None):
+    files = sorted(file_path for file_path, result in results.items() if is_python_file(file_path, result))
+    names = module_names(files)
+    aliases = [(names[file_path], node) for node, file_path in enumerate(files)]
+    if root:
+        aliases += [(path_module_name(file_path, root), node) for node, file_path in enumerate(files)]
+    lookup = {}
+    for alias, node in aliases:
+        if alias:
+            lookup.setdefault(alias, node)
+    # Lowercased imports still find MixedCase modules
+    for alias, node in aliases:
+        if alias:
+            lookup.setdefault(alias.lower(), node)
+    resolver = ImportResolver(lookup)
+
+    offsets, targets = array('l', [0]), array('l')
+    external = {}
+    for node, file_path in enumerate(files):
+        result = results[file_path]
+        is_package = os.path.basename(file_path) == "__init__.py"
+        internal, other = set(), []
+        for spec in (result.get("dependencies", ()) if result is not None else ()):
+            kind, target = resolver.resolve(spec, names[file_path], is_package)
+            if kind != INTERNAL:
+                other.append((spec, kind))
+            elif target != node:
+                internal.add(target)
+        targets.extend(sorted(internal))
+        offsets.append(len(targets))
+        if other:
+            external[node] = other
+
+    graph = ImportGraph(files, [names[file_path] for file_path in files], offsets, targets, external)
+    graph.fingerprint = fingerprint or graph_fingerprint(results, root)
+    return graph
+
+# The graph for `results`, read from cache_path when it was saved for the
+# same imports, otherwise built and saved there
+def load_or_build_import_graph(results, root=None, cache_path=None):
+    fingerprint = graph_fingerprint(results, root)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == GRAPH_VERSION and data.get("fingerprint") == fingerprint:
+                return ImportGraph.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    graph = build_import_graph(results, root, fingerprint)
+    if cache_path:
+        graph.save(cache_path)
+    return graph
@@ -0,0 +1,88 @@
+import os
+import subprocess
+from collections import namedtuple
+from .token_statistics import TokenStatistics
+from .function_index import FunctionIndex
+
+GIT_TIMEOUT = 60
+
+ChangeSet = namedtuple('ChangeSet', ['changed', 'deleted'])
+
+# What an incremental run needs from the previous one: the per-file results,
+# the repository-wide token statistics, the (mtime_ns, size) of every analyzed
+# file and the commit that was checked out, if any, with the files that
+# differed from it (a later revert drops them from the diff, so they are
+# always re-checked). Without an analysis cache
+# to look old results up in, file_tokens keeps each file's word frequencies
+# so they can be retracted when it changes. CodeAnalyzer updates it in place.
+class AnalysisState:
+    def __init__(self, results=None, token_statistics=None, file_stats=None, commit=None, function_index=None,
+                 file_tokens=None, dirty_files=None):
+        self.results = results if results is not None else {}
+        self.token_statistics = token_statistics or TokenStatistics()
+        self.function_index = function_index if function_index is not None else FunctionIndex()
+        self.file_stats = file_stats if file_stats is not None else collect_file_stats(self.results)
+        self.commit = commit
+        self.dirty_files = dirty_files if dirty_files is not None else set()
+        self.file_tokens = file_tokens
+
+def file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def collect_file_stats(paths):
+    stats = {}
+    for path in paths:
+        stat = file_stat(path)
+        if stat is not None:
+            stats[path] = stat
+    return stats
+
+def diff_file_stats(old, new):
+    changed = {path for path, stat in new.items() if old.get(path) != stat}
+    return ChangeSet(changed, set(old) - set(new))
+
+def _git(directory, *args):
+    try:
+        completed = subprocess.run(['git', '-C', directory, *args], capture_output=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.decode('utf-8', 'surrogateescape')
+
+def git_head(directory):
+    output = _git(directory, 'rev-parse', 'HEAD')
+    return output.strip() if output else None
+
+def git_changes(directory, base, head=None):
+    # Files under `directory` that differ between `base` and `head`, or between
+    # `base` and the working tree (including untracked files) when head is None.
+    # Paths are joined onto `directory` the way FileScanner builds them. Returns
+    # None when the directory is not a git checkout or base is unknown.
+    revisions = [base, head] if head else [base]
+    output = _git(directory, 'diff', '--name-status', '--no-renames', '--relative', '-z', *revisions)
+    if output is None:
+        return None
+
+    changed, deleted = set(), set()
+    fields = output.split('\0')
+    for status, path in zip(fields[0::2], fields[1::2]):
+        (deleted if status == 'D' else changed).add(_join(directory, path))
+    if head is None:
+        untracked = _git(directory, 'ls-files', '--others', '--exclude-standard', '-z')
+        if untracked is None:
+            return None
+        changed.update(_join(directory, path) for path in untracked.split('\0') if path)
+    return ChangeSet(changed, deleted)
+
+# Files that differ from `commit` in the working tree
+def git_dirty_files(directory, commit):
+    changes = git_changes(directory, commit) if commit else None
+    return changes.changed | changes.deleted if changes is not None else set()
+
+def _join(directory, rel_path):
+    return os.path.join(directory, *rel_path.split('/'))
@@ -0,0 +1,201 @@
+import os
+import re
+from ..utils.metrics import NULL_METRICS
+from .engine import AnalysisEngine, strip_comments as strip_python_comments
+from .dependency_analyzer import ImportVisitor
+from .complexity_analyzer import ComplexityVisitor, FunctionMetricsVisitor
+
+# Per-language dependency and complexity analysis, chosen by file extension.
+# Python goes through the AST engine; every other language is handled by a
+# table of precompiled patterns: a lexer that finds comments and string
+# literals, an import pattern and a pattern for the decision points that
+# ComplexityVisitor counts in Python (if, loops and function definitions).
+# The pattern analyzers are approximate but never raise, so one unusual file
+# does not stop a mixed-language run.
+
+# String literal alternatives, shared between the lexers and the complexity
+# patterns so a keyword inside a string is never counted
+_DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+_SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+# A character literal; Rust lifetimes ('a) and C++ digit separators are not strings
+_CHARACTER = r"'(?:\\.[^'\\\n]{0,8}|[^'\\\n])'"
+_BACKQUOTED = r'`(?:\\[\s\S]|[^`\\])*`'
+_TRIPLE_QUOTED = r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\''
+
+_LINE_COMMENT = r'//[^\n]*'
+_BLOCK_COMMENT = r'/\*[\s\S]*?(?:\*/|$)'
+_HASH_COMMENT = r'\#[^\n]*'
+_MARKUP_COMMENT = r'<!--[\s\S]*?(?:-->|$)'
+
+# Language families by their string and comment syntax
+C_STRINGS = (_DOUBLE_QUOTED, _CHARACTER)
+SCRIPT_STRINGS = (_DOUBLE_QUOTED, _SINGLE_QUOTED)
+JS_STRINGS = (_BACKQUOTED, _DOUBLE_QUOTED, _SINGLE_QUOTED)
+GO_STRINGS = (_BACKQUOTED, _DOUBLE_QUOTED, _CHARACTER)
+PYTHON_STRINGS = (_TRIPLE_QUOTED, _DOUBLE_QUOTED, _SINGLE_QUOTED)
+C_COMMENTS = (_LINE_COMMENT, _BLOCK_COMMENT)
+
+# Functions with a return type or modifiers in front of the name (C, C++,
+# Java, C#), e.g. `public static int parse(String s) throws IOException {`
+_TYPED_FUNCTION = (r'^[ \t]*(?:[\w:<>,\[\]~.]+[ \t*&]+)+'
+                   r'(?!(?:if|for|while|switch|catch|return|else|new|delete|throw|sizeof|do)\b)'
+                   r'~?[A-Za-z_][\w:~]*[ \t]*\([^;{}()]*(?:\([^;{}()]*\)[^;{}()]*)*\)[^;{}()=]*\{')
+# JavaScript class methods and object shorthand methods, `async load(url) {`
+_JS_METHOD = (r'^[ \t]*(?:(?:async|static|get|set|public|private|protected)[ \t]+)*'
+              r'(?!(?:if|for|while|switch|catch|function|return)\b)[A-Za-z_$][\w$]*[ \t]*\([^;{}()]*\)'
+              r'(?:[ \t]*:[^;{}()=]+)?[ \t]*\{')
+
+class LanguageAnalyzer:
+    def __init__(self, name, extensions, strings=(), comments=(), imports=(), import_items=None, decisions=()):
+        self.name = name
+        self.extensions = tuple(extensions)
+        strings = '|'.join(strings) or r'(?!)'
+        # Comments are dropped and strings kept, as in engine.strip_comments
+        self._lexer = re.compile(f'(?P<string>{strings})|(?P<comment>{"|".join(comments)})') if comments else None
+        # Each import pattern captures one group; alternatives are joined so
+        # findall makes a single pass and returns one non-empty group per match
+        self._imports = re.compile('|'.join(imports), re.MULTILINE) if imports else None
+        # Optional second step for imports that list several modules at once
+        # (Go import blocks) or need trimming (Java `.*`, Rust `::{...}`)
+        self._import_items = re.compile(import_items) if import_items else None
+        # Strings are matched as an empty alternative so their contents are
+        # skipped; only the captured group counts
+        self._decisions = re.compile(f'(?:{strings})|({"|".join(decisions)})', re.MULTILINE) if decisions else None
+
+    def strip_comments(self, content):
+        if self._lexer is None:
+            return content
+        return self._lexer.sub(r'\g<string>', content)
+
+    def dependencies(self, code):
+        if self._imports is None:
+            return []
+        found = set()
+        for groups in self._imports.findall(code):
+            spec = groups if isinstance(groups, str) else ''.join(groups)
+            if self._import_items is None:
+                found.add(spec.strip())
+            else:
+                found.update(self._import_items.findall(spec))
+        found.discard('')
+        return sorted(found)
+
+    def complexity(self, code):
+        if self._decisions is None:
+            return 1
+        points = self._decisions.findall(code)
+        return 1 + len(points) - points.count('')
+
+    def analyze(self, content, metrics=NULL_METRICS):
+        with metrics.timer("parse"):
+            code = self.strip_comments(content)
+        with metrics.timer("visit"):
+            return {"dependencies": self.dependencies(code), "complexity": self.complexity(code)}
+
+# Python through the AST engine. Files that do not parse (Python 2, syntax
+# errors, templates) fall back to the pattern tables instead of raising.
+class PythonAnalyzer:
+    name = "python"
+
+    def __init__(self, extensions, visitor_classes=(ImportVisitor, ComplexityVisitor, FunctionMetricsVisitor)):
+        self.extensions = tuple(extensions)
+        self.engine = AnalysisEngine(visitor_classes)
+        self.fallback = LanguageAnalyzer(
+            "python", extensions, PYTHON_STRINGS, (_HASH_COMMENT,),
+            imports=(r'^[ \t]*from[ \t]+([\w.]+)[ \t]+import\b', r'^[ \t]*import[ \t]+([\w. \t,]+)'),
+            import_items=r'(?:^|,)[ \t]*([\w.]+)',
+            decisions=(r'^[ \t]*(?:if|elif|for|while|def)\b',))
+
+    def strip_comments(self, content):
+        return strip_python_comments(content)
+
+    def analyze(self, content, metrics=NULL_METRICS):
+        try:
+            return self.engine.analyze(content, metrics)
+        except (SyntaxError, ValueError, RecursionError):
+            metrics.count("syntax_fallbacks")
+            return self.fallback.analyze(content, metrics)
+
+# Files whose extension no analyzer claims still get text metrics
+PLAIN_TEXT = LanguageAnalyzer("text", ())
+
+def default_analyzers():
+    return [
+        PythonAnalyzer((".py", ".pyw", ".pyi")),
+        LanguageAnalyzer(
+            "javascript", (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts"), JS_STRINGS, C_COMMENTS,
+            imports=(r'\bimport[ \t]*(?:type[ \t]+)?(?:[\w$*{}, \t\n]+?[ \t\n]from[ \t]*)?["\']([^"\'\n]+)["\']',
+                     r'\bexport[ \t]*(?:type[ \t]+)?[\w$*{}, \t\n]+?[ \t\n]from[ \t]*["\']([^"\'\n]+)["\']',
+                     r'\b(?:require|import)[ \t]*\([ \t]*["\']([^"\'\n]+)["\'][ \t]*\)'),
+            decisions=(r'\b(?:if|for|while)\b', r'\bfunction\b', r'=>', _JS_METHOD)),
+        LanguageAnalyzer(
+            "java", (".java",), C_STRINGS, C_COMMENTS,
+            imports=(r'^[ \t]*import[ \t]+(?:static[ \t]+)?([\w.]+(?:\.\*)?)[ \t]*;',),
+            import_items=r'^\w+(?:\.\w+)*',
+            decisions=(r'\b(?:if|for|while)\b', _TYPED_FUNCTION)),
+        LanguageAnalyzer(
+            "c", (".c", ".h", ".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx"), C_STRINGS, C_COMMENTS,
+            imports=(r'^[ \t]*\#[ \t]*include[ \t]*[<"]([^>"\n]+)[>"]',),
+            decisions=(r'\b(?:if|for|while)\b', _TYPED_FUNCTION)),
+        LanguageAnalyzer(
+            "csharp", (".cs",), C_STRINGS, C_COMMENTS,
+            imports=(r'^[ \t]*(?:global[ \t]+)?using[ \t]+(?:static[ \t]+)?(?:\w+[ \t]*=[ \t]*)?([\w.]+)[ \t]*;',),
+            decisions=(r'\b(?:if|for|foreach|while)\b', _TYPED_FUNCTION)),
+        LanguageAnalyzer(
+            "go", (".go",), GO_STRINGS, C_COMMENTS,
+            imports=(r'^[ \t]*import[ \t]*(?:[\w.]+[ \t]+)?("[^"\n]+")', r'^[ \t]*import[ \t]*\(([^)]*)\)'),
+            import_items=r'"([^"\n]+)"',
+            decisions=(r'\b(?:if|for)\b', r'\bfunc\b')),
+        LanguageAnalyzer(
+            "rust", (".rs",), C_STRINGS, C_COMMENTS,
+            imports=(r'^[ \t]*(?:pub(?:\([^)\n]*\))?[ \t]+)?use[ \t]+((?:::)?\w+(?:::\w+)*)',
+                     r'^[ \t]*extern[ \t]+crate[ \t]+(\w+)'),
+            import_items=r'\w+(?:::\w+)*',
+            decisions=(r'\b(?:if|for|while|loop)\b', r'\bfn\b')),
+        LanguageAnalyzer(
+            "php", (".php",), SCRIPT_STRINGS, C_COMMENTS + (_HASH_COMMENT,),
+            imports=(r'^[ \t]*use[ \t]+(?:function[ \t]+|const[ \t]+)?\\?([\w\\]+)',
+                     r'\b(?:require|include)(?:_once)?[ \t]*\(?[ \t]*["\']([^"\'\n]+)["\']'),
+            decisions=(r'\b(?:if|elseif|for|foreach|while)\b', r'\bfunction\b')),
+        LanguageAnalyzer(
+            "ruby", (".rb",), SCRIPT_STRINGS, (_HASH_COMMENT,),
+            imports=(r'^[ \t]*(?:require|require_relative|load)[ \t]*\(?[ \t]*["\']([^"\'\n]+)["\']',),
+            decisions=(r'\b(?:if|elsif|unless|for|while|until)\b', r'\bdef\b')),
+        LanguageAnalyzer(
+            "html", (".html", ".htm"), comments=(_MARKUP_COMMENT,),
+            imports=(r'<script\b[^>]*?\bsrc[ \t]*=[ \t]*["\']([^"\'>]+)["\']',
+                     r'<link\b[^>]*?\bhref[ \t]*=[ \t]*["\']([^"\'>]+)["\']')),
+        LanguageAnalyzer(
+            "css", (".css",), SCRIPT_STRINGS, (_BLOCK_COMMENT,),
+            imports=(r'@import[ \t]+(?:url\([ \t]*)?["\']?([^"\')\s;]+)',)),
+    ]
+
+# Extension -> analyzer lookup. Compound extensions are not needed: the
+# scanner has already filtered by extension, this only picks the syntax.
+class LanguageRegistry:
+    def __init__(self, analyzers=(), default=PLAIN_TEXT):
+        self.default = default
+        self.analyzers = {}
+        self._by_extension = {}
+        for analyzer in analyzers:
+            self.register(analyzer)
+
+    def register(self, analyzer):
+        self.analyzers[analyzer.name] = analyzer
+        for extension in analyzer.extensions:
+            self._by_extension[extension.lower()] = analyzer
+
+    def for_path(self, file_path):
+        if file_path is None:
+            return self.analyzers.get("python", self.default)
+        extension = os.path.splitext(file_path)[1].lower()
+        return self._by_extension.get(extension, self.default)
+
+    def get(self, name):
+        return self.analyzers.get(name, self.default)
+
+    def extensions(self):
+        return sorted(self._by_extension)
+
+def default_registry():
+    return LanguageRegistry(default_analyzers())
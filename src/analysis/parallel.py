@@ -0,0 +1,51 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+MAX_CHUNK_SIZE = 256
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+def default_chunk_size(file_count, workers):
+    # Aim for a few chunks per worker so stragglers don't leave cores idle
+    return max(1, min(MAX_CHUNK_SIZE, file_count // (workers * 4)))
+
+def iter_chunks(items, chunk_size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _analyze_chunk(analyze, file_paths):
+    return [(file_path, analyze(file_path)) for file_path in file_paths]
+
+# Yields (file_path, analyze(file_path)) pairs in input order so callers see the
+# same results as the serial path. `analyze` must be picklable, e.g. a bound
+# method of a FileAnalyzer. At most max_pending_chunks chunks are in flight, so
+# a slow consumer holds back the pool instead of letting results pile up.
+def analyze_files_parallel(file_paths, analyze, workers=None, chunk_size=None, max_pending_chunks=None):
+    workers = workers or default_worker_count()
+    chunk_size = chunk_size or default_chunk_size(len(file_paths), workers)
+    max_pending_chunks = max_pending_chunks or workers * 2
+
+    # Spawn rather than fork: we are called from a QThread and forking a
+    # multi-threaded Qt process is not safe.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque()
+        try:
+            for chunk in iter_chunks(file_paths, chunk_size):
+                pending.append(executor.submit(_analyze_chunk, analyze, chunk))
+                if len(pending) >= max_pending_chunks:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Consumer stopped early: don't start chunks nobody will read
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,397 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from ..utils.file_utils import ensure_dir
+from ..utils.metrics import NULL_METRICS, publish_metrics
+from ..utils.progress import ProgressReporter, DEFAULT_INTERVAL
+from .file_analyzer import FileAnalyzer
+from .analysis_cache import AnalysisCache, CACHE_FILENAME, stat_path
+from .token_statistics import TokenStatistics
+from .function_index import FunctionIndex
+from .import_graph import GRAPH_FILENAME, load_or_build_import_graph
+from .parallel import analyze_files_parallel
+from .failures import FailureLog, DEFAULT_TIME_BUDGET, ERROR, time_budget, describe_failure
+from .file_scanner import FileScanner, DEFAULT_EXCLUDED_DIRS, DEFAULT_MAX_FILE_SIZE, BINARY_SNIFF_BYTES
+from .incremental import (AnalysisState, git_head, git_changes, git_dirty_files, file_stat, collect_file_stats,
+                          diff_file_stats)
+
+def _ignore(*args):
+    pass
+
+# The analysis itself, with no Qt dependency: walks a directory (or fetches a
+# GitHub repository), analyzes each file and keeps the repository-wide token
+# statistics. CodeAnalyzer runs it on a QThread; the CLI and library callers
+# use it directly. `progress` receives log lines, `on_progress` (files done,
+# files expected or 0 if unknown), both at most every progress_interval
+# seconds, and `on_files_removed` the paths an incremental run dropped.
+# A file that fails, takes longer than file_time_budget seconds or has more
+# than max_file_size characters gets a None result and is listed in
+# self.failures; an error that stops the run keeps the results so far.
+class AnalysisPipeline:
+    def __init__(self, url_or_path, output_dir, file_extensions, max_depth, include_comments, case_sensitive,
+                 workers=1, chunk_size=None, use_cache=False, keep_results=True,
+                 excluded_dirs=DEFAULT_EXCLUDED_DIRS, max_file_size=DEFAULT_MAX_FILE_SIZE,
+                 github_api_base=None, github_mode="tarball", previous_state=None, since_commit=None,
+                 metrics=None, progress=None, on_files_removed=None, on_progress=None,
+                 progress_interval=DEFAULT_INTERVAL, file_time_budget=DEFAULT_TIME_BUDGET, keep_file_tokens=False):
+        self.url_or_path = url_or_path
+        self.output_dir = output_dir
+        self.file_extensions = file_extensions
+        self.max_depth = max_depth
+        self.include_comments = include_comments
+        self.case_sensitive = case_sensitive
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.use_cache = use_cache
+        self.cache = None
+        self.github_api_base = github_api_base
+        self.github_mode = github_mode
+        # With a previous AnalysisState only files changed since then are
+        # analyzed; self.state is what the next incremental run starts from
+        self.previous_state = previous_state
+        self.since_commit = since_commit
+        self.state = None
+        self.token_statistics = TokenStatistics()
+        # Per-function metrics of every Python file, for hotspot queries
+        self.function_index = FunctionIndex()
+        # {file_path: word frequencies} while there is no cache to retract
+        # them from on the next incremental run; None when not kept. Only
+        # kept with keep_file_tokens, when the caller means to run again with
+        # this run's state, since it costs a dict per file.
+        self.keep_file_tokens = keep_file_tokens
+        self.file_tokens = None
+        self.keep_results = keep_results
+        self.reporter = ProgressReporter(progress, on_progress, progress_interval)
+        self.progress = self.reporter.message
+        self.on_files_removed = on_files_removed or _ignore
+        self.scanner = FileScanner(file_extensions, excluded_dirs=excluded_dirs, max_depth=max_depth,
+                                   max_file_size=max_file_size)
+        # A utils.metrics.Metrics collects stage timings; the default does nothing
+        self.metrics = metrics or NULL_METRICS
+        self.file_analyzer = FileAnalyzer(include_comments, case_sensitive, self.metrics,
+                                          time_budget=file_time_budget, max_content_size=max_file_size)
+        self.failures = FailureLog()
+        self.dependency_analyzer = self.file_analyzer.dependency_analyzer
+        self.complexity_analyzer = self.file_analyzer.complexity_analyzer
+
+    # Analyzes everything and returns {file_path: result}; on_result is called
+    # with each file as it finishes
+    def run(self, on_result=None):
+        results = {}
+        is_directory = os.path.isdir(self.url_or_path)
+        commit = git_head(self.url_or_path) if is_directory and self.previous_state is None else None
+        dirty_files = git_dirty_files(self.url_or_path, commit)
+        self.failures = FailureLog()
+        try:
+            for file_path, result in self.iter_results():
+                if self.keep_results:
+                    results[file_path] = result
+                if on_result is not None:
+                    on_result(file_path, result)
+        except Exception as e:
+            self.failures.aborted = f"{type(e).__name__}: {e}"
+            # An incomplete tree must not become the baseline for incremental runs
+            is_directory = False
+        finally:
+            self.report_failures()
+            self.close_cache()
+            publish_metrics(self.metrics, self.output_dir, "analysis", self.progress)
+            self.reporter.close()
+
+        if self.state is not None:
+            return self.state.results
+        if is_directory and self.keep_results:
+            self.state = AnalysisState(results, self.token_statistics, commit=commit,
+                                       function_index=self.function_index, file_tokens=self.file_tokens,
+                                       dirty_files=dirty_files)
+        return results
+
+    def iter_results(self):
+        if os.path.isdir(self.url_or_path):
+            if self.previous_state is not None:
+                yield from self.iter_incremental(self.url_or_path)
+            else:
+                yield from self.iter_directory(self.url_or_path)
+        elif self.url_or_path.startswith("https://github.com"):
+            yield from self.iter_github_repo(self.url_or_path)
+        else:
+            self.progress(f"Invalid input: {self.url_or_path}")
+
+    def open_cache(self):
+        if self.cache is None and self.use_cache and self.output_dir:
+            ensure_dir(self.output_dir)
+            self.cache = AnalysisCache(os.path.join(self.output_dir, CACHE_FILENAME), self.file_analyzer.cache_options())
+        return self.cache
+
+    def close_cache(self):
+        if self.cache is not None:
+            self.progress(f"Analysis cache: {self.cache.hits} hits, {self.cache.misses} misses")
+            self.metrics.count("cache_hits", self.cache.hits)
+            self.metrics.count("cache_misses", self.cache.misses)
+            self.cache.close()
+            self.cache = None
+
+    def analyze_directory(self, directory):
+        return dict(self.iter_directory(directory))
+
+    # Yields (file_path, result) as each file finishes, without accumulating
+    # results, so library callers can consume a huge tree in bounded memory.
+    def iter_directory(self, directory):
+        self.open_cache()
+        self.token_statistics = TokenStatistics()
+        self.function_index = FunctionIndex()
+        self.file_tokens = {} if self.keep_file_tokens and self.cache is None and self.keep_results else None
+        # Walking first gives progress a real total; the scan is a small
+        # fraction of the analysis time
+        file_paths = self.collect_files(directory)
+        self.reporter.set_total(len(file_paths))
+        if self.workers > 1 and len(file_paths) > 1:
+            yield from self.iter_pool(file_paths)
+            return
+
+        self.report_skipped_files()
+        for file_path in file_paths:
+            yield file_path, self.analyze_file(file_path)
+
+    def collect_files(self, directory):
+        with self.metrics.timer("walk"):
+            return list(self.scanner.scan(directory))
+
+    def report_skipped_files(self):
+        skipped = ", ".join(f"{count} {reason}" for reason, count in self.scanner.skipped.items() if count)
+        if skipped:
+            self.progress(f"Skipped during scan: {skipped}")
+
+    def iter_pool(self, file_paths):
+        self.report_skipped_files()
+        pending = []
+        # Taken before the workers read the files, for the same reason as in
+        # AnalysisCache.analyze_file
+        stats = {}
+        for file_path in file_paths:
+            cached = None
+            if self.cache is not None:
+                stat = stats[file_path] = stat_path(file_path)
+                cached = self.cache.lookup_path(file_path, stat) if stat is not None else None
+            if cached is None:
+                pending.append(file_path)
+            else:
+                self.reporter.advance(file_path)
+                yield file_path, self.merge_result(file_path, cached)
+
+        # Workers don't share the cache connection, so files whose mtime changed
+        # are re-analyzed in the pool and their hashes recorded here.
+        self.progress(f"Analyzing {len(pending)} files with {self.workers} worker processes")
+        # Per-stage timings are not collected inside worker processes; the
+        # parent records how long it waited for each result
+        analyze = self.file_analyzer.analyze_file_isolated
+        completed = analyze_files_parallel(pending, analyze, self.workers, self.chunk_size)
+        done = 0
+        try:
+            for file_path, (digest, result, failure) in self.metrics.timed_iter("pool_wait", completed):
+                done += 1
+                self.metrics.count("files")
+                self.reporter.advance(file_path)
+                if failure is not None:
+                    self.record_failure(file_path, *failure)
+                elif self.cache is not None and result is not None:
+                    self.cache.misses += 1
+                    self.cache.store(file_path, digest, result, stats.get(file_path))
+                yield file_path, self.merge_result(file_path, result)
+        except BrokenProcessPool as e:
+            # A worker died (out of memory, a crash in an extension): the
+            # files it had not returned yet are reported rather than retried
+            for file_path in pending[done:]:
+                self.record_failure(file_path, ERROR, f"worker process died: {e}")
+                self.reporter.advance(file_path)
+                yield file_path, None
+
+    # Re-analyzes only what changed since previous_state, updating its results,
+    # file stats and token statistics in place. Candidates come from git diff
+    # against the previous commit (or since_commit) when the directory is a
+    # checkout, otherwise from comparing mtimes and sizes after a scan.
+    def iter_incremental(self, directory):
+        state = self.state = self.previous_state
+        self.open_cache()
+        self.token_statistics = state.token_statistics
+        self.function_index = state.function_index
+        commit = git_head(directory)
+        changed, deleted = self.detect_changes(directory, state, commit)
+        state.commit = commit
+
+        if changed or deleted:
+            self.progress(f"Incremental analysis: {len(changed)} changed, {len(deleted)} removed files")
+        self.reporter.set_total(len(changed))
+        if self.cache is None:
+            if state.file_tokens is None and (changed or deleted):
+                self.progress("Analysis cache is disabled; word frequencies of changed files are not retracted")
+            self.file_tokens = state.file_tokens
+
+        for file_path in sorted(deleted):
+            self.retract_tokens(file_path)
+            self.function_index.remove(file_path)
+            state.results.pop(file_path, None)
+            state.file_stats.pop(file_path, None)
+        if deleted:
+            self.on_files_removed(sorted(deleted))
+
+        for file_path in sorted(changed):
+            stat = file_stat(file_path)
+            if file_path in state.results:
+                self.retract_tokens(file_path)
+            result = self.analyze_file(file_path)
+            state.results[file_path] = result
+            if stat is not None:
+                state.file_stats[file_path] = stat
+            yield file_path, result
+
+    def detect_changes(self, directory, state, commit):
+        base = self.since_commit or state.commit
+        changes = git_changes(directory, base) if base else None
+        if changes is None:
+            state.dirty_files = set()
+            return diff_file_stats(state.file_stats, collect_file_stats(self.scanner.scan(directory)))
+
+        changed, deleted = set(), set()
+        # Files that were dirty last time may have been reverted since and
+        # no longer show up in the diff
+        for file_path in changes.changed | state.dirty_files:
+            if self.accepts_file(directory, file_path):
+                # Files edited before the previous run show up in every diff
+                # against its commit; the stat check skips them
+                if file_stat(file_path) != state.file_stats.get(file_path):
+                    changed.add(file_path)
+            elif file_path in state.results:
+                deleted.add(file_path)
+        deleted.update(path for path in changes.deleted if path in state.results and not os.path.isfile(path))
+        if base == commit:
+            state.dirty_files = changes.changed | changes.deleted
+        else:
+            state.dirty_files = git_dirty_files(directory, commit)
+        return changed, deleted
+
+    def accepts_file(self, directory, file_path):
+        rel_path = os.path.relpath(file_path, directory).replace(os.sep, '/')
+        return (os.path.isfile(file_path) and self.scanner.matches_path(rel_path)
+                and self.scanner.accept_file(file_path))
+
+    def retract_tokens(self, file_path):
+        frequencies = self.state.file_tokens.pop(file_path, None) if self.state.file_tokens is not None else None
+        if frequencies is None and self.cache is not None:
+            previous = self.cache.previous_result(file_path)
+            frequencies = previous.get("word_frequencies") if previous is not None else None
+        if frequencies is not None:
+            self.token_statistics.remove(frequencies)
+
+    def analyze_github_repo(self, repo_url):
+        return dict(self.iter_github_repo(repo_url))
+
+    def iter_github_repo(self, repo_url):
+        self.token_statistics = TokenStatistics()
+        self.function_index = FunctionIndex()
+        fetcher = None
+        try:
+            # Imported here so plain local analysis does not pay for requests
+            from .github_fetcher import GitHubFetcher, GITHUB_API_BASE
+            fetcher = GitHubFetcher(repo_url, api_base=self.github_api_base or GITHUB_API_BASE,
+                                    mode=self.github_mode, workers=max(self.workers, 4))
+            self.progress(f"Downloading {fetcher.owner}/{fetcher.name} ({fetcher.mode})")
+            files = fetcher.iter_files(self.scanner.matches_path, self.scanner.max_file_size)
+            for path, data in self.metrics.timed_iter("download", files):
+                if self.scanner.skip_binary and b'\0' in data[:BINARY_SNIFF_BYTES]:
+                    continue
+                try:
+                    file_data = data.decode('utf-8')
+                except UnicodeDecodeError:
+                    continue
+                try:
+                    with time_budget(self.file_analyzer.time_budget):
+                        result = self.merge_result(path, self.analyze_content(file_data, path))
+                except Exception as e:
+                    self.record_failure(path, *describe_failure(e))
+                    result = None
+
+                # Save content to local file
+                local_path = os.path.join(self.output_dir, path)
+                ensure_dir(os.path.dirname(local_path))
+                with open(local_path, 'wb') as f:
+                    f.write(data)
+
+                self.reporter.advance(path)
+                yield path, result
+        except Exception as e:
+            self.progress(f"Error analyzing GitHub repo: {str(e)}")
+        finally:
+            if fetcher is not None:
+                fetcher.close()
+
+    def analyze_file(self, file_path):
+        start = time.perf_counter()
+        with self.metrics.profile_file():
+            try:
+                with time_budget(self.file_analyzer.time_budget):
+                    if self.cache is not None:
+                        result = self.cache.analyze_file(file_path, self.file_analyzer)
+                    else:
+                        result = self.file_analyzer.analyze_file(file_path)
+            except Exception as e:
+                self.record_failure(file_path, *describe_failure(e))
+                result = None
+        self.metrics.record_file(file_path, time.perf_counter() - start)
+        self.reporter.advance(file_path)
+        return self.merge_result(file_path, result)
+
+    def record_failure(self, file_path, reason, message):
+        self.failures.add(file_path, reason, message)
+        self.metrics.count(f"failed_{reason}")
+        self.progress(f"Skipped {file_path}: {message}")
+
+    def report_failures(self):
+        summary = self.failures.summary()
+        if summary:
+            self.progress(summary)
+
+    # Moves the bulky parts of a file result into the repository-wide
+    # structures before it is handed on
+    def merge_result(self, file_path, result):
+        if result is not None and "functions" in result:
+            with self.metrics.timer("index_functions"):
+                self.function_index.add(file_path, result.pop("functions"))
+        else:
+            self.function_index.remove(file_path)
+        return self.merge_tokens(result, file_path)
+
+    def merge_tokens(self, result, file_path):
+        # Per-file frequencies are folded into the repository totals and dropped
+        # so the results dict stays small
+        if result is not None and "word_frequencies" in result:
+            with self.metrics.timer("merge_tokens"):
+                frequencies = result.pop("word_frequencies")
+                self.token_statistics.add(frequencies)
+                if self.file_tokens is not None:
+                    self.file_tokens[file_path] = frequencies
+        return result
+
+    # Resolved module-level import graph of the Python files in `results`. It
+    # is saved to output_dir and reused from there while the imports are
+    # unchanged.
+    def build_import_graph(self, results):
+        root = self.url_or_path if os.path.isdir(self.url_or_path) else None
+        cache_path = None
+        if self.output_dir:
+            ensure_dir(self.output_dir)
+            cache_path = os.path.join(self.output_dir, GRAPH_FILENAME)
+        with self.metrics.timer("import_graph"):
+            return load_or_build_import_graph(results, root, cache_path)
+
+    def analyze_content(self, content, file_path=None):
+        return self.file_analyzer.analyze_content(content, file_path)
+
+    def remove_comments(self, content, file_path=None):
+        return self.file_analyzer.remove_comments(content, file_path)
+
+    def generate_summary_report(self, results):
+        # Imported here so analysis alone does not load numpy
+        from .results_table import ResultsTable
+        with self.metrics.timer("summary_report"):
+            return ResultsTable.from_results(results).report() + self.failures.report()
\ No newline at end of file
@@ -0,0 +1,175 @@
+import os
+import numpy as np
+
+# Column-oriented copy of a {file_path: result} mapping for whole-tree
+# aggregation. Row i is file i; numeric metrics are int64 arrays, the
+# language is a small integer code and each file's dependencies are a slice
+# of one int32 array of dependency ids (offsets[i]:offsets[i + 1]), the same
+# layout Arrow uses for list columns. Totals, percentiles and rankings are
+# then single numpy calls, which take milliseconds over a million files.
+# numpy comes in with matplotlib; callers import this module only when they
+# need it so plain analysis does not load numpy.
+
+TABLE_FILENAME = "results_table.npz"
+METRIC_COLUMNS = ("lines_of_code", "word_count", "complexity")
+PERCENTILES = (50, 90, 99)
+DEFAULT_TOP = 20
+
+def _pack_strings(strings):
+    # UTF-8 bytes of all strings back to back plus their offsets
+    encoded = [string.encode('utf-8', 'surrogateescape') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+def _unpack_strings(data, offsets):
+    raw = data.tobytes()
+    return [raw[start:end].decode('utf-8', 'surrogateescape') for start, end in zip(offsets[:-1], offsets[1:])]
+
+class ResultsTable:
+    def __init__(self, paths, lines_of_code, word_count, complexity, languages=None, language_codes=None,
+                 dependencies=None, dependency_offsets=None, dependency_ids=None):
+        n = len(paths)
+        self.paths = list(paths)
+        self.columns = {
+            "lines_of_code": np.asarray(lines_of_code, dtype=np.int64),
+            "word_count": np.asarray(word_count, dtype=np.int64),
+            "complexity": np.asarray(complexity, dtype=np.int64),
+        }
+        self.languages = list(languages) if languages is not None else []
+        self.language_codes = (np.asarray(language_codes, dtype=np.int16) if language_codes is not None
+                               else np.full(n, -1, dtype=np.int16))
+        self.dependencies = list(dependencies) if dependencies is not None else []
+        self.dependency_offsets = (np.asarray(dependency_offsets, dtype=np.int64) if dependency_offsets is not None
+                                   else np.zeros(n + 1, dtype=np.int64))
+        self.dependency_ids = (np.asarray(dependency_ids, dtype=np.int32) if dependency_ids is not None
+                               else np.zeros(0, dtype=np.int32))
+
+    # Files whose result is None (failed analysis) are left out, as in the
+    # summary report
+    @classmethod
+    def from_results(cls, results):
+        paths = []
+        lines, words, complexity, codes = [], [], [], []
+        language_ids, dependency_index = {}, {}
+        offsets, dependency_ids = [0], []
+        for file_path, result in results.items():
+            if result is None:
+                continue
+            paths.append(file_path)
+            lines.append(result['lines_of_code'])
+            words.append(result.get('word_count', 0))
+            complexity.append(result['complexity'])
+            language = result.get('language')
+            codes.append(-1 if language is None else language_ids.setdefault(language, len(language_ids)))
+            for dependency in dict.fromkeys(result['dependencies']):
+                dependency_ids.append(dependency_index.setdefault(dependency, len(dependency_index)))
+            offsets.append(len(dependency_ids))
+        return cls(paths, lines, words, complexity, list(language_ids), codes, list(dependency_index), offsets,
+                   dependency_ids)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def column(self, name):
+        if name not in self.columns:
+            raise ValueError(f"Unknown column {name!r}; expected one of {', '.join(METRIC_COLUMNS)}")
+        return self.columns[name]
+
+    def dependencies_of(self, row):
+        ids = self.dependency_ids[self.dependency_offsets[row]:self.dependency_offsets[row + 1]]
+        return sorted(self.dependencies[dependency_id] for dependency_id in ids)
+
+    # Number of files using each dependency
+    def dependency_counts(self):
+        counts = np.bincount(self.dependency_ids, minlength=len(self.dependencies))
+        return {dependency: int(count) for dependency, count in zip(self.dependencies, counts) if count}
+
+    def language_counts(self):
+        known = self.language_codes[self.language_codes >= 0]
+        counts = np.bincount(known, minlength=len(self.languages))
+        return {language: int(count) for language, count in zip(self.languages, counts) if count}
+
+    # Row indices ordered by `column`, highest first; ties keep file order,
+    # the order the summary report has always used. With n only the top n
+    # are selected (argpartition) and sorted.
+    def ranking(self, column="complexity", n=None):
+        values = self.column(column)
+        if n is None or n >= len(values):
+            return np.argsort(-values, kind="stable")
+        if n <= 0:
+            return np.zeros(0, dtype=np.intp)
+        top = np.argpartition(-values, n - 1)[:n]
+        # A tie at the boundary may have picked later rows over earlier ones
+        threshold = values[top].min()
+        top = np.flatnonzero(values >= threshold)
+        return top[np.lexsort((top, -values[top]))][:n]
+
+    def statistics(self, percentiles=PERCENTILES):
+        statistics = {"files": len(self)}
+        for name in METRIC_COLUMNS:
+            values = self.columns[name]
+            total = int(values.sum())
+            entry = {
+                "total": total,
+                "average": total / len(values) if len(values) else 0.0,
+                "max": int(values.max()) if len(values) else 0,
+            }
+            if len(values):
+                entry["percentiles"] = {str(p): float(value) for p, value in
+                                        zip(percentiles, np.percentile(values, percentiles))}
+            statistics[name] = entry
+        statistics["languages"] = self.language_counts()
+        statistics["unique_dependencies"] = len(self.dependencies)
+        return statistics
+
+    def top(self, column="complexity", n=DEFAULT_TOP):
+        return [{"path": self.paths[row], **{name: int(self.columns[name][row]) for name in METRIC_COLUMNS}}
+                for row in self.ranking(column, n)]
+
+    # Same text as SummaryAccumulator.report
+    def report(self):
+        total_files = len(self)
+        total_lines = int(self.columns["lines_of_code"].sum())
+        total_complexity = int(self.columns["complexity"].sum())
+        average = total_complexity / total_files if total_files else 0.0
+        dependencies = sorted(self.dependency_counts())
+        lines = [f"""
+Codebase Analysis Summary
+-------------------------
+Total files analyzed: {total_files}
+Total lines of code: {total_lines}
+Average complexity: {average:.2f}
+Unique dependencies: {', '.join(dependencies)}
+
+Files by complexity:
+"""]
+        paths = self.paths
+        complexity, lines_of_code = self.columns["complexity"].tolist(), self.columns["lines_of_code"].tolist()
+        for row in self.ranking("complexity").tolist():
+            lines.append(f"  {paths[row]}: Complexity {complexity[row]}, Lines: {lines_of_code[row]}\n")
+        return "".join(lines)
+
+    # Writes every column to output_dir as an uncompressed .npz; numpy
+    # writes each array's buffer as is, with no per-row conversion. Strings
+    # are stored as UTF-8 data plus offsets.
+    def save(self, output_dir, filename=TABLE_FILENAME):
+        path = os.path.join(output_dir, filename)
+        path_data, path_offsets = _pack_strings(self.paths)
+        language_data, language_offsets = _pack_strings(self.languages)
+        dependency_data, dependency_name_offsets = _pack_strings(self.dependencies)
+        np.savez(path, path_data=path_data, path_offsets=path_offsets,
+                 language_data=language_data, language_offsets=language_offsets, language_codes=self.language_codes,
+                 dependency_data=dependency_data, dependency_name_offsets=dependency_name_offsets,
+                 dependency_offsets=self.dependency_offsets, dependency_ids=self.dependency_ids,
+                 **self.columns)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(_unpack_strings(data["path_data"], data["path_offsets"]),
+                       data["lines_of_code"], data["word_count"], data["complexity"],
+                       _unpack_strings(data["language_data"], data["language_offsets"]), data["language_codes"],
+                       _unpack_strings(data["dependency_data"], data["dependency_name_offsets"]),
+                       data["dependency_offsets"], data["dependency_ids"])
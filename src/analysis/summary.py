@@ -0,0 +1,75 @@
+from collections import Counter
+
+# Running totals for the summary report, updated one file at a time so the
+# report can be produced from a stream of results. Adding a file that is
+# already counted replaces it, and files can be removed again, so incremental
+# re-analysis can keep the totals current.
+class SummaryAccumulator:
+    def __init__(self):
+        self.total_files = 0
+        self.total_lines = 0
+        self.total_complexity = 0
+        # Number of files using each dependency
+        self.dependencies = Counter()
+        self.files = {}
+
+    def add(self, file_path, result):
+        self.remove(file_path)
+        if result is None:
+            return
+        self.total_files += 1
+        self.total_lines += result['lines_of_code']
+        self.total_complexity += result['complexity']
+        dependencies = tuple(result['dependencies'])
+        self.dependencies.update(dependencies)
+        self.files[file_path] = (result['complexity'], result['lines_of_code'], dependencies)
+
+    def remove(self, file_path):
+        entry = self.files.pop(file_path, None)
+        if entry is None:
+            return
+        complexity, lines_of_code, dependencies = entry
+        self.total_files -= 1
+        self.total_lines -= lines_of_code
+        self.total_complexity -= complexity
+        self.dependencies.subtract(dependencies)
+        for dependency in dependencies:
+            if self.dependencies[dependency] <= 0:
+                self.dependencies.pop(dependency, None)
+
+    def update(self, results):
+        for file_path, result in results.items():
+            self.add(file_path, result)
+
+    def average_complexity(self):
+        return self.total_complexity / self.total_files if self.total_files else 0.0
+
+    def files_by_complexity(self):
+        ranked = sorted(self.files.items(), key=lambda x: x[1][0], reverse=True)
+        return [(file_path, complexity, lines_of_code) for file_path, (complexity, lines_of_code, _) in ranked]
+
+    def report(self):
+        report = f"""
+Codebase Analysis Summary
+-------------------------
+Total files analyzed: {self.total_files}
+Total lines of code: {self.total_lines}
+Average complexity: {self.average_complexity():.2f}
+Unique dependencies: {', '.join(sorted(self.dependencies))}
+
+Files by complexity:
+"""
+        for file_path, complexity, lines_of_code in self.files_by_complexity():
+            report += f"  {file_path}: Complexity {complexity}, Lines: {lines_of_code}\n"
+
+        return report
+
+    def as_dict(self):
+        return {
+            "total_files": self.total_files,
+            "total_lines": self.total_lines,
+            "average_complexity": self.average_complexity(),
+            "unique_dependencies": sorted(self.dependencies),
+            "files": [{"path": file_path, "complexity": complexity, "lines_of_code": lines_of_code}
+                      for file_path, complexity, lines_of_code in self.files_by_complexity()],
+        }
@@ -0,0 +1,31 @@
+from collections import Counter
+
+DEFAULT_MAX_VOCABULARY = 200000
+
+# Repository-wide word frequencies, merged one file at a time so the analysis
+# never has to keep file contents around for the word cloud.
+class TokenStatistics:
+    def __init__(self, max_vocabulary=DEFAULT_MAX_VOCABULARY):
+        self.max_vocabulary = max_vocabulary
+        self.frequencies = Counter()
+        self.file_count = 0
+
+    def add(self, word_frequencies):
+        self.frequencies.update(word_frequencies)
+        self.file_count += 1
+        # Prune in bulk rather than per word; generated code (hashes, minified
+        # identifiers) would otherwise grow the vocabulary without bound
+        if self.max_vocabulary and len(self.frequencies) > 2 * self.max_vocabulary:
+            self.frequencies = Counter(dict(self.frequencies.most_common(self.max_vocabulary)))
+
+    def remove(self, word_frequencies):
+        for word, count in word_frequencies.items():
+            remaining = self.frequencies.get(word, 0) - count
+            if remaining > 0:
+                self.frequencies[word] = remaining
+            else:
+                self.frequencies.pop(word, None)
+        self.file_count = max(0, self.file_count - 1)
+
+    def most_common(self, n=None):
+        return self.frequencies.most_common(n)
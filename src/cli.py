@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import argparse
+import logging
+
+# Headless entry point: runs the analysis pipeline and optional outputs
+# without importing Qt, so it works in CI and over SSH.
+# Run with: python -m src.cli path/to/repo --ext .py --json results.json
+# or: python main.py --headless path/to/repo
+
+DEFAULT_EXTENSIONS = [".py"]
+GRAPH_LAYOUTS = ("Force-directed", "Circular", "Hierarchical")
+
+def build_parser():
+    from .analysis.file_scanner import DEFAULT_EXCLUDED_DIRS
+    from .analysis.failures import DEFAULT_TIME_BUDGET
+    from .analysis.function_index import METRICS
+
+    parser = argparse.ArgumentParser(prog="codebase-analyzer", description="Analyze a codebase without the GUI")
+    parser.add_argument("path", help="directory or https://github.com/owner/repo URL")
+    parser.add_argument("--ext", nargs="+", default=DEFAULT_EXTENSIONS, help="file extensions to analyze")
+    parser.add_argument("--output-dir", default="analysis_output",
+                        help="where the cache, graph, word cloud and metrics files are written")
+    parser.add_argument("--max-depth", type=int, default=0, help="maximum directory depth (0 = unlimited)")
+    parser.add_argument("--exclude", nargs="*", default=list(DEFAULT_EXCLUDED_DIRS), help="directory names to skip")
+    parser.add_argument("--no-comments", action="store_true", help="strip comments before counting words")
+    parser.add_argument("--case-sensitive", action="store_true")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for the analysis")
+    parser.add_argument("--cache", action="store_true", help="reuse cached results for unchanged files")
+    parser.add_argument("--file-timeout", type=float, default=DEFAULT_TIME_BUDGET,
+                        help="seconds allowed per file before it is skipped (0 = unlimited)")
+    parser.add_argument("--json", dest="json_path", default="-",
+                        help="write results as JSON to this file ('-' for stdout, the default)")
+    parser.add_argument("--no-results", action="store_true", help="leave per-file results out of the JSON")
+    parser.add_argument("--top-words", type=int, default=50, help="most frequent words to include in the JSON")
+    parser.add_argument("--report", action="store_true", help="print the text summary report to stderr")
+    parser.add_argument("--hotspots", type=int, default=0,
+                        help="include this many most complex functions in the JSON")
+    parser.add_argument("--hotspot-metric", choices=METRICS, default="cyclomatic",
+                        help="metric the hotspots are ranked by")
+    parser.add_argument("--import-graph", action="store_true",
+                        help="resolve the Python import graph, write it to the output directory and "
+                             "summarize its cycles and fan-in")
+    parser.add_argument("--export-table", action="store_true",
+                        help="write the results as a columnar table (results_table.npz) to the output directory "
+                             "and add percentiles and rankings to the JSON")
+    parser.add_argument("--graph", choices=("html", "png"), help="also write the knowledge graph")
+    parser.add_argument("--graph-layout", choices=GRAPH_LAYOUTS, default=GRAPH_LAYOUTS[0])
+    parser.add_argument("--word-cloud", action="store_true", help="also write the word cloud image")
+    parser.add_argument("--metrics", action="store_true", help="record stage timings to the output directory")
+    parser.add_argument("--quiet", action="store_true", help="do not log progress to stderr")
+    return parser
+
+def run(args):
+    from .analysis.pipeline import AnalysisPipeline
+    from .analysis.summary import SummaryAccumulator
+    from .analysis.import_graph import GRAPH_FILENAME
+    from .utils.metrics import Metrics
+
+    log = (lambda message: None) if args.quiet else (lambda message: print(message, file=sys.stderr))
+    os.makedirs(args.output_dir, exist_ok=True)
+    metrics = Metrics() if args.metrics else None
+
+    pipeline = AnalysisPipeline(args.path, args.output_dir, args.ext, args.max_depth, not args.no_comments,
+                                args.case_sensitive, workers=args.workers, use_cache=args.cache,
+                                excluded_dirs=args.exclude, metrics=metrics, progress=log,
+                                file_time_budget=args.file_timeout)
+    summary = SummaryAccumulator()
+    results = pipeline.run(summary.add)
+
+    report = {
+        "input": args.path,
+        "summary": summary.as_dict(),
+        "failures": pipeline.failures.as_dict(),
+        "top_words": pipeline.token_statistics.most_common(args.top_words),
+        "outputs": {},
+    }
+    if args.hotspots:
+        report["hotspots"] = pipeline.function_index.top(args.hotspot_metric, args.hotspots)
+    if args.import_graph:
+        graph = pipeline.build_import_graph(results)
+        report["import_graph"] = graph.summary()
+        report["outputs"]["import_graph"] = os.path.join(args.output_dir, GRAPH_FILENAME)
+    if args.export_table:
+        from .analysis.results_table import ResultsTable
+        table = ResultsTable.from_results(results)
+        report["statistics"] = table.statistics()
+        report["largest_files"] = table.top("lines_of_code")
+        report["outputs"]["results_table"] = table.save(args.output_dir)
+    if not args.no_results:
+        report["results"] = results
+
+    if args.graph:
+        from .visualization.outputs import write_knowledge_graph
+        report["outputs"]["knowledge_graph"] = write_knowledge_graph(
+            results, args.output_dir, args.graph_layout, args.graph, metrics=Metrics() if args.metrics else None,
+            progress=log)
+    if args.word_cloud:
+        from .visualization.outputs import write_word_cloud
+        report["outputs"]["word_cloud"] = write_word_cloud(
+            pipeline.token_statistics.frequencies, args.output_dir, metrics=Metrics() if args.metrics else None,
+            progress=log)
+
+    if args.report:
+        print(summary.report() + pipeline.failures.report(), file=sys.stderr)
+    return report
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    report = run(args)
+    if args.json_path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
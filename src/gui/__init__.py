@@ -1,2 +1,16 @@
-from .main_window import MainWindow
-from .config_dialog import ConfigDialog
\ No newline at end of file
+import importlib
+
+# Resolved on first access so that the models and helper threads can be used
+# without loading QtWebEngine through MainWindow
+_EXPORTS = {
+    "MainWindow": ".main_window",
+    "ConfigDialog": ".config_dialog",
+    "ResultsModel": ".results_model",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -2,18 +2,32 @@ import os
 import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit, QFileDialog, 
                              QLabel, QProgressBar, QLineEdit, QCheckBox, QGroupBox, QSpinBox, QTabWidget, 
-                             QListWidget, QSplitter, QComboBox, QMessageBox, QTreeWidget, QTreeWidgetItem, 
+                             QListWidget, QSplitter, QComboBox, QMessageBox, QTreeView,
                              QDialog, QDialogButtonBox, QPlainTextEdit)
-from PyQt6.QtCore import Qt, QSettings, QSize, QPoint, QUrl
-from PyQt6.QtGui import QIcon, QFont, QDesktopServices
+from PyQt6.QtCore import Qt, QSettings, QSize, QPoint, QUrl, QTimer, QThread, QStandardPaths
+from PyQt6.QtGui import QIcon, QFont, QDesktopServices, QTextCursor
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
 from .config_dialog import ConfigDialog
 from ..analysis.code_analyzer import CodeAnalyzer
+from ..analysis.summary import SummaryAccumulator
+from ..analysis.file_scanner import DEFAULT_EXCLUDED_DIRS
+from ..utils.metrics import Metrics
 from ..visualization.knowledge_graph import KnowledgeGraphGenerator
 from ..visualization.word_cloud import WordCloudGenerator
 from ..llm.feature_suggester import FeatureSuggester
 from ..llm.feature_developer import FeatureDeveloper
+from ..llm.response_cache import ResponseCache, RESPONSE_CACHE_FILENAME
+from ..llm.llm_client import get_client, PROVIDER_DEFAULTS
+from .warm_up import WarmUpThread, warm_up_modules
+from .results_model import ResultsModel
+
+WATCH_INTERVAL_MS = 5000
+# How long closing waits for a warm-up import that is still running
+WARM_UP_CLOSE_WAIT_MS = 500
+# With profiling on, one file in this many runs under cProfile
+PROFILE_SAMPLE_EVERY = 20
+LOG_MAX_LINES = 5000
 
 class MainWindow(QMainWindow):
     def __init__(self, initial_path=None):
@@ -29,6 +43,13 @@ class MainWindow(QMainWindow):
 
         self.output_dir = self.settings.value("default_output_dir", "")
         self.analysis_results = {}
+        self.word_frequencies = {}
+        self.analyzer = None
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(WATCH_INTERVAL_MS)
+        self.watch_timer.timeout.connect(self.reanalyze_changes)
+        self.warm_up_thread = None
+        self.response_cache = None
 
         if initial_path:
             self.input_field.setText(initial_path)
@@ -85,13 +106,28 @@ class MainWindow(QMainWindow):
         options_layout = QVBoxLayout()
         
         depth_layout = QHBoxLayout()
-        depth_layout.addWidget(QLabel("Max depth for web scraping:"))
+        depth_layout.addWidget(QLabel("Max directory depth:"))
         self.max_depth_spinbox = QSpinBox()
-        self.max_depth_spinbox.setRange(1, 10)
-        self.max_depth_spinbox.setValue(3)
+        self.max_depth_spinbox.setRange(0, 64)
+        self.max_depth_spinbox.setSpecialValueText("Unlimited")
+        self.max_depth_spinbox.setValue(0)
         depth_layout.addWidget(self.max_depth_spinbox)
         options_layout.addLayout(depth_layout)
 
+        exclude_layout = QHBoxLayout()
+        exclude_layout.addWidget(QLabel("Excluded directories:"))
+        self.excluded_dirs_input = QLineEdit(", ".join(DEFAULT_EXCLUDED_DIRS))
+        exclude_layout.addWidget(self.excluded_dirs_input)
+        options_layout.addLayout(exclude_layout)
+
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Worker processes:"))
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, (os.cpu_count() or 1) * 2)
+        self.workers_spinbox.setValue(os.cpu_count() or 1)
+        workers_layout.addWidget(self.workers_spinbox)
+        options_layout.addLayout(workers_layout)
+
         self.include_comments_checkbox = QCheckBox("Include comments in analysis")
         self.include_comments_checkbox.setChecked(True)
         options_layout.addWidget(self.include_comments_checkbox)
@@ -99,6 +135,19 @@ class MainWindow(QMainWindow):
         self.case_sensitive_checkbox = QCheckBox("Case-sensitive analysis")
         options_layout.addWidget(self.case_sensitive_checkbox)
 
+        self.use_cache_checkbox = QCheckBox("Reuse cached results for unchanged files")
+        self.use_cache_checkbox.setChecked(True)
+        options_layout.addWidget(self.use_cache_checkbox)
+
+        self.watch_checkbox = QCheckBox("Watch directory and re-analyze changed files")
+        options_layout.addWidget(self.watch_checkbox)
+
+        self.metrics_checkbox = QCheckBox("Record performance metrics")
+        options_layout.addWidget(self.metrics_checkbox)
+
+        self.profile_checkbox = QCheckBox("Profile a sample of files")
+        options_layout.addWidget(self.profile_checkbox)
+
         self.fetch_dependency_docs_checkbox = QCheckBox("Fetch dependency documentation")
         options_layout.addWidget(self.fetch_dependency_docs_checkbox)
 
@@ -120,6 +169,8 @@ class MainWindow(QMainWindow):
         self.llm_provider_combo.addItems(["Hugging Face", "OpenAI", "Claude"])
         llm_layout.addWidget(QLabel("LLM Provider:"))
         llm_layout.addWidget(self.llm_provider_combo)
+        self.cache_responses_checkbox = QCheckBox("Reuse cached responses for repeated prompts")
+        llm_layout.addWidget(self.cache_responses_checkbox)
         llm_group.setLayout(llm_layout)
         analysis_layout.addWidget(llm_group)
 
@@ -156,8 +207,23 @@ class MainWindow(QMainWindow):
         results_layout = QVBoxLayout()
         results_widget.setLayout(results_layout)
 
-        self.result_tree = QTreeWidget()
-        self.result_tree.setHeaderLabels(["Item", "Value"])
+        filter_layout = QHBoxLayout()
+        self.result_filter_input = QLineEdit()
+        self.result_filter_input.setPlaceholderText("Filter files by path")
+        filter_layout.addWidget(self.result_filter_input)
+        filter_layout.addWidget(QLabel("Min complexity:"))
+        self.min_complexity_spinbox = QSpinBox()
+        self.min_complexity_spinbox.setRange(0, 1000000)
+        filter_layout.addWidget(self.min_complexity_spinbox)
+        results_layout.addLayout(filter_layout)
+
+        self.results_model = ResultsModel(self)
+        self.result_tree = QTreeView()
+        self.result_tree.setModel(self.results_model)
+        # Lets the view skip measuring every row
+        self.result_tree.setUniformRowHeights(True)
+        self.result_tree.setSortingEnabled(True)
+        self.result_tree.sortByColumn(1, Qt.SortOrder.DescendingOrder)
         results_layout.addWidget(self.result_tree)
 
         self.tab_widget.addTab(results_widget, "Results")
@@ -169,6 +235,9 @@ class MainWindow(QMainWindow):
 
         self.log_window = QTextEdit()
         self.log_window.setReadOnly(True)
+        # Oldest lines are dropped past this, so a long run cannot grow the
+        # document (and its layout cost) without bound
+        self.log_window.document().setMaximumBlockCount(LOG_MAX_LINES)
         log_layout.addWidget(self.log_window)
 
         self.progress_bar = QProgressBar()
@@ -205,6 +274,8 @@ class MainWindow(QMainWindow):
         self.generate_wordcloud_button.clicked.connect(self.generate_word_cloud)
         self.suggest_features_button.clicked.connect(self.suggest_features)
         self.self_heal_button.clicked.connect(self.perform_self_healing)
+        self.result_filter_input.textChanged.connect(self.filter_results)
+        self.min_complexity_spinbox.valueChanged.connect(self.filter_results)
 
     def browse_directory(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
@@ -220,34 +291,94 @@ class MainWindow(QMainWindow):
             self.new_ext_input.clear()
 
     def analyze_codebase(self):
+        # The button is disabled while any run is going, watch runs included;
+        # waiting for one here would block the thread its batches are
+        # acknowledged on
+        if self.analyzer is not None and self.analyzer.isRunning():
+            return
         if not self.output_dir:
             self.output_dir = QFileDialog.getExistingDirectory(self, "Select Output Directory")
         if not self.output_dir:
             return
 
         self.log_window.clear()
+        self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.analyze_button.setEnabled(False)
         self.generate_graph_button.setEnabled(False)
         self.generate_wordcloud_button.setEnabled(False)
 
+        self.watch_timer.stop()
+        self.analyzer = self.create_analyzer()
+        self.results_model.set_results({})
+        self.live_summary = SummaryAccumulator()
+        self.analyzer.start()
+
+    def create_analyzer(self, previous_state=None):
         url_or_path = self.input_field.text()
         file_extensions = [item.text() for item in self.file_ext_list.selectedItems()]
         max_depth = self.max_depth_spinbox.value()
         include_comments = self.include_comments_checkbox.isChecked()
         case_sensitive = self.case_sensitive_checkbox.isChecked()
+        workers = self.workers_spinbox.value()
+        use_cache = self.use_cache_checkbox.isChecked()
+        excluded_dirs = [name.strip() for name in self.excluded_dirs_input.text().split(",") if name.strip()]
+
+        analyzer = CodeAnalyzer(url_or_path, self.output_dir, file_extensions, max_depth, include_comments, case_sensitive,
+                                workers=workers, use_cache=use_cache, excluded_dirs=excluded_dirs,
+                                previous_state=previous_state, metrics=self.create_metrics(),
+                                keep_file_tokens=self.watch_checkbox.isChecked())
+        analyzer.analysis_progress.connect(self.update_log)
+        analyzer.progress_changed.connect(self.update_progress)
+        analyzer.results_batch.connect(self.append_results)
+        analyzer.files_removed.connect(self.remove_results)
+        analyzer.analysis_complete.connect(self.analysis_completed)
+        return analyzer
+
+    def create_metrics(self):
+        if not (self.metrics_checkbox.isChecked() or self.profile_checkbox.isChecked()):
+            return None
+        return Metrics(profile_every=PROFILE_SAMPLE_EVERY if self.profile_checkbox.isChecked() else 0)
 
-        self.analyzer = CodeAnalyzer(url_or_path, self.output_dir, file_extensions, max_depth, include_comments, case_sensitive)
-        self.analyzer.analysis_progress.connect(self.update_log)
-        self.analyzer.analysis_complete.connect(self.analysis_completed)
+    # Polled while watching: only files changed since the last run are
+    # analyzed, and the tree and summary are updated in place
+    def reanalyze_changes(self):
+        if not self.watch_checkbox.isChecked():
+            self.watch_timer.stop()
+            return
+        if self.analyzer is None or self.analyzer.isRunning() or self.analyzer.state is None:
+            return
+        self.analyze_button.setEnabled(False)
+        self.analyzer = self.create_analyzer(previous_state=self.analyzer.state)
         self.analyzer.start()
 
+    def append_results(self, batch):
+        # Results stream in while the analysis runs so large trees can be
+        # inspected before it finishes
+        self.live_summary.update(batch)
+        self.results_model.update_results(batch)
+        self.update_log(f"{self.live_summary.total_files} files analyzed so far "
+                        f"(average complexity {self.live_summary.average_complexity():.2f})")
+        self.analyzer.acknowledge_batch()
+
+    def remove_results(self, file_paths):
+        for file_path in file_paths:
+            self.live_summary.remove(file_path)
+        self.results_model.remove_files(file_paths)
+
     def analysis_completed(self, results):
         self.analysis_results = results
+        self.word_frequencies = self.analyzer.token_statistics.frequencies
+        if self.analyzer.previous_state is not None:
+            # Watch updates refresh the tree in place without reopening the report
+            self.analyze_button.setEnabled(True)
+            return
         self.update_log("Analysis completed.")
-        self.update_result_tree()
+        if self.watch_checkbox.isChecked() and self.analyzer.state is not None:
+            self.watch_timer.start()
         
-        summary_report = self.analyzer.generate_summary_report(results)
+        summary_report = self.live_summary.report() + self.analyzer.failures.report()
         self.display_summary_report(summary_report)
         
         self.analyze_button.setEnabled(True)
@@ -255,15 +386,15 @@ class MainWindow(QMainWindow):
         self.generate_wordcloud_button.setEnabled(True)
 
     def update_result_tree(self):
-        self.result_tree.clear()
-        for file_path, data in self.analysis_results.items():
-            file_item = QTreeWidgetItem(self.result_tree, [file_path])
-            for key, value in data.items():
-                QTreeWidgetItem(file_item, [key, str(value)])
-        self.result_tree.expandAll()
+        self.results_model.set_results(self.analysis_results)
+
+    def filter_results(self):
+        self.results_model.set_filter(self.result_filter_input.text(), self.min_complexity_spinbox.value())
 
     def generate_knowledge_graph(self):
-        self.graph_generator = KnowledgeGraphGenerator(self.analysis_results, self.output_dir)
+        self.graph_generator = KnowledgeGraphGenerator(self.analysis_results, self.output_dir,
+                                                       layout=self.graph_type_combo.currentText(),
+                                                       metrics=self.create_metrics())
         self.graph_generator.generation_progress.connect(self.update_log)
         self.graph_generator.generation_complete.connect(self.display_knowledge_graph)
         self.graph_generator.start()
@@ -274,7 +405,8 @@ class MainWindow(QMainWindow):
 
     def generate_word_cloud(self):
         shape = self.wordcloud_shape_combo.currentText()
-        self.wordcloud_generator = WordCloudGenerator(self.analysis_results, self.output_dir, shape)
+        self.wordcloud_generator = WordCloudGenerator(self.word_frequencies, self.output_dir, shape,
+                                                     metrics=self.create_metrics())
         self.wordcloud_generator.generation_progress.connect(self.update_log)
         self.wordcloud_generator.generation_complete.connect(self.display_word_cloud)
         self.wordcloud_generator.start()
@@ -291,8 +423,10 @@ class MainWindow(QMainWindow):
             self.update_log(f"API key for {llm_provider} is not set. Please configure it in the settings.")
             return
 
-        self.feature_suggester = FeatureSuggester(llm_provider, api_key)
+        self.feature_suggester = FeatureSuggester(llm_provider, api_key, self.get_response_cache(),
+                                                  self.get_llm_client(llm_provider, api_key))
         self.feature_suggester.suggestion_progress.connect(self.update_log)
+        self.feature_suggester.token_received.connect(self.append_streamed_text)
         self.feature_suggester.suggestion_complete.connect(self.display_feature_suggestions)
         self.feature_suggester.start()
 
@@ -326,8 +460,11 @@ class MainWindow(QMainWindow):
         llm_provider = self.llm_provider_combo.currentText()
         api_key = self.get_api_key(llm_provider)
         
-        developer = FeatureDeveloper({"name": "Self Healing", "description": "Suggest improvements for the analyzed codebase"}, llm_provider, api_key)
+        developer = FeatureDeveloper({"name": "Self Healing", "description": "Suggest improvements for the analyzed codebase"}, llm_provider, api_key,
+                                     self.get_response_cache(), self.get_llm_client(llm_provider, api_key),
+                                     analysis_results=results)
         developer.development_progress.connect(self.update_log)
+        developer.token_received.connect(self.append_streamed_text)
         developer.development_complete.connect(self.apply_self_healing)
         developer.start()
 
@@ -357,7 +494,18 @@ class MainWindow(QMainWindow):
 
     def update_log(self, message):
         self.log_window.append(message)
-        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def update_progress(self, done, total):
+        # A total of 0 (not known yet) shows a busy indicator
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(min(done, total) if total else 0)
+        self.progress_bar.setFormat(f"{done}/{total} files (%p%)" if total else f"{done} files")
+
+    def append_streamed_text(self, text):
+        # Streamed tokens extend the last log line instead of adding lines
+        self.log_window.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_window.insertPlainText(text)
+        self.log_window.ensureCursorVisible()
 
     def load_settings(self):
         self.resize(self.settings.value("window_size", QSize(1200, 800)))
@@ -366,8 +514,30 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         self.settings.setValue("window_size", self.size())
         self.settings.setValue("window_position", self.pos())
+        if self.warm_up_thread is not None:
+            # Preloading is only an optimization; closing does not wait for a
+            # slow import to finish
+            self.warm_up_thread.requestInterruption()
+            self.warm_up_thread.wait(WARM_UP_CLOSE_WAIT_MS)
+        if self.response_cache is not None:
+            self.response_cache.close()
         super().closeEvent(event)
 
+    def get_response_cache(self):
+        if not self.cache_responses_checkbox.isChecked():
+            return None
+        if self.response_cache is None:
+            cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+            os.makedirs(cache_dir, exist_ok=True)
+            self.response_cache = ResponseCache(os.path.join(cache_dir, RESPONSE_CACHE_FILENAME))
+        return self.response_cache
+
+    def get_llm_client(self, llm_provider, api_key):
+        # Hosted providers share one pooled, streaming client per key
+        if llm_provider not in PROVIDER_DEFAULTS:
+            return None
+        return get_client(llm_provider, api_key)
+
     def get_api_key(self, llm_provider):
         if llm_provider == "OpenAI":
             return self.settings.value("openai_key", "")
@@ -376,6 +546,15 @@ class MainWindow(QMainWindow):
         else:
             return None  # Hugging Face doesn't require an API key in this implementation
 
+    def start_warm_up(self):
+        # Preload the deferred plotting and LLM libraries while the user is
+        # still choosing what to analyze. Disable with the
+        # "warm_up_libraries" setting.
+        if not self.settings.value("warm_up_libraries", True, type=bool) or self.warm_up_thread is not None:
+            return
+        self.warm_up_thread = WarmUpThread(warm_up_modules(self.llm_provider_combo.currentText()))
+        self.warm_up_thread.start(QThread.Priority.LowestPriority)
+
     def check_for_updates(self):
         self.update_log("Checking for updates...")
         # In a real application, you would check a server for new versions
@@ -395,6 +574,8 @@ class MainWindow(QMainWindow):
         self.update_log("Performing update...")
         # In a real application, you would download and install the update here
         # For this example, we'll just simulate the process
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setFormat("%p%")
         for i in range(1, 101):
             self.progress_bar.setValue(i)
             QApplication.processEvents()  # Ensures the UI updates
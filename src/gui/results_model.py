@@ -0,0 +1,259 @@
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# Per-file results for a QTreeView without one widget item per value: a file
+# is stored as a small tuple, rows are exposed a page at a time through
+# fetchMore, and a file's dependencies are produced as child rows only when
+# the view asks for them. Sorting and filtering reorder a list of paths in
+# place, so they stay fast with 100k files.
+
+COLUMNS = ["File", "Complexity", "Lines", "Words", "Dependencies"]
+FETCH_BATCH = 1000
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+class ResultsModel(QAbstractItemModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # path -> (complexity, lines, words, dependencies)
+        self._files = {}
+        # Stable ids for child indexes: a dependency row points at its file by
+        # id, so it survives the file moving when rows are sorted or removed
+        self._ids = {}
+        self._paths_by_id = {}
+        self._next_id = 1
+        self._rows = []
+        self._row_of = None
+        self._fetched = FETCH_BATCH
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filter_text = ""
+        self._min_complexity = 0
+
+    @staticmethod
+    def summarize(data):
+        return (data.get("complexity", 0), data.get("lines_of_code", 0), data.get("word_count", 0),
+                tuple(data.get("dependencies", ())))
+
+    # Replaces everything, e.g. after a full run
+    def set_results(self, results):
+        self.beginResetModel()
+        self._files = {}
+        self._ids = {}
+        self._paths_by_id = {}
+        for file_path, data in results.items():
+            if data is not None:
+                self._add_file(file_path, data)
+        self._rows = self._filtered_paths()
+        self._sort_rows()
+        self._fetched = FETCH_BATCH
+        self.endResetModel()
+
+    # Adds or replaces the files in a results batch
+    def update_results(self, batch):
+        added = []
+        for file_path, data in batch.items():
+            if data is None:
+                continue
+            if file_path not in self._files:
+                self._add_file(file_path, data)
+                if self._accepts(file_path):
+                    added.append(file_path)
+            else:
+                self._replace_file(file_path, self.summarize(data))
+
+        if added:
+            before = self._visible()
+            after = min(len(self._rows) + len(added), self._fetched)
+            if after > before:
+                self.beginInsertRows(QModelIndex(), before, after - 1)
+            self._rows.extend(added)
+            self._row_of = None
+            if after > before:
+                self.endInsertRows()
+        if self._sort_column is not None:
+            # New rows went to the end; timsort is close to linear on a sorted
+            # list with a short unsorted tail
+            self._relayout(self._sort_rows)
+
+    def _replace_file(self, file_path, summary):
+        previous = self._files[file_path]
+        row = self.row_of(file_path)
+        if row is None or row >= self._visible():
+            self._files[file_path] = summary
+            return
+        parent = self.index(row, 0)
+        if previous[3] != summary[3]:
+            # The dependency child rows are replaced wholesale
+            if previous[3]:
+                self.beginRemoveRows(parent, 0, len(previous[3]) - 1)
+                self._files[file_path] = previous[:3] + ((),)
+                self.endRemoveRows()
+            if summary[3]:
+                self.beginInsertRows(parent, 0, len(summary[3]) - 1)
+                self._files[file_path] = summary
+                self.endInsertRows()
+        self._files[file_path] = summary
+        self.dataChanged.emit(parent, self.index(row, len(COLUMNS) - 1))
+
+    def remove_files(self, file_paths):
+        for file_path in file_paths:
+            if file_path not in self._files:
+                continue
+            row = self.row_of(file_path)
+            visible = row is not None and row < self._visible()
+            if visible:
+                self.beginRemoveRows(QModelIndex(), row, row)
+            if row is not None:
+                del self._rows[row]
+                self._row_of = None
+            if visible:
+                # The window shrinks with the row; a row past it must not
+                # slide in unannounced
+                self._fetched -= 1
+            del self._files[file_path]
+            del self._paths_by_id[self._ids.pop(file_path)]
+            if visible:
+                self.endRemoveRows()
+
+    def set_filter(self, text="", min_complexity=0):
+        self.beginResetModel()
+        self._filter_text = text.lower()
+        self._min_complexity = min_complexity
+        self._rows = self._filtered_paths()
+        self._sort_rows()
+        self._fetched = FETCH_BATCH
+        self.endResetModel()
+
+    def file_count(self):
+        return len(self._files)
+
+    def visible_paths(self):
+        return list(self._rows)
+
+    def row_of(self, file_path):
+        if self._row_of is None:
+            self._row_of = {path: row for row, path in enumerate(self._rows)}
+        return self._row_of.get(file_path)
+
+    def _add_file(self, file_path, data):
+        self._files[file_path] = self.summarize(data)
+        if file_path not in self._ids:
+            self._ids[file_path] = self._next_id
+            self._paths_by_id[self._next_id] = file_path
+            self._next_id += 1
+
+    def _accepts(self, file_path):
+        if self._files[file_path][0] < self._min_complexity:
+            return False
+        return not self._filter_text or self._filter_text in file_path.lower()
+
+    def _filtered_paths(self):
+        if not self._filter_text and not self._min_complexity:
+            return list(self._files)
+        return [file_path for file_path in self._files if self._accepts(file_path)]
+
+    def _sort_rows(self):
+        if self._sort_column is None:
+            return
+        if self._sort_column == 0:
+            key = None
+        elif self._sort_column == 4:
+            key = lambda path: len(self._files[path][3])
+        else:
+            field = self._sort_column - 1
+            key = lambda path: self._files[path][field]
+        self._rows.sort(key=key, reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        self._row_of = None
+
+    def _relayout(self, change):
+        self.layoutAboutToBeChanged.emit()
+        old = [index for index in self.persistentIndexList() if index.internalId() == 0]
+        paths = [self._rows[index.row()] if index.row() < len(self._rows) else None for index in old]
+        change()
+        new = []
+        for index, path in zip(old, paths):
+            row = self.row_of(path) if path is not None else None
+            visible = row is not None and row < self._visible()
+            new.append(self.createIndex(row, index.column(), 0) if visible else QModelIndex())
+        self.changePersistentIndexList(old, new)
+        self.layoutChanged.emit()
+
+    def _visible(self):
+        return min(len(self._rows), self._fetched)
+
+    # QAbstractItemModel interface. Top-level indexes carry id 0; a
+    # dependency row carries the id of its file.
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, self._ids[self._rows[parent.row()]])
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        row = self.row_of(self._paths_by_id.get(index.internalId()))
+        return self.createIndex(row, 0, 0) if row is not None else QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self._visible()
+        if parent.internalId() != 0 or parent.column() != 0:
+            return 0
+        return len(self._files[self._rows[parent.row()]][3])
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.rowCount(parent) > 0
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._fetched < len(self._rows)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        before = self._visible()
+        after = min(len(self._rows), self._fetched + FETCH_BATCH)
+        if after > before:
+            self.beginInsertRows(QModelIndex(), before, after - 1)
+            self._fetched = after
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() != 0:
+            if role == Qt.ItemDataRole.DisplayRole and index.column() == 0:
+                file_path = self._paths_by_id.get(index.internalId())
+                dependencies = self._files[file_path][3] if file_path in self._files else ()
+                return dependencies[index.row()] if index.row() < len(dependencies) else None
+            return None
+
+        file_path = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, SORT_ROLE):
+                return file_path
+            return None
+        complexity, lines, words, dependencies = self._files[file_path]
+        value = (complexity, lines, words, len(dependencies))[column - 1]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(value)
+        if role == SORT_ROLE:
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout(self._sort_rows)
@@ -0,0 +1,27 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from ..utils.lazy_import import warm_up
+
+# Heavy libraries the window defers until first use, in the order they are
+# preloaded once the window is showing. transformers is only worth the
+# seconds it takes when the local Hugging Face provider is selected.
+VISUALIZATION_MODULES = ["numpy", "networkx", "matplotlib.figure", "wordcloud"]
+LLM_MODULES = {
+    "OpenAI": ["openai"],
+    "Claude": ["anthropic"],
+    "Hugging Face": ["transformers"],
+}
+
+def warm_up_modules(llm_provider=None):
+    return VISUALIZATION_MODULES + LLM_MODULES.get(llm_provider, [])
+
+class WarmUpThread(QThread):
+    warm_up_complete = pyqtSignal(list)
+
+    def __init__(self, module_names):
+        super().__init__()
+        self.module_names = module_names
+
+    # requestInterruption() stops it before the next module; an import that
+    # has started runs to the end
+    def run(self):
+        self.warm_up_complete.emit(warm_up(self.module_names, self.isInterruptionRequested))
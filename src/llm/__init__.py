@@ -1,2 +1,23 @@
-from .feature_suggester import FeatureSuggester
-from .feature_developer import FeatureDeveloper
\ No newline at end of file
+import importlib
+
+# Resolved on first access so that the model registry can be imported (for
+# example in its worker process) without pulling in PyQt
+_EXPORTS = {
+    "FeatureSuggester": ".feature_suggester",
+    "FeatureDeveloper": ".feature_developer",
+    "ModelRegistry": ".model_registry",
+    "ModelWorker": ".model_registry",
+    "get_registry": ".model_registry",
+    "ResponseCache": ".response_cache",
+    "LLMClient": ".llm_client",
+    "get_client": ".llm_client",
+    "build_chunks": ".self_heal",
+    "heal": ".self_heal",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
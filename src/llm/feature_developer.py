@@ -1,18 +1,75 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-import openai
-import anthropic
-from transformers import pipeline
+from ..utils.lazy_import import lazy_import
+from .model_registry import get_registry, pipeline
+from .response_cache import cached_completion
+from .self_heal import SELF_HEAL_PROMPT, build_chunks, heal, parse_file_suggestions
+from ..utils.file_utils import safe_read_file
 import ast
 
+# The LLM client libraries take seconds to import; they load on first use
+openai = lazy_import("openai")
+anthropic = lazy_import("anthropic")
+
+SYSTEM_PROMPT = "You are a skilled Python developer that implements new features for software applications."
+
+# Reviewed when self-healing is run without analysis results
+SAMPLE_CODE = '''
+def complex_function(x, y):
+    z = 0
+    for i in range(x):
+        for j in range(y):
+            z += i * j
+    return z
+
+def unused_function():
+    pass
+
+global_var = 42
+
+class PoorlyNamedClass:
+    def __init__(self):
+        self.x = 10
+        self.y = 20
+        self.z = 30
+    
+    def poorly_named_method(self):
+        return self.x + self.y + self.z
+'''
+
+# The {'method', 'additions'} reply for a new feature; raises SyntaxError or
+# ValueError when it is not one
+def parse_code(response):
+    code_dict = ast.literal_eval(response)
+    # Basic validation
+    if not isinstance(code_dict, dict) or 'method' not in code_dict or 'additions' not in code_dict:
+        raise ValueError("Invalid response format")
+
+    # Attempt to parse the method to ensure it's valid Python code
+    ast.parse(code_dict['method'])
+    return code_dict
+
 class FeatureDeveloper(QThread):
     development_progress = pyqtSignal(str)
     development_complete = pyqtSignal(dict)
+    # Completion text as it streams in, when an LLMClient is used
+    token_received = pyqtSignal(str)
 
-    def __init__(self, feature, llm_provider, api_key):
+    def __init__(self, feature, llm_provider, api_key, response_cache=None, llm_client=None,
+                 analysis_results=None, **self_heal_options):
         super().__init__()
         self.feature = feature
         self.llm_provider = llm_provider
         self.api_key = api_key
+        # An optional ResponseCache answers repeated prompts without an API call
+        self.response_cache = response_cache
+        # With a shared llm_client.LLMClient the completion is streamed over its
+        # pooled connections; without one the provider SDK is called directly
+        self.llm_client = llm_client
+        # Self-healing works on these CodeAnalyzer results; self_heal_options
+        # (max_chunk_tokens, max_total_tokens, max_workers, time_budget) bound
+        # the run
+        self.analysis_results = analysis_results
+        self.self_heal_options = self_heal_options
 
     def run(self):
         self.development_progress.emit(f"Developing feature: {self.feature['name']}...")
@@ -41,82 +98,88 @@ class FeatureDeveloper(QThread):
                 return self.develop_with_huggingface(prompt)
 
     def generate_self_healing_suggestions(self):
-        prompt = (
-            "Analyze the following Python codebase and suggest improvements for each file. "
-            "Focus on code quality, performance, and best practices. "
-            "Provide specific code changes for each suggestion. "
-            "Format your response as a JSON object where keys are file paths and values are the improved code content."
-        )
-
-        # Here we would normally pass the entire codebase, but for brevity, let's assume we're working with a single file
-        sample_code = '''
-def complex_function(x, y):
-    z = 0
-    for i in range(x):
-        for j in range(y):
-            z += i * j
-    return z
-
-def unused_function():
-    pass
+        if not self.analysis_results:
+            # Nothing analyzed: show what the feature does on a small example
+            prompt = f"{SELF_HEAL_PROMPT}\n\nFile: sample.py\n\n{SAMPLE_CODE}"
+            try:
+                return parse_file_suggestions(self.complete(prompt, validate=parse_file_suggestions))
+            except (SyntaxError, ValueError) as e:
+                self.development_progress.emit(f"Error in self-healing suggestions: {str(e)}")
+                return {}
 
-global_var = 42
-
-class PoorlyNamedClass:
-    def __init__(self):
-        self.x = 10
-        self.y = 20
-        self.z = 30
-    
-    def poorly_named_method(self):
-        return self.x + self.y + self.z
-'''
-        prompt += f"\n\nCodebase:\n{sample_code}"
+        options = dict(self.self_heal_options)
+        heal_options = {name: options.pop(name) for name in ("max_workers", "time_budget") if name in options}
+        chunks = build_chunks(self.analysis_results, safe_read_file, **options)
+        files = len({chunk.file_path for chunk in chunks})
+        self.development_progress.emit(f"Sending {len(chunks)} chunks from {files} files for review...")
+        # Parallel chunks would interleave their streamed tokens, so only the
+        # final suggestions are reported
+        return heal(chunks, lambda prompt: self.complete(prompt, stream=False, validate=parse_file_suggestions),
+                    progress=self.development_progress.emit, **heal_options)
 
+    # The raw completion text for a prompt from the selected provider; it is
+    # only cached when validate(text) accepts it
+    def complete(self, prompt, stream=True, validate=None):
         if self.llm_provider == "OpenAI":
-            return self.develop_with_openai(prompt)
+            return self.complete_with_openai(prompt, stream, validate)
         elif self.llm_provider == "Claude":
-            return self.develop_with_claude(prompt)
+            return self.complete_with_claude(prompt, stream, validate)
         else:
-            return self.develop_with_huggingface(prompt)
+            return self.complete_with_huggingface(prompt)
 
     def develop_with_openai(self, prompt):
-        openai.api_key = self.api_key
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a skilled Python developer that implements new features for software applications."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return self.parse_and_validate_code(response.choices[0].message.content.strip())
+        return self.parse_and_validate_code(self.complete_with_openai(prompt, validate=parse_code))
+
+    def complete_with_openai(self, prompt, stream=True, validate=None):
+        on_token = self.token_received.emit if stream else None
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+        def request():
+            if self.llm_client is not None:
+                return self.llm_client.complete(prompt, SYSTEM_PROMPT, 2000, on_token).strip()
+            openai.api_key = self.api_key
+            response = openai.ChatCompletion.create(model="gpt-3.5-turbo", messages=messages)
+            return response.choices[0].message.content.strip()
+
+        return cached_completion(self.response_cache, "OpenAI", "gpt-3.5-turbo", messages, {}, request, validate)
 
     def develop_with_claude(self, prompt):
-        client = anthropic.Client(api_key=self.api_key)
-        response = client.completion(
-            prompt=f"Human: {prompt}\n\nAssistant:",
-            model="claude-2",
-            max_tokens_to_sample=2000,
-        )
-        return self.parse_and_validate_code(response.completion.strip())
+        return self.parse_and_validate_code(self.complete_with_claude(prompt, validate=parse_code))
+
+    def complete_with_claude(self, prompt, stream=True, validate=None):
+        on_token = self.token_received.emit if stream else None
+
+        def request():
+            if self.llm_client is not None:
+                return self.llm_client.complete(prompt, max_tokens=2000, on_token=on_token).strip()
+            client = anthropic.Client(api_key=self.api_key)
+            response = client.completion(
+                prompt=f"Human: {prompt}\n\nAssistant:",
+                model="claude-2",
+                max_tokens_to_sample=2000,
+            )
+            return response.completion.strip()
+
+        return cached_completion(self.response_cache, "Claude", "claude-2", prompt,
+                                 {"max_tokens_to_sample": 2000}, request, validate)
 
     def develop_with_huggingface(self, prompt):
-        generator = pipeline('text-generation', model='gpt2')
-        response = generator(prompt, max_length=2000, num_return_sequences=1)[0]['generated_text']
+        response = self.complete_with_huggingface(prompt)
         # Note: This is a simplification. In practice, you'd need more sophisticated parsing for HuggingFace output.
         return {"method": "def placeholder_method(self):\n    pass", "additions": ""}
 
+    def complete_with_huggingface(self, prompt):
+        # The registry keeps gpt2 loaded between clicks
+        text = get_registry().generate([prompt], factory=pipeline, max_length=2000, num_return_sequences=1)[0]
+        # Text generation returns the prompt followed by the continuation
+        return text[len(prompt):] if text.startswith(prompt) else text
+
     def parse_and_validate_code(self, response):
         try:
-            code_dict = ast.literal_eval(response)
-            # Basic validation
-            if not isinstance(code_dict, dict) or 'method' not in code_dict or 'additions' not in code_dict:
-                raise ValueError("Invalid response format")
-            
-            # Attempt to parse the method to ensure it's valid Python code
-            ast.parse(code_dict['method'])
-            
-            return code_dict
+            return parse_code(response)
         except (SyntaxError, ValueError) as e:
             self.development_progress.emit(f"Error in generated code: {str(e)}")
             return {"method": "def error_method(self):\n    pass", "additions": "# Error in code generation"}
\ No newline at end of file
@@ -1,16 +1,37 @@
+import ast
 from PyQt6.QtCore import QThread, pyqtSignal
-import openai
-import anthropic
-from transformers import pipeline
+from ..utils.lazy_import import lazy_import
+from .model_registry import get_registry, pipeline
+from .response_cache import cached_completion
+
+# The LLM client libraries take seconds to import; they load on first use
+openai = lazy_import("openai")
+anthropic = lazy_import("anthropic")
+
+SYSTEM_PROMPT = "You are a helpful assistant that suggests new features for software applications."
+
+# The reply should be a Python list of {'name', 'description'} dicts
+def parse_suggestions(text):
+    suggestions = ast.literal_eval(text)
+    if not isinstance(suggestions, list):
+        raise ValueError("Expected a list of suggestions")
+    return suggestions
 
 class FeatureSuggester(QThread):
     suggestion_progress = pyqtSignal(str)
     suggestion_complete = pyqtSignal(list)
+    # Completion text as it streams in, when an LLMClient is used
+    token_received = pyqtSignal(str)
 
-    def __init__(self, llm_provider, api_key):
+    def __init__(self, llm_provider, api_key, response_cache=None, llm_client=None):
         super().__init__()
         self.llm_provider = llm_provider
         self.api_key = api_key
+        # An optional ResponseCache answers repeated prompts without an API call
+        self.response_cache = response_cache
+        # With a shared llm_client.LLMClient the completion is streamed over its
+        # pooled connections; without one the provider SDK is called directly
+        self.llm_client = llm_client
 
     def run(self):
         self.suggestion_progress.emit("Generating feature suggestions...")
@@ -32,27 +53,40 @@ class FeatureSuggester(QThread):
             return self.generate_with_huggingface(prompt)
 
     def generate_with_openai(self, prompt):
-        openai.api_key = self.api_key
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that suggests new features for software applications."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return eval(response.choices[0].message.content.strip())
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+        def request():
+            if self.llm_client is not None:
+                return self.llm_client.complete(prompt, SYSTEM_PROMPT, on_token=self.token_received.emit).strip()
+            openai.api_key = self.api_key
+            response = openai.ChatCompletion.create(model="gpt-3.5-turbo", messages=messages)
+            return response.choices[0].message.content.strip()
+
+        text = cached_completion(self.response_cache, "OpenAI", "gpt-3.5-turbo", messages, {}, request,
+                                 parse_suggestions)
+        return parse_suggestions(text)
 
     def generate_with_claude(self, prompt):
-        client = anthropic.Client(api_key=self.api_key)
-        response = client.completion(
-            prompt=f"Human: {prompt}\n\nAssistant:",
-            model="claude-2",
-            max_tokens_to_sample=1000,
-        )
-        return eval(response.completion.strip())
+        def request():
+            if self.llm_client is not None:
+                return self.llm_client.complete(prompt, max_tokens=1000, on_token=self.token_received.emit).strip()
+            client = anthropic.Client(api_key=self.api_key)
+            response = client.completion(
+                prompt=f"Human: {prompt}\n\nAssistant:",
+                model="claude-2",
+                max_tokens_to_sample=1000,
+            )
+            return response.completion.strip()
+
+        text = cached_completion(self.response_cache, "Claude", "claude-2", prompt,
+                                 {"max_tokens_to_sample": 1000}, request, parse_suggestions)
+        return parse_suggestions(text)
 
     def generate_with_huggingface(self, prompt):
-        generator = pipeline('text-generation', model='gpt2')
-        response = generator(prompt, max_length=1000, num_return_sequences=1)[0]['generated_text']
+        # The registry keeps gpt2 loaded between clicks
+        response = get_registry().generate([prompt], factory=pipeline, max_length=1000, num_return_sequences=1)[0]
         # Note: This is a simplification. In practice, you'd need more sophisticated parsing for HuggingFace output.
         return [{"name": "Feature suggestion", "description": "Description of the feature"}] * 5
\ No newline at end of file
@@ -0,0 +1,179 @@
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+# One pooled HTTP client per provider and key, shared by every feature
+# thread. Completions are streamed (server-sent events) so callers can show
+# tokens as they arrive; several prompts can run at once under a rate limit,
+# and throttled or failed requests are retried with exponential backoff.
+
+PROVIDER_DEFAULTS = {
+    "OpenAI": {"api_base": "https://api.openai.com/v1", "model": "gpt-3.5-turbo"},
+    "Claude": {"api_base": "https://api.anthropic.com/v1", "model": "claude-2"},
+}
+ANTHROPIC_VERSION = "2023-06-01"
+DEFAULT_MAX_TOKENS = 1000
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+REQUEST_TIMEOUT = 60
+
+class LLMRequestError(Exception):
+    pass
+
+def _ignore(*args):
+    pass
+
+# Token bucket: up to `burst` requests at once, refilled at `rate` per second
+class RateLimiter:
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
+def iter_sse_data(lines):
+    # The "data:" payloads of a server-sent event stream
+    for line in lines:
+        if line and line.startswith("data:"):
+            yield line[5:].strip()
+
+class LLMClient:
+    def __init__(self, provider, api_key, api_base=None, model=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, session=None, sleep=time.sleep):
+        if provider not in PROVIDER_DEFAULTS:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        defaults = PROVIDER_DEFAULTS[provider]
+        self.provider = provider
+        self.api_base = (api_base or defaults["api_base"]).rstrip('/')
+        self.model = model or defaults["model"]
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.rate_limiter = RateLimiter(requests_per_minute / 60, burst=self.max_concurrency, sleep=sleep)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if provider == "OpenAI":
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+        else:
+            self.session.headers["x-api-key"] = api_key or ""
+            self.session.headers["anthropic-version"] = ANTHROPIC_VERSION
+
+    def close(self):
+        self.session.close()
+
+    # Returns the whole completion; on_token receives each piece of text as
+    # it is streamed
+    def complete(self, prompt, system=None, max_tokens=DEFAULT_MAX_TOKENS, on_token=None):
+        on_token = on_token or _ignore
+        url, body = self.build_request(prompt, system, max_tokens)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            streamed = False
+            try:
+                with self.session.post(url, json=body, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                        self.sleep(self.retry_delay(attempt, response.headers.get("Retry-After")))
+                        continue
+                    if response.status_code >= 400:
+                        raise LLMRequestError(f"{self.provider} request failed with HTTP {response.status_code}: "
+                                              f"{response.text[:200]}")
+                    pieces = []
+                    for token in self.iter_tokens(response):
+                        streamed = True
+                        pieces.append(token)
+                        on_token(token)
+                    return "".join(pieces)
+            except requests.RequestException as e:
+                # Once tokens have reached the caller a retry would repeat them
+                if streamed or attempt == self.max_retries:
+                    raise LLMRequestError(f"{self.provider} request failed: {e}") from e
+                self.sleep(self.retry_delay(attempt))
+        raise LLMRequestError(f"{self.provider} request failed after {self.max_retries} retries")
+
+    # Runs the prompts concurrently (up to max_concurrency at a time) and
+    # returns the completions in order; on_token gets (index, token)
+    def complete_many(self, prompts, system=None, max_tokens=DEFAULT_MAX_TOKENS, on_token=_ignore):
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(1, len(prompts)))) as executor:
+            futures = [executor.submit(self.complete, prompt, system, max_tokens,
+                                       lambda token, index=index: on_token(index, token))
+                       for index, prompt in enumerate(prompts)]
+            return [future.result() for future in futures]
+
+    def retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+    def build_request(self, prompt, system, max_tokens):
+        messages = [{"role": "user", "content": prompt}]
+        if self.provider == "OpenAI":
+            if system:
+                messages.insert(0, {"role": "system", "content": system})
+            return f"{self.api_base}/chat/completions", {
+                "model": self.model, "messages": messages, "max_tokens": max_tokens, "stream": True}
+        body = {"model": self.model, "messages": messages, "max_tokens": max_tokens, "stream": True}
+        if system:
+            body["system"] = system
+        return f"{self.api_base}/messages", body
+
+    def iter_tokens(self, response):
+        # Event streams are UTF-8 whatever the Content-Type says; chunk_size=None
+        # hands over each chunk as soon as it arrives instead of filling a buffer
+        response.encoding = "utf-8"
+        for data in iter_sse_data(response.iter_lines(chunk_size=None, decode_unicode=True)):
+            if data == "[DONE]":
+                return
+            event = json.loads(data)
+            if self.provider == "OpenAI":
+                for choice in event.get("choices", []):
+                    content = choice.get("delta", {}).get("content")
+                    if content:
+                        yield content
+            elif event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+            elif event.get("type") == "message_stop":
+                return
+            elif event.get("type") == "error":
+                raise LLMRequestError(f"{self.provider} stream error: {event.get('error')}")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(provider, api_key, api_base=None):
+    key = (provider, api_key, api_base)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = LLMClient(provider, api_key, api_base)
+        return client
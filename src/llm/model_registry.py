@@ -0,0 +1,164 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from ..utils.lazy_import import lazy_import
+
+# Keeps local Hugging Face pipelines loaded between requests. Loading gpt2
+# takes seconds and a few hundred MB, so each (factory, task, model) is loaded
+# once per process, shared by every caller and dropped after sitting unused
+# for idle_timeout seconds.
+
+pipeline = lazy_import("transformers", "pipeline")
+
+DEFAULT_MODEL = "gpt2"
+DEFAULT_TASK = "text-generation"
+DEFAULT_IDLE_TIMEOUT = 600
+
+# Local directory of a model already in the Hugging Face cache, so loading
+# it never touches the network. Falls back to the name when the model is not
+# cached (the pipeline then downloads it, unless HF_HUB_OFFLINE is set).
+def resolve_model_path(model):
+    if os.path.isdir(model):
+        return model
+    try:
+        from huggingface_hub import snapshot_download
+        return snapshot_download(model, local_files_only=True)
+    except Exception:
+        return model
+
+def generated_text(output):
+    # One prompt gives [{'generated_text': ...}, ...]; a batch gives one such
+    # list per prompt
+    if isinstance(output, list):
+        output = output[0]
+    return output['generated_text']
+
+# gpt2 and other decoder-only models ship without a pad token, and a
+# pipeline refuses to batch without one. The end-of-text token stands in, and
+# padding goes on the left so generation continues right after each prompt.
+def prepare_for_batching(generator):
+    tokenizer = getattr(generator, "tokenizer", None)
+    model = getattr(generator, "model", None)
+    if tokenizer is not None and model is not None and tokenizer.pad_token_id is None:
+        tokenizer.pad_token_id = model.config.eos_token_id
+        tokenizer.padding_side = "left"
+    return generator
+
+class LoadedModel:
+    def __init__(self, generator, now):
+        self.generator = generator
+        self.last_used = now
+        # Pipelines are not safe to call from two threads at once
+        self.lock = threading.Lock()
+
+class ModelRegistry:
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._models = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def get(self, model=DEFAULT_MODEL, task=DEFAULT_TASK, factory=None):
+        factory = factory or pipeline
+        key = (factory, task, model)
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                # One lock per key: a second caller waits for the first load
+                # instead of loading the same weights again
+                load_lock = self._loading.setdefault(key, threading.Lock())
+        if loaded is None:
+            with load_lock:
+                with self._lock:
+                    loaded = self._models.get(key)
+                if loaded is None:
+                    generator = prepare_for_batching(factory(task, model=resolve_model_path(model)))
+                    loaded = LoadedModel(generator, self.clock())
+                    with self._lock:
+                        self._models[key] = loaded
+                        self._loading.pop(key, None)
+                    self._start_reaper()
+        loaded.last_used = self.clock()
+        return loaded
+
+    # Runs every prompt through one generate call and returns the generated
+    # text for each, in order
+    def generate(self, prompts, model=DEFAULT_MODEL, task=DEFAULT_TASK, factory=None, **generate_kwargs):
+        loaded = self.get(model, task, factory)
+        with loaded.lock:
+            if len(prompts) == 1:
+                outputs = [loaded.generator(prompts[0], **generate_kwargs)]
+            else:
+                outputs = loaded.generator(list(prompts), batch_size=len(prompts), **generate_kwargs)
+            loaded.last_used = self.clock()
+        return [generated_text(output) for output in outputs]
+
+    def loaded_models(self):
+        with self._lock:
+            return [(task, model) for _, task, model in self._models]
+
+    def evict_idle(self):
+        now = self.clock()
+        with self._lock:
+            idle = [key for key, loaded in self._models.items()
+                    if now - loaded.last_used >= self.idle_timeout and not loaded.lock.locked()]
+            for key in idle:
+                del self._models[key]
+        return len(idle)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.idle_timeout:
+            return
+        self._reaper = threading.Thread(target=self._reap, name="model-registry-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(max(self.idle_timeout / 2, 1))
+            self.evict_idle()
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+def _generate_in_worker(prompts, model, task, factory, generate_kwargs):
+    return get_registry().generate(prompts, model, task, factory, **generate_kwargs)
+
+# Runs generation in a separate process that keeps its own registry, so
+# tokenization and inference never hold the GIL of the GUI process. The
+# process starts on first use and keeps its models until shutdown().
+class ModelWorker:
+    def __init__(self, model=DEFAULT_MODEL, task=DEFAULT_TASK, factory=None):
+        self.model = model
+        self.task = task
+        # Must be picklable (a module-level function); None uses transformers.pipeline
+        self.factory = factory
+        self._executor = None
+
+    def submit(self, prompts, **generate_kwargs):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor.submit(_generate_in_worker, list(prompts), self.model, self.task, self.factory,
+                                     generate_kwargs)
+
+    def generate(self, prompts, **generate_kwargs):
+        return self.submit(prompts, **generate_kwargs).result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
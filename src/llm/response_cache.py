@@ -0,0 +1,135 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_FILENAME = "llm_responses.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+def request_key(provider, model, prompt, params=None):
+    payload = json.dumps([provider, model, prompt, params or {}], sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8', 'surrogatepass'), digest_size=20).hexdigest()
+
+def _parses(response, validate):
+    if validate is None:
+        return True
+    try:
+        validate(response)
+    except Exception as e:
+        logger.info(f"Not caching a reply that does not parse: {e}")
+        return False
+    return True
+
+# Completion texts keyed by (provider, model, prompt, parameters), kept on
+# disk for ttl seconds and trimmed to the max_entries most recently used.
+# Identical requests made while one is already on its way wait for that call
+# instead of sending their own.
+class ResponseCache:
+    def __init__(self, db_path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                request_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+
+    def get(self, key):
+        with self._lock:
+            return self._lookup(key)
+
+    # Callers hold self._lock
+    def _lookup(self, key):
+        now = self.clock()
+        row = self.connection.execute(
+            "SELECT response, created FROM responses WHERE request_key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self.ttl and now - row[1] > self.ttl:
+            self.connection.execute("DELETE FROM responses WHERE request_key = ?", (key,))
+            return None
+        self.connection.execute("UPDATE responses SET last_used = ? WHERE request_key = ?", (now, key))
+        return row[0]
+
+    def put(self, key, response):
+        now = self.clock()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (request_key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now))
+            self.connection.commit()
+
+    # Returns the cached text for the request, or calls request() (which must
+    # return the completion text) once no matter how many threads ask. With
+    # validate, a reply is only stored when validate(text) does not raise, so
+    # a malformed answer is asked for again next time instead of replayed.
+    def fetch(self, provider, model, prompt, params, request, validate=None):
+        key = request_key(provider, model, prompt, params)
+        # The lookup and the in-flight check share one lock section: the owner
+        # stores its reply before leaving _in_flight, so a caller sees one or
+        # the other
+        with self._lock:
+            cached = self._lookup(key)
+            pending = None if cached is not None else self._in_flight.get(key)
+            owner = cached is None and pending is None
+            if owner:
+                pending = self._in_flight[key] = Future()
+        if cached is not None:
+            self.hits += 1
+            return cached
+        if not owner:
+            self.hits += 1
+            return pending.result()
+
+        self.misses += 1
+        try:
+            response = request()
+            if _parses(response, validate):
+                self.put(key, response)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        pending.set_result(response)
+        return response
+
+    def evict(self):
+        now = self.clock()
+        with self._lock:
+            expired = self.connection.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount if self.ttl else 0
+            overflow = self.connection.execute(
+                "DELETE FROM responses WHERE request_key NOT IN "
+                "(SELECT request_key FROM responses ORDER BY last_used DESC LIMIT ?)", (self.max_entries,)).rowcount
+            self.connection.commit()
+        return expired + overflow
+
+    def close(self):
+        evicted = self.evict()
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from response cache {self.db_path}")
+        self.connection.close()
+
+# Lets the feature threads share one code path whether or not a cache is set
+def cached_completion(cache, provider, model, prompt, params, request, validate=None):
+    if cache is None:
+        return request()
+    return cache.fetch(provider, model, prompt, params, request, validate)
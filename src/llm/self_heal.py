@@ -0,0 +1,217 @@
+import io
+import ast
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Turns analysis results into LLM-sized pieces for self-healing: the most
+# complex files first, each split along top-level statement boundaries into
+# chunks of at most max_chunk_tokens, until max_total_tokens is used up.
+# The chunks are sent in parallel and the answers are spliced back into
+# whole-file suggestions.
+
+DEFAULT_MAX_CHUNK_TOKENS = 1500
+DEFAULT_MAX_TOTAL_TOKENS = 20000
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIME_BUDGET = 300
+# Rough size of a token in characters for source code
+CHARS_PER_TOKEN = 4
+
+SELF_HEAL_PROMPT = (
+    "Analyze the following Python code and suggest improvements. "
+    "Focus on code quality, performance, and best practices. "
+    "Format your response as a JSON object where keys are file paths and values are the improved code content."
+)
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+# Lines as the Python tokenizer counts them: str.splitlines() also breaks on
+# form feeds and other separators that ast line numbers do not count
+def source_lines(content):
+    return io.StringIO(content, newline='').readlines()
+
+class Chunk:
+    def __init__(self, file_path, start_line, end_line, text, whole_file, source=None):
+        self.file_path = file_path
+        # 1-based, inclusive
+        self.start_line = start_line
+        self.end_line = end_line
+        self.text = text
+        self.whole_file = whole_file
+        # The whole file as it was when it was chunked; replies are spliced
+        # into this, not into whatever is on disk by then
+        self.source = text if source is None else source
+
+    @property
+    def tokens(self):
+        return estimate_tokens(self.text)
+
+    def prompt(self):
+        where = "" if self.whole_file else f" (lines {self.start_line}-{self.end_line}; return only this excerpt)"
+        return f"{SELF_HEAL_PROMPT}\n\nFile: {self.file_path}{where}\n\n{self.text}"
+
+def rank_files(analysis_results):
+    # Most complex first, larger files breaking ties
+    ranked = [(data.get("complexity", 0), data.get("lines_of_code", 0), file_path)
+              for file_path, data in analysis_results.items() if data]
+    ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+    return [file_path for _, _, file_path in ranked]
+
+def statement_spans(content):
+    # (start, end) line ranges of the top-level statements, each including the
+    # comments and decorators above it, so a chunk never cuts a function in half
+    lines = source_lines(content)
+    try:
+        body = ast.parse(content).body
+    except SyntaxError:
+        return [(1, len(lines))] if lines else []
+    spans = []
+    previous_end = 0
+    for node in body:
+        spans.append((previous_end + 1, node.end_lineno))
+        previous_end = node.end_lineno
+    if spans and previous_end < len(lines):
+        spans[-1] = (spans[-1][0], len(lines))
+    return spans
+
+def split_source(file_path, content, max_chunk_tokens=DEFAULT_MAX_CHUNK_TOKENS):
+    lines = source_lines(content)
+    if estimate_tokens(content) <= max_chunk_tokens:
+        return [Chunk(file_path, 1, len(lines), content, True)] if lines else []
+
+    max_chars = max_chunk_tokens * CHARS_PER_TOKEN
+    chunks = []
+    start = end = None
+    size = 0
+    for span_start, span_end in statement_spans(content):
+        span_size = sum(len(line) for line in lines[span_start - 1:span_end])
+        if start is not None and size + span_size > max_chars:
+            chunks.append(Chunk(file_path, start, end, "".join(lines[start - 1:end]), False, content))
+            start = None
+        if start is None:
+            start, size = span_start, 0
+        end = span_end
+        size += span_size
+    if start is not None:
+        chunks.append(Chunk(file_path, start, end, "".join(lines[start - 1:end]), False, content))
+
+    # A single statement over the budget (a huge class) is cut by lines
+    result = []
+    for chunk in chunks:
+        if chunk.tokens <= max_chunk_tokens:
+            result.append(chunk)
+            continue
+        piece_start = chunk.start_line
+        piece = []
+        for number in range(chunk.start_line, chunk.end_line + 1):
+            piece.append(lines[number - 1])
+            if sum(map(len, piece)) >= max_chars:
+                result.append(Chunk(file_path, piece_start, number, "".join(piece), False, content))
+                piece_start, piece = number + 1, []
+        if piece:
+            result.append(Chunk(file_path, piece_start, chunk.end_line, "".join(piece), False, content))
+    return result
+
+# The chunks to send for the given results, most complex files first, within
+# max_total_tokens. A file that does not fit in what is left is skipped
+# whole so it is never half rewritten.
+def build_chunks(analysis_results, read_file, max_chunk_tokens=DEFAULT_MAX_CHUNK_TOKENS,
+                 max_total_tokens=DEFAULT_MAX_TOTAL_TOKENS):
+    chunks = []
+    total = 0
+    for file_path in rank_files(analysis_results):
+        content = read_file(file_path)
+        if not content:
+            continue
+        file_chunks = split_source(file_path, content, max_chunk_tokens)
+        file_tokens = sum(chunk.tokens for chunk in file_chunks)
+        if total + file_tokens > max_total_tokens:
+            continue
+        chunks.extend(file_chunks)
+        total += file_tokens
+    return chunks
+
+def parse_file_suggestions(response):
+    # The reply should be a JSON (or Python literal) object of path -> code,
+    # possibly inside a ``` fence or surrounded by prose
+    text = response.strip()
+    if "```" in text:
+        fenced = text.split("```")[1]
+        text = fenced.split("\n", 1)[1] if fenced.startswith(("json", "python")) else fenced
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object in response")
+    text = text[start:end + 1]
+    try:
+        suggestions = json.loads(text)
+    except ValueError:
+        suggestions = ast.literal_eval(text)
+    if not isinstance(suggestions, dict) or not all(
+            isinstance(path, str) and isinstance(code, str) for path, code in suggestions.items()):
+        raise ValueError("Expected an object of file paths to code")
+    return suggestions
+
+def _ignore(*args):
+    pass
+
+# Sends every chunk through complete(prompt) -> text on up to max_workers
+# threads and returns {file_path: improved content}. Chunks still running
+# when time_budget runs out are dropped, and a file is only returned when
+# every one of its chunks came back. Replies are spliced into the content the
+# chunks were cut from, so an edit made meanwhile is not mixed in.
+def heal(chunks, complete, max_workers=DEFAULT_MAX_WORKERS, time_budget=DEFAULT_TIME_BUDGET,
+         progress=_ignore):
+    replies = {}
+    deadline = time.monotonic() + time_budget
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    pending = {}
+    try:
+        pending = {executor.submit(complete, chunk.prompt()): chunk for chunk in chunks}
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                progress(f"Self-healing time budget used up; skipping {len(pending)} chunks")
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    suggestion = parse_file_suggestions(future.result())
+                except Exception as e:
+                    progress(f"No usable suggestion for {chunk.file_path}:{chunk.start_line}: {e}")
+                    continue
+                # The model may echo a different path; a single-key reply is
+                # taken to be about the chunk it was asked about
+                code = suggestion.get(chunk.file_path)
+                if code is None and len(suggestion) == 1:
+                    code = next(iter(suggestion.values()))
+                if code is not None:
+                    replies[chunk] = code
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+    return merge_suggestions(chunks, replies)
+
+def merge_suggestions(chunks, replies):
+    by_file = {}
+    for chunk in chunks:
+        by_file.setdefault(chunk.file_path, []).append(chunk)
+
+    merged = {}
+    for file_path, file_chunks in by_file.items():
+        if not all(chunk in replies for chunk in file_chunks):
+            continue
+        if len(file_chunks) == 1 and file_chunks[0].whole_file:
+            merged[file_path] = replies[file_chunks[0]]
+            continue
+        lines = source_lines(file_chunks[0].source)
+        # Splice from the bottom up so earlier line numbers stay valid
+        for chunk in sorted(file_chunks, key=lambda c: c.start_line, reverse=True):
+            replacement = replies[chunk]
+            if replacement and not replacement.endswith("\n"):
+                replacement += "\n"
+            lines[chunk.start_line - 1:chunk.end_line] = [replacement]
+        merged[file_path] = "".join(lines)
+    return merged
@@ -0,0 +1,66 @@
+import importlib
+import threading
+
+# Module-level stand-in for a heavy import (openai, transformers, ...). The
+# real module, or one attribute of it, is imported on first use; attribute
+# reads, writes and deletes are forwarded, so `unittest.mock.patch` on
+# "pkg.module.openai.ChatCompletion.create" keeps working.
+class LazyImport:
+    def __init__(self, module_name, attribute=None):
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attribute", attribute)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = importlib.import_module(self._module_name)
+                    if self._attribute:
+                        target = getattr(target, self._attribute)
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module_name}.{self._attribute}" if self._attribute else self._module_name
+        return f"<LazyImport {name}{'' if self.loaded else ' (not loaded)'}>"
+
+def lazy_import(module_name, attribute=None):
+    return LazyImport(module_name, attribute)
+
+# Imports the given modules (or LazyImport proxies) in order, skipping any
+# that fail, and returns the names that loaded. Meant for a background thread
+# after the window is shown; should_stop() is checked before each module.
+def warm_up(targets, should_stop=None):
+    loaded = []
+    for target in targets:
+        if should_stop is not None and should_stop():
+            break
+        try:
+            if isinstance(target, LazyImport):
+                target._load()
+            else:
+                importlib.import_module(target)
+        except Exception:
+            continue
+        loaded.append(target if isinstance(target, str) else repr(target))
+    return loaded
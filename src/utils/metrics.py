@@ -0,0 +1,197 @@
+import os
+import io
+import json
+import time
+import heapq
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_SLOWEST = 10
+MAX_TRACE_EVENTS = 100000
+
+# Counters, cumulative stage timers, the slowest files and an optional Chrome
+# trace for one run. Not thread-safe: each worker thread gets its own instance.
+class Metrics:
+    enabled = True
+
+    def __init__(self, slowest=DEFAULT_SLOWEST, trace=True, profile_every=0, max_trace_events=MAX_TRACE_EVENTS):
+        self.counters = {}
+        self.timers = {}
+        self.slowest = []
+        self.slowest_limit = slowest
+        self.trace = trace
+        self.trace_events = []
+        self.dropped_trace_events = 0
+        self.max_trace_events = max_trace_events
+        # Profile one file in every `profile_every`; 0 disables profiling
+        self.profile_every = profile_every
+        self.profiler = cProfile.Profile() if profile_every else None
+        self.profiled_files = 0
+        self._files_seen = 0
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, stage, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, start, time.perf_counter() - start, args)
+
+    def add_time(self, stage, start, seconds, args=None):
+        total = self.timers.get(stage)
+        if total is None:
+            self.timers[stage] = [seconds, 1, seconds]
+        else:
+            total[0] += seconds
+            total[1] += 1
+            total[2] = max(total[2], seconds)
+        if self.trace:
+            if len(self.trace_events) < self.max_trace_events:
+                event = {"name": stage, "ph": "X", "pid": self._pid, "tid": threading.get_ident(),
+                         "ts": (start - self._origin) * 1e6, "dur": seconds * 1e6}
+                if args:
+                    event["args"] = args
+                self.trace_events.append(event)
+            else:
+                self.dropped_trace_events += 1
+
+    def timed_iter(self, stage, iterable):
+        # Charges the time spent producing each item (a lazy directory walk,
+        # a download) to `stage` without counting what the consumer does
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(stage, start, time.perf_counter() - start)
+                return
+            self.add_time(stage, start, time.perf_counter() - start)
+            yield item
+
+    def record_file(self, path, seconds):
+        self.count("files")
+        entry = (seconds, path)
+        if len(self.slowest) < self.slowest_limit:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def profile_file(self):
+        if self.profiler is None:
+            return nullcontext()
+        self._files_seen += 1
+        if self._files_seen % self.profile_every:
+            return nullcontext()
+        self.profiled_files += 1
+        return self.profiler
+
+    def to_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "timers": {stage: {"seconds": total, "calls": calls, "max_seconds": longest}
+                       for stage, (total, calls, longest) in self.timers.items()},
+            "slowest_files": [{"path": path, "seconds": seconds}
+                              for seconds, path in sorted(self.slowest, reverse=True)],
+            "profiled_files": self.profiled_files,
+            "dropped_trace_events": self.dropped_trace_events,
+        }
+
+    def summary_lines(self):
+        lines = []
+        for stage, (total, calls, longest) in sorted(self.timers.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{stage}: {total:.3f}s over {calls} calls (max {longest * 1000:.1f} ms)")
+        if self.counters:
+            lines.append(", ".join(f"{name}={value}" for name, value in sorted(self.counters.items())))
+        for seconds, path in sorted(self.slowest, reverse=True):
+            lines.append(f"slow file: {path} ({seconds * 1000:.1f} ms)")
+        return lines
+
+    def profile_report(self, limit=20):
+        if not self.profiled_files:
+            return ""
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+    # Writes <name>_metrics.json, <name>_trace.json (chrome://tracing or
+    # Perfetto) and, when profiling, <name>_profile.prof; returns the paths
+    def write(self, output_dir, name):
+        paths = []
+        metrics_path = os.path.join(output_dir, f"{name}_metrics.json")
+        with open(metrics_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        paths.append(metrics_path)
+        if self.trace:
+            trace_path = os.path.join(output_dir, f"{name}_trace.json")
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+            paths.append(trace_path)
+        if self.profiled_files:
+            profile_path = os.path.join(output_dir, f"{name}_profile.prof")
+            self.profiler.dump_stats(profile_path)
+            paths.append(profile_path)
+        return paths
+
+# Stand-in used when metrics are off: every hook is a constant-time no-op, so
+# instrumented code pays one method call per stage.
+class NullMetrics:
+    enabled = False
+    _context = nullcontext()
+
+    def __reduce__(self):
+        # Unpickles as the shared module-level instance
+        return "NULL_METRICS"
+
+    def count(self, name, amount=1):
+        pass
+
+    def timer(self, stage, **args):
+        return self._context
+
+    def add_time(self, stage, start, seconds, args=None):
+        pass
+
+    def timed_iter(self, stage, iterable):
+        return iterable
+
+    def record_file(self, path, seconds):
+        pass
+
+    def profile_file(self):
+        return self._context
+
+    def to_dict(self):
+        return {}
+
+    def summary_lines(self):
+        return []
+
+    def profile_report(self, limit=20):
+        return ""
+
+    def write(self, output_dir, name):
+        return []
+
+NULL_METRICS = NullMetrics()
+
+# Sends the summary to a progress callback (a thread's log signal) and writes
+# the metrics files to output_dir
+def publish_metrics(metrics, output_dir, name, emit):
+    if not metrics.enabled:
+        return []
+    for line in metrics.summary_lines():
+        emit(f"[metrics] {line}")
+    if not output_dir:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    paths = metrics.write(output_dir, name)
+    emit(f"[metrics] Written to {', '.join(paths)}")
+    return paths
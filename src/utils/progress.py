@@ -0,0 +1,80 @@
+import time
+import threading
+
+# Progress from a worker, delivered at a bounded rate. Log lines and
+# per-file completions are collected as they happen and handed on at most
+# once per `interval` seconds: the lines joined into one message and the
+# file count as (done, total), so a GUI receives a few signals a second
+# instead of one per file.
+
+DEFAULT_INTERVAL = 0.1
+
+def _ignore(*args):
+    pass
+
+class ProgressReporter:
+    def __init__(self, emit_message=None, emit_progress=None, interval=DEFAULT_INTERVAL, clock=time.monotonic):
+        self.emit_message = emit_message or _ignore
+        self.emit_progress = emit_progress or _ignore
+        self.interval = interval
+        self.clock = clock
+        self.total = 0
+        self.done = 0
+        self.last_item = None
+        self._lines = []
+        self._last_flush = None
+        self._reported = None
+        self._lock = threading.Lock()
+
+    # Expected number of items; 0 when it is not known up front
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+        self.flush(force=True)
+
+    def add_total(self, count):
+        with self._lock:
+            self.total += count
+        self.flush()
+
+    def advance(self, item=None, count=1):
+        with self._lock:
+            self.done += count
+            if item is not None:
+                self.last_item = item
+        self.flush()
+
+    def message(self, text):
+        with self._lock:
+            self._lines.append(text)
+        self.flush()
+
+    def flush(self, force=False):
+        with self._lock:
+            now = self.clock()
+            if not force and self._last_flush is not None and now - self._last_flush < self.interval:
+                return
+            self._last_flush = now
+            lines, self._lines = self._lines, []
+            counts = (self.done, self.total)
+            if counts == self._reported:
+                counts = None
+            else:
+                self._reported = counts
+        if lines:
+            self.emit_message("\n".join(lines))
+        if counts is not None:
+            self.emit_progress(*counts)
+
+    def percent(self):
+        return 100.0 * self.done / self.total if self.total else None
+
+    def status(self):
+        if self.total:
+            line = f"{self.done}/{self.total} files ({self.percent():.0f}%)"
+        else:
+            line = f"{self.done} files"
+        return f"{line}, last: {self.last_item}" if self.last_item else line
+
+    def close(self):
+        self.flush(force=True)
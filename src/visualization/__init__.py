@@ -1,2 +1,14 @@
-from .knowledge_graph import KnowledgeGraphGenerator
-from .word_cloud import WordCloudGenerator
\ No newline at end of file
+import importlib
+
+# Resolved on first access so the headless outputs do not import PyQt
+_EXPORTS = {
+    "KnowledgeGraphGenerator": ".knowledge_graph",
+    "WordCloudGenerator": ".word_cloud",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
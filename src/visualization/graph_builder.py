@@ -0,0 +1,66 @@
+import heapq
+from collections import defaultdict
+from itertools import combinations
+
+# Inverted index from dependency to the files that import it. Edges between
+# files that share dependencies are generated per dependency, so the cost is
+# proportional to actual co-occurrences instead of every pair of files.
+class DependencyIndex:
+    def __init__(self):
+        self.files = []
+        self.file_ids = {}
+        self.files_by_dependency = defaultdict(list)
+
+    def add(self, file_path, dependencies):
+        if file_path in self.file_ids:
+            return
+        file_id = len(self.files)
+        self.files.append(file_path)
+        self.file_ids[file_path] = file_id
+        for dependency in set(dependencies):
+            self.files_by_dependency[dependency].append(file_id)
+
+    def update(self, analysis_results):
+        for file_path, data in analysis_results.items():
+            if data is not None:
+                self.add(file_path, data.get('dependencies', ()))
+
+    # Returns {(file_a, file_b): shared_dependency_count}. Dependencies imported
+    # by more than max_dependency_fanout files (os, sys, ...) connect nearly
+    # everything and are skipped; max_edges_per_node keeps only each file's
+    # heaviest edges.
+    def shared_dependency_edges(self, max_dependency_fanout=None, max_edges_per_node=None):
+        # Pairs are packed into a single int (low * n + high) to keep the
+        # accumulator compact; file ids are appended in increasing order
+        n = len(self.files)
+        weights = defaultdict(int)
+        for file_ids in self.files_by_dependency.values():
+            if max_dependency_fanout and len(file_ids) > max_dependency_fanout:
+                continue
+            for a, b in combinations(file_ids, 2):
+                weights[a * n + b] += 1
+
+        if max_edges_per_node:
+            weights = self._top_edges_per_node(weights, n, max_edges_per_node)
+
+        files = self.files
+        return {(files[key // n], files[key % n]): weight for key, weight in weights.items()}
+
+    def pair_count(self, max_dependency_fanout=None):
+        return sum(len(file_ids) * (len(file_ids) - 1) // 2 for file_ids in self.files_by_dependency.values()
+                   if not max_dependency_fanout or len(file_ids) <= max_dependency_fanout)
+
+    def hot_dependencies(self, max_dependency_fanout):
+        return sorted(dependency for dependency, file_ids in self.files_by_dependency.items()
+                      if len(file_ids) > max_dependency_fanout)
+
+    def _top_edges_per_node(self, weights, n, limit):
+        adjacency = defaultdict(list)
+        for key, weight in weights.items():
+            adjacency[key // n].append((weight, key))
+            adjacency[key % n].append((weight, key))
+
+        kept = set()
+        for edges in adjacency.values():
+            kept.update(key for _, key in heapq.nlargest(limit, edges))
+        return {key: weights[key] for key in kept}
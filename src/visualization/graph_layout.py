@@ -0,0 +1,208 @@
+import json
+import math
+from collections import deque, defaultdict
+import numpy as np
+
+LAYOUTS = ("Force-directed", "Circular", "Hierarchical")
+
+# Below this many nodes repulsion is computed exactly; above it the
+# particle-mesh approximation is used
+EXACT_REPULSION_LIMIT = 1500
+DEFAULT_ITERATIONS = 50
+SEEDED_ITERATIONS = 20
+_BLOCK_SIZE = 4096
+# Cells with more nodes than this are subdivided again instead of being
+# computed exactly, which keeps clustered layouts from going quadratic
+_NEAR_FIELD_LIMIT = 96
+
+def compute_layout(nodes, edges, layout="Force-directed", initial_positions=None, seed=0, iterations=None):
+    # nodes: list of node ids; edges: {(node_a, node_b): weight}
+    # Returns {node: (x, y)} with coordinates in the unit square.
+    if not nodes:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    src = np.fromiter((index[a] for a, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[b] for _, b in edges), dtype=np.int64, count=len(edges))
+    weight = np.fromiter(edges.values(), dtype=np.float64, count=len(edges))
+
+    if layout == "Circular":
+        positions = circular_layout(len(nodes))
+    elif layout == "Hierarchical":
+        positions = hierarchical_layout(len(nodes), src, dst)
+    else:
+        initial = _initial_array(nodes, index, initial_positions, src, dst, seed)
+        if iterations is None:
+            iterations = SEEDED_ITERATIONS if initial is not None else DEFAULT_ITERATIONS
+        positions = force_directed_layout(len(nodes), src, dst, weight, initial, iterations, seed)
+    positions = _normalize(positions)
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, positions)}
+
+def circular_layout(n):
+    angles = np.linspace(0, 2 * math.pi, n, endpoint=False)
+    return np.column_stack([np.cos(angles), np.sin(angles)])
+
+# Layers are breadth-first distances from the best-connected node of each
+# connected component; components are placed side by side.
+def hierarchical_layout(n, src, dst):
+    neighbors = defaultdict(list)
+    for a, b in zip(src.tolist(), dst.tolist()):
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+    degree = np.bincount(np.concatenate([src, dst]), minlength=n) if len(src) else np.zeros(n, dtype=np.int64)
+
+    positions = np.zeros((n, 2))
+    visited = np.zeros(n, dtype=bool)
+    x_offset = 0.0
+    for root in np.argsort(-degree, kind='stable').tolist():
+        if visited[root]:
+            continue
+        layers = []
+        visited[root] = True
+        queue = deque([(root, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth == len(layers):
+                layers.append([])
+            layers[depth].append(node)
+            for other in neighbors[node]:
+                if not visited[other]:
+                    visited[other] = True
+                    queue.append((other, depth + 1))
+        width = max(len(layer) for layer in layers)
+        for depth, layer in enumerate(layers):
+            for i, node in enumerate(layer):
+                positions[node] = (x_offset + (i + 0.5) * width / len(layer), -depth)
+        x_offset += width + 1
+    return positions
+
+# Fruchterman-Reingold with a hierarchical particle-mesh approximation of
+# repulsion for large graphs (Barnes-Hut style): other cells act through their
+# centroids, and each cell is either computed exactly or subdivided again.
+def force_directed_layout(n, src, dst, weight, initial, iterations=None, seed=0):
+    rng = np.random.default_rng(seed)
+    pos = initial if initial is not None else rng.random((n, 2))
+    if n == 1:
+        return pos
+    iterations = iterations or DEFAULT_ITERATIONS
+    k = math.sqrt(1.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        if n <= EXACT_REPULSION_LIMIT:
+            displacement = _exact_repulsion(pos, k)
+        else:
+            displacement = _mesh_repulsion(pos, k)
+
+        if len(src):
+            delta = pos[dst] - pos[src]
+            distance = np.sqrt((delta ** 2).sum(axis=1)) + 1e-9
+            pull = delta * (distance * weight / k)[:, None]
+            for axis in (0, 1):
+                displacement[:, axis] += np.bincount(src, weights=pull[:, axis], minlength=n)
+                displacement[:, axis] -= np.bincount(dst, weights=pull[:, axis], minlength=n)
+
+        length = np.sqrt((displacement ** 2).sum(axis=1)) + 1e-9
+        pos = pos + displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    return pos
+
+# Sum over sources j of k^2 * m_j * (p_i - s_j) / |p_i - s_j|^2, written as
+# p_i * sum_j w_ij - (W @ s)_i so the reduction is a matrix product
+def _pairwise_repulsion(points, sources, masses, kk, floor):
+    dx = points[:, 0:1] - sources[:, 0]
+    dy = points[:, 1:2] - sources[:, 1]
+    distance2 = dx * dx
+    distance2 += dy * dy
+    np.maximum(distance2, floor, out=distance2)
+    return np.divide(kk * masses, distance2)
+
+def _exact_repulsion(pos, k):
+    strength = _pairwise_repulsion(pos, pos, 1.0, k * k, 1e-6)
+    np.fill_diagonal(strength, 0.0)
+    return pos * strength.sum(axis=1)[:, None] - strength @ pos
+
+def _mesh_repulsion(pos, k):
+    n = len(pos)
+    grid = max(2, min(24, int(math.sqrt(n / 40))))
+    low = pos.min(axis=0)
+    span = pos.max(axis=0) - low + 1e-9
+    cell_xy = np.minimum(((pos - low) / span * grid).astype(np.int64), grid - 1)
+    cell = cell_xy[:, 0] * grid + cell_xy[:, 1]
+
+    mass = np.bincount(cell, minlength=grid * grid).astype(np.float64)
+    occupied = np.nonzero(mass)[0]
+    centers = np.column_stack([np.bincount(cell, weights=pos[:, 0], minlength=grid * grid)[occupied],
+                               np.bincount(cell, weights=pos[:, 1], minlength=grid * grid)[occupied]])
+    centers /= mass[occupied][:, None]
+    cell_mass = mass[occupied]
+    cell_rank = np.full(grid * grid, -1, dtype=np.int64)
+    cell_rank[occupied] = np.arange(len(occupied))
+    floor = (0.5 * span.max() / grid) ** 2
+    kk = k * k
+
+    displacement = np.zeros_like(pos)
+    for start in range(0, n, _BLOCK_SIZE):
+        block = pos[start:start + _BLOCK_SIZE]
+        strength = _pairwise_repulsion(block, centers, cell_mass, kk, floor)
+        # Remove each node's own cell; it is handled below
+        own = cell_rank[cell[start:start + _BLOCK_SIZE]]
+        strength[np.arange(len(block)), own] = 0.0
+        displacement[start:start + _BLOCK_SIZE] = block * strength.sum(axis=1)[:, None] - strength @ centers
+
+    order = np.argsort(cell, kind='stable')
+    bounds = np.searchsorted(cell[order], occupied, side='left').tolist() + [n]
+    for i in range(len(occupied)):
+        members = order[bounds[i]:bounds[i + 1]]
+        if len(members) > _NEAR_FIELD_LIMIT and len(members) < n:
+            displacement[members] += _mesh_repulsion(pos[members], k)
+        elif len(members) > 1:
+            displacement[members] += _exact_repulsion(pos[members], k)
+    return displacement
+
+def _initial_array(nodes, index, initial_positions, src, dst, seed):
+    # Reuse positions from a previous run so an updated graph keeps its shape;
+    # new nodes start next to an already placed neighbour when there is one
+    if not initial_positions:
+        return None
+    known = [node for node in nodes if node in initial_positions]
+    if not known:
+        return None
+    rng = np.random.default_rng(seed)
+    pos = rng.random((len(nodes), 2))
+    placed = np.zeros(len(nodes), dtype=bool)
+    for node in known:
+        pos[index[node]] = initial_positions[node]
+        placed[index[node]] = True
+    for a, b in zip(src.tolist(), dst.tolist()):
+        if placed[a] and not placed[b]:
+            pos[b] = pos[a] + rng.normal(0, 0.01, 2)
+            placed[b] = True
+        elif placed[b] and not placed[a]:
+            pos[a] = pos[b] + rng.normal(0, 0.01, 2)
+            placed[a] = True
+    return _normalize(pos)
+
+def _normalize(positions):
+    positions = np.asarray(positions, dtype=np.float64)
+    low = positions.min(axis=0)
+    span = positions.max(axis=0) - low
+    span[span == 0] = 1.0
+    return (positions - low) / span.max()
+
+def load_positions(path, layout):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {node: tuple(xy) for node, xy in json.load(f).get(layout, {}).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_positions(path, layout, positions):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    saved[layout] = {node: [round(x, 5), round(y, 5)] for node, (x, y) in positions.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f)
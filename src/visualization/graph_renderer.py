@@ -0,0 +1,164 @@
+import os
+import json
+
+# Labels drawn per frame; the most connected nodes inside the viewport win, so
+# zooming in reveals more labels without cluttering the overview
+LABEL_BUDGET = 150
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; background: #fff; font-family: sans-serif; }
+  canvas { display: block; }
+  #info { position: absolute; top: 8px; left: 8px; font-size: 12px; color: #555; }
+  #tip { position: absolute; display: none; padding: 4px 6px; font-size: 12px; background: rgba(255,255,255,0.95);
+         border: 1px solid #aaa; pointer-events: none; white-space: nowrap; }
+</style>
+</head>
+<body>
+<canvas id="graph"></canvas>
+<div id="info"></div>
+<div id="tip"></div>
+<script>
+const GRAPH = __DATA__;
+const LABEL_BUDGET = __LABEL_BUDGET__;
+const canvas = document.getElementById('graph');
+const ctx = canvas.getContext('2d');
+const tip = document.getElementById('tip');
+const nodes = GRAPH.nodes, edges = GRAPH.edges;
+const byImportance = nodes.map((n, i) => i).sort((a, b) => nodes[b].degree - nodes[a].degree);
+// reduce, not Math.max(...): spreading one argument per node overflows the
+// engine's argument limit on very large graphs
+const maxComplexity = nodes.reduce((max, n) => Math.max(max, n.complexity), 1);
+let scale = 1, tx = 0, ty = 0, pending = false;
+
+document.getElementById('info').textContent =
+  `${nodes.length} files, ${edges.length} shared-dependency edges (${GRAPH.layout}). Drag to pan, scroll to zoom.`;
+
+function resize() {
+  canvas.width = window.innerWidth;
+  canvas.height = window.innerHeight;
+  const size = Math.min(canvas.width, canvas.height) * 0.9;
+  scale = size; tx = (canvas.width - size) / 2; ty = (canvas.height - size) / 2;
+  draw();
+}
+
+function sx(n) { return n.x * scale + tx; }
+function sy(n) { return n.y * scale + ty; }
+function radius(n) { return 2 + Math.sqrt(n.degree) * Math.min(2, Math.max(0.5, scale / 2000)); }
+function visible(x, y) { return x > -50 && y > -50 && x < canvas.width + 50 && y < canvas.height + 50; }
+
+function color(n) {
+  const t = Math.min(1, n.complexity / maxComplexity);
+  return `rgb(${Math.round(80 + 175 * t)}, ${Math.round(140 - 80 * t)}, ${Math.round(220 - 170 * t)})`;
+}
+
+function draw() {
+  pending = false;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.globalAlpha = edges.length > 20000 ? 0.08 : 0.25;
+  ctx.strokeStyle = '#888';
+  ctx.beginPath();
+  for (const [a, b] of edges) {
+    const na = nodes[a], nb = nodes[b];
+    const x1 = sx(na), y1 = sy(na), x2 = sx(nb), y2 = sy(nb);
+    if (!visible(x1, y1) && !visible(x2, y2)) continue;
+    ctx.moveTo(x1, y1); ctx.lineTo(x2, y2);
+  }
+  ctx.stroke();
+  ctx.globalAlpha = 1;
+  for (const n of nodes) {
+    const x = sx(n), y = sy(n);
+    if (!visible(x, y)) continue;
+    ctx.fillStyle = color(n);
+    ctx.beginPath(); ctx.arc(x, y, radius(n), 0, 2 * Math.PI); ctx.fill();
+  }
+  ctx.fillStyle = '#222';
+  ctx.font = '11px sans-serif';
+  let labelled = 0;
+  for (const i of byImportance) {
+    if (labelled >= LABEL_BUDGET) break;
+    const n = nodes[i], x = sx(n), y = sy(n);
+    if (!visible(x, y)) continue;
+    ctx.fillText(n.label, x + radius(n) + 2, y + 3);
+    labelled++;
+  }
+}
+
+function schedule() { if (!pending) { pending = true; requestAnimationFrame(draw); } }
+
+let dragging = null;
+canvas.addEventListener('mousedown', e => { dragging = [e.clientX, e.clientY]; });
+window.addEventListener('mouseup', () => { dragging = null; });
+canvas.addEventListener('mousemove', e => {
+  if (dragging) {
+    tx += e.clientX - dragging[0]; ty += e.clientY - dragging[1];
+    dragging = [e.clientX, e.clientY];
+    tip.style.display = 'none';
+    schedule();
+    return;
+  }
+  let best = null, bestDistance = 64;
+  for (const n of nodes) {
+    const dx = sx(n) - e.clientX, dy = sy(n) - e.clientY, d = dx * dx + dy * dy;
+    if (d < bestDistance) { best = n; bestDistance = d; }
+  }
+  if (best) {
+    tip.textContent = `${best.path} | complexity ${best.complexity}, ${best.lines} lines, ${best.degree} links`;
+    tip.style.left = (e.clientX + 12) + 'px'; tip.style.top = (e.clientY + 12) + 'px';
+    tip.style.display = 'block';
+  } else {
+    tip.style.display = 'none';
+  }
+});
+canvas.addEventListener('wheel', e => {
+  e.preventDefault();
+  const factor = Math.exp(-e.deltaY * 0.001);
+  tx = e.clientX - (e.clientX - tx) * factor;
+  ty = e.clientY - (e.clientY - ty) * factor;
+  scale *= factor;
+  schedule();
+}, { passive: false });
+window.addEventListener('resize', resize);
+resize();
+</script>
+</body>
+</html>
+"""
+
+def render_html(analysis_results, edges, positions, output_file, layout):
+    nodes = list(positions)
+    index = {node: i for i, node in enumerate(nodes)}
+    degree = [0] * len(nodes)
+    edge_list = []
+    for (file1, file2), weight in edges.items():
+        a, b = index[file1], index[file2]
+        degree[a] += 1
+        degree[b] += 1
+        edge_list.append([a, b, weight])
+
+    node_list = []
+    for i, node in enumerate(nodes):
+        data = analysis_results.get(node) or {}
+        x, y = positions[node]
+        node_list.append({
+            "path": node,
+            "label": os.path.basename(node),
+            "x": round(x, 5),
+            "y": round(y, 5),
+            "degree": degree[i],
+            "complexity": data.get('complexity', 0),
+            "lines": data.get('lines_of_code', 0),
+        })
+
+    # "</" would end the script element early if a path contained it
+    data = json.dumps({"layout": layout, "nodes": node_list, "edges": edge_list}).replace("</", "<\\/")
+    html = (_HTML_TEMPLATE.replace("__TITLE__", "Knowledge Graph")
+            .replace("__LABEL_BUDGET__", str(LABEL_BUDGET))
+            .replace("__DATA__", data))
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return output_file
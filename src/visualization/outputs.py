@@ -0,0 +1,130 @@
+import os
+import heapq
+from .graph_builder import DependencyIndex
+from ..utils.metrics import NULL_METRICS, publish_metrics
+
+# Knowledge graph and word cloud rendering without Qt, shared by the
+# generator threads and the headless CLI. networkx, numpy, matplotlib and
+# wordcloud are imported by the function that needs them.
+
+POSITIONS_FILENAME = "knowledge_graph_layout.json"
+# Above this many files the PNG output drops labels, and unless the caller
+# chose limits edges are capped per node and dependencies shared by more than
+# LARGE_GRAPH_DEPENDENCY_FANOUT files (os, sys, ...) make no edges, which
+# keeps the pair count linear in the number of imports
+LARGE_GRAPH_NODES = 500
+LARGE_GRAPH_EDGES_PER_NODE = 20
+LARGE_GRAPH_DEPENDENCY_FANOUT = 100
+MAX_WORDS = 1000
+
+def _ignore(*args):
+    pass
+
+def graph_limits(node_count, max_dependency_fanout=None, max_edges_per_node=None):
+    if node_count > LARGE_GRAPH_NODES:
+        if max_dependency_fanout is None:
+            max_dependency_fanout = LARGE_GRAPH_DEPENDENCY_FANOUT
+        if max_edges_per_node is None:
+            max_edges_per_node = LARGE_GRAPH_EDGES_PER_NODE
+    return max_dependency_fanout, max_edges_per_node
+
+def write_knowledge_graph(analysis_results, output_dir, layout="Force-directed", output_format="html",
+                          max_dependency_fanout=None, max_edges_per_node=None, metrics=None,
+                          progress=_ignore):
+    from .graph_layout import compute_layout, load_positions, save_positions
+    from .graph_renderer import render_html
+
+    metrics = metrics or NULL_METRICS
+    nodes = [file_path for file_path, data in analysis_results.items() if data is not None]
+
+    with metrics.timer("dependency_index"):
+        index = DependencyIndex()
+        index.update(analysis_results)
+    max_dependency_fanout, max_edges_per_node = graph_limits(len(nodes), max_dependency_fanout, max_edges_per_node)
+    if max_dependency_fanout:
+        hot = index.hot_dependencies(max_dependency_fanout)
+        if hot:
+            progress(f"Skipping {len(hot)} widely shared dependencies: {', '.join(hot[:10])}")
+    with metrics.timer("edges"):
+        edges = index.shared_dependency_edges(max_dependency_fanout, max_edges_per_node)
+    metrics.count("nodes", len(nodes))
+    metrics.count("edges", len(edges))
+
+    progress(f"Computing {layout.lower()} layout for {len(nodes)} files...")
+    positions_file = os.path.join(output_dir, POSITIONS_FILENAME)
+    with metrics.timer("layout", layout=layout):
+        pos = compute_layout(nodes, edges, layout, initial_positions=load_positions(positions_file, layout))
+    save_positions(positions_file, layout, pos)
+
+    with metrics.timer("render", format=output_format):
+        if output_format == "png":
+            output_file = render_graph_png(analysis_results, nodes, edges, pos,
+                                           os.path.join(output_dir, "knowledge_graph.png"))
+        else:
+            output_file = render_html(analysis_results, edges, pos,
+                                      os.path.join(output_dir, "knowledge_graph.html"), layout)
+
+    publish_metrics(metrics, output_dir, "knowledge_graph", progress)
+    return output_file
+
+def render_graph_png(analysis_results, nodes, edges, pos, output_file):
+    import networkx as nx
+    from matplotlib.figure import Figure
+
+    G = nx.Graph()
+    G.add_nodes_from((file_path, analysis_results[file_path]) for file_path in nodes)
+    G.add_weighted_edges_from((file1, file2, weight) for (file1, file2), weight in edges.items())
+
+    large = G.number_of_nodes() > LARGE_GRAPH_NODES
+    # A Figure without pyplot needs no GUI backend and is safe off the main thread
+    figure = Figure(figsize=(12, 8))
+    nx.draw(G, pos, ax=figure.add_subplot(), with_labels=not large, node_color='lightblue',
+            node_size=20 if large else 500, width=0.2 if large else 1.0, font_size=8, font_weight='bold')
+    figure.savefig(output_file)
+    return output_file
+
+def select_cloud_words(word_frequencies, max_words=MAX_WORDS):
+    from wordcloud import STOPWORDS
+
+    # Same filtering WordCloud.generate applies to raw text: no stopwords,
+    # single characters or bare numbers
+    candidates = ((word, count) for word, count in word_frequencies.items()
+                  if len(word) > 1 and not word.isdigit() and word.lower() not in STOPWORDS)
+    return dict(heapq.nlargest(max_words, candidates, key=lambda item: item[1]))
+
+def write_word_cloud(word_frequencies, output_dir, shape="Rectangle", metrics=None, progress=_ignore):
+    from matplotlib.figure import Figure
+
+    metrics = metrics or NULL_METRICS
+    with metrics.timer("select_words"):
+        frequencies = select_cloud_words(word_frequencies)
+    metrics.count("words", len(frequencies))
+
+    with metrics.timer("layout_words"):
+        wordcloud = build_word_cloud(frequencies, shape)
+
+    with metrics.timer("render"):
+        figure = Figure(figsize=(10, 10))
+        axes = figure.add_subplot()
+        axes.imshow(wordcloud, interpolation='bilinear')
+        axes.axis('off')
+
+        output_file = os.path.join(output_dir, "word_cloud.png")
+        figure.savefig(output_file)
+
+    publish_metrics(metrics, output_dir, "word_cloud", progress)
+    return output_file
+
+def build_word_cloud(frequencies, shape):
+    from wordcloud import WordCloud
+    from matplotlib.image import imread
+
+    if shape == "Rectangle":
+        wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(frequencies)
+    elif shape == "Circle":
+        mask = imread("circle_mask.png")  # You need to provide this mask image
+        wordcloud = WordCloud(width=800, height=800, background_color='white', mask=mask).generate_from_frequencies(frequencies)
+    else:  # Custom shape
+        mask = imread("custom_mask.png")  # You need to provide this mask image
+        wordcloud = WordCloud(width=800, height=800, background_color='white', mask=mask).generate_from_frequencies(frequencies)
+    return wordcloud
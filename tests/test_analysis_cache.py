@@ -0,0 +1,112 @@
+import unittest
+from src.analysis.analysis_cache import AnalysisCache, content_hash
+from src.analysis.file_analyzer import FileAnalyzer
+from src.analysis.code_analyzer import CodeAnalyzer
+import tempfile
+import shutil
+import os
+
+class CountingFileAnalyzer(FileAnalyzer):
+    def __init__(self):
+        super().__init__(True, True)
+        self.calls = 0
+
+    def analyze_content(self, content, file_path=None):
+        self.calls += 1
+        return super().analyze_content(content, file_path)
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "cache.sqlite")
+        self.sample_file = os.path.join(self.temp_dir, "sample.py")
+        with open(self.sample_file, 'w') as f:
+            f.write("import os\n\ndef f(x):\n    if x:\n        return 1\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_file_is_not_reanalyzed(self):
+        analyzer = CountingFileAnalyzer()
+        cache = AnalysisCache(self.db_path, analyzer.cache_options())
+        first = cache.analyze_file(self.sample_file, analyzer)
+        cache.close()
+
+        cache = AnalysisCache(self.db_path, analyzer.cache_options())
+        second = cache.analyze_file(self.sample_file, analyzer)
+        cache.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(analyzer.calls, 1)
+
+    def test_touched_file_hits_content_hash(self):
+        analyzer = CountingFileAnalyzer()
+        cache = AnalysisCache(self.db_path, analyzer.cache_options())
+        cache.analyze_file(self.sample_file, analyzer)
+        stat = os.stat(self.sample_file)
+        os.utime(self.sample_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIsNone(cache.lookup_path(self.sample_file))
+        cache.analyze_file(self.sample_file, analyzer)
+        self.assertEqual(analyzer.calls, 1)
+        self.assertIsNotNone(cache.lookup_path(self.sample_file))
+        cache.close()
+
+    def test_write_during_read_is_not_trusted(self):
+        analyzer = CountingFileAnalyzer()
+        read_file = analyzer.read_file
+
+        def read_then_modify(file_path):
+            content = read_file(file_path)
+            with open(file_path, 'a') as f:
+                f.write("import sys\n")
+            stat = os.stat(file_path)
+            os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            return content
+
+        analyzer.read_file = read_then_modify
+        cache = AnalysisCache(self.db_path, analyzer.cache_options())
+        cache.analyze_file(self.sample_file, analyzer)
+        # The recorded mtime is the one from before the write
+        self.assertIsNone(cache.lookup_path(self.sample_file))
+        cache.close()
+
+    def test_modified_file_and_options_miss(self):
+        analyzer = CountingFileAnalyzer()
+        cache = AnalysisCache(self.db_path, analyzer.cache_options())
+        cache.analyze_file(self.sample_file, analyzer)
+        with open(self.sample_file, 'a') as f:
+            f.write("import sys\n")
+        result = cache.analyze_file(self.sample_file, analyzer)
+        cache.close()
+        self.assertIn('sys', result['dependencies'])
+        self.assertEqual(analyzer.calls, 2)
+
+        other_options = dict(analyzer.cache_options(), include_comments=False)
+        cache = AnalysisCache(self.db_path, other_options)
+        self.assertIsNone(cache.lookup_path(self.sample_file))
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(self.db_path, {}, max_entries=2)
+        for i in range(4):
+            path = os.path.join(self.temp_dir, f"f{i}.py")
+            with open(path, 'w') as f:
+                f.write(f"x = {i}\n")
+            cache.store(path, content_hash(f"x = {i}\n"), {"complexity": i}, os.stat(path))
+        self.assertEqual(cache.evict(), 2)
+        remaining = cache.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self.assertEqual(remaining, 2)
+        self.assertIsNone(cache.lookup_path(os.path.join(self.temp_dir, "f0.py")))
+        self.assertIsNotNone(cache.lookup_path(os.path.join(self.temp_dir, "f3.py")))
+        cache.close()
+
+    def test_code_analyzer_uses_cache(self):
+        output_dir = os.path.join(self.temp_dir, "out")
+        analyzer = CodeAnalyzer(self.temp_dir, output_dir, ['.py'], 1, True, True, use_cache=True)
+        first = analyzer.analyze_directory(self.temp_dir)
+        analyzer.close_cache()
+        second = analyzer.analyze_directory(self.temp_dir)
+        self.assertEqual(analyzer.cache.hits, 1)
+        analyzer.close_cache()
+        self.assertEqual(first, second)
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from benchmarks.synthetic import generate_codebase
+from benchmarks.run_benchmarks import compare_reports, main
+from benchmarks.bench_languages import run as run_language_benchmarks
+from benchmarks.bench_import_graph import run as run_import_graph_benchmark
+from benchmarks.bench_results_table import run as run_results_table_benchmark
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_synthetic_codebase_is_deterministic(self):
+        first = generate_codebase(os.path.join(self.temp_dir, "a"), files=10, functions=2, seed=3)
+        second = generate_codebase(os.path.join(self.temp_dir, "b"), files=10, functions=2, seed=3)
+        self.assertEqual(len(first), 10)
+        for path_a, path_b in zip(first, second):
+            with open(path_a) as fa, open(path_b) as fb:
+                self.assertEqual(fa.read(), fb.read())
+
+    def test_compare_reports_flags_regressions(self):
+        baseline = {"stages": {"analyze_directory": {"seconds": 1.0, "peak_memory_bytes": 1000},
+                               "word_cloud": {"seconds": 1.0}}}
+        current = {"stages": {"analyze_directory": {"seconds": 1.1, "peak_memory_bytes": 2000},
+                              "word_cloud": {"seconds": 1.5},
+                              "knowledge_graph": {"seconds": 9.0}}}
+        regressions = compare_reports(current, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("analyze_directory: peak memory"))
+        self.assertTrue(regressions[1].startswith("word_cloud: time"))
+
+    def test_harness_writes_and_compares(self):
+        output = os.path.join(self.temp_dir, "bench.json")
+        args = ["--files", "5", "--functions", "2", "--content-functions", "10", "--repeat", "1",
+                "--no-memory", "--stages", "analyze_directory", "generate_summary_report"]
+        self.assertEqual(main(args + ["--output", output]), 0)
+        # A generous threshold so timing noise cannot fail the comparison
+        self.assertEqual(main(args + ["--baseline", output, "--threshold", "1000"]), 0)
+
+    def test_language_benchmarks_cover_each_analyzer(self):
+        rows = run_language_benchmarks(functions=20, repeat=1)
+        names = [name for name, _, _, _ in rows]
+        self.assertEqual(names, ["python", "javascript", "java", "c", "go", "rust", "ruby"])
+        self.assertTrue(all(lines > 0 and seconds >= 0 for _, _, lines, seconds in rows))
+
+    def test_import_graph_benchmark_resolves_synthetic_imports(self):
+        graph, components, timings = run_import_graph_benchmark(300, imports=4)
+        self.assertEqual(len(graph), 300 + 200)
+        self.assertGreater(graph.edge_count(), 0)
+        self.assertEqual(graph.import_counts()["unresolved"], 0)
+        self.assertLessEqual(components, len(graph))
+        self.assertEqual(set(timings), {"build", "components", "closure", "reverse_closure"})
+
+    def test_results_table_benchmark(self):
+        table, timings = run_results_table_benchmark(2000, top=10)
+        self.assertEqual(len(table), 2000)
+        self.assertEqual(len(table.top("complexity", 10)), 10)
+        self.assertIn("statistics", timings)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import unittest
+from src.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestHeadlessCli(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(self.source_dir)
+        for i in range(3):
+            with open(os.path.join(self.source_dir, f"module_{i}.py"), 'w') as f:
+                f.write(f"import os\nimport json\n\ndef handler_{i}(x):\n    if x:\n        return x\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_writes_json_and_graph(self):
+        json_path = os.path.join(self.temp_dir, "report.json")
+        main([self.source_dir, "--output-dir", self.output_dir, "--json", json_path, "--graph", "html", "--quiet"])
+        with open(json_path) as f:
+            report = json.load(f)
+
+        self.assertEqual(report["summary"]["total_files"], 3)
+        self.assertEqual(report["summary"]["unique_dependencies"], ["json", "os"])
+        self.assertEqual(len(report["results"]), 3)
+        self.assertIn(["import", 6], report["top_words"])
+        self.assertTrue(os.path.exists(report["outputs"]["knowledge_graph"]))
+
+    def test_import_graph(self):
+        with open(os.path.join(self.source_dir, "module_3.py"), 'w') as f:
+            f.write("import module_0\nimport module_1 as m\n")
+        json_path = os.path.join(self.temp_dir, "report.json")
+        main([self.source_dir, "--output-dir", self.output_dir, "--json", json_path, "--import-graph", "--quiet"])
+        with open(json_path) as f:
+            graph = json.load(f)["import_graph"]
+
+        self.assertEqual((graph["modules"], graph["edges"]), (4, 2))
+        self.assertEqual(graph["imports_by_kind"]["stdlib"], 6)
+        self.assertEqual(graph["most_transitive_dependencies"][0]["module"], "module_3")
+
+    def test_export_table(self):
+        json_path = os.path.join(self.temp_dir, "report.json")
+        main([self.source_dir, "--output-dir", self.output_dir, "--json", json_path, "--export-table", "--quiet"])
+        with open(json_path) as f:
+            report = json.load(f)
+
+        self.assertEqual(report["statistics"]["lines_of_code"]["total"], report["summary"]["total_lines"])
+        self.assertEqual(len(report["largest_files"]), 3)
+        self.assertTrue(os.path.exists(report["outputs"]["results_table"]))
+
+    def test_plain_analysis_does_not_import_qt(self):
+        code = ("import sys; from src.cli import main; "
+                f"main([{self.source_dir!r}, '--output-dir', {self.output_dir!r}, '--quiet', '--json', "
+                f"{os.path.join(self.temp_dir, 'r.json')!r}]); "
+                "heavy = [m for m in sys.modules if m.split('.')[0] in "
+                "('PyQt6', 'matplotlib', 'networkx', 'requests', 'transformers', 'openai', 'anthropic')]; "
+                "print(heavy)")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
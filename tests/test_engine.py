@@ -0,0 +1,58 @@
+import unittest
+from src.analysis.engine import AnalysisEngine, MetricVisitor, strip_comments, count_lines
+from src.analysis.dependency_analyzer import ImportVisitor
+from src.analysis.complexity_analyzer import ComplexityVisitor
+
+class NameCountVisitor(MetricVisitor):
+    name = "names"
+
+    def __init__(self):
+        self.count = 0
+
+    def result(self):
+        return self.count
+
+    def visit_Name(self, node):
+        self.count += 1
+
+class TestAnalysisEngine(unittest.TestCase):
+    def test_single_parse_runs_all_visitors(self):
+        code = '''
+import os
+import numpy as np
+from . import sibling
+from ..utils.helpers import helper
+
+def outer(x):
+    import json
+    if x:
+        for i in range(x):
+            pass
+    return x
+'''
+        metrics = AnalysisEngine([ImportVisitor, ComplexityVisitor]).analyze(code)
+
+        self.assertEqual(metrics["dependencies"], ['..utils.helpers', '.sibling', 'json', 'numpy', 'os'])
+        self.assertEqual(metrics["complexity"], 4)
+
+    def test_registered_expression_visitor(self):
+        engine = AnalysisEngine([ComplexityVisitor])
+        engine.register(NameCountVisitor)
+        metrics = engine.analyze("def f(a):\n    return a + b\n")
+
+        self.assertEqual(metrics["names"], 2)
+        self.assertEqual(metrics["complexity"], 2)
+
+    def test_strip_comments_keeps_hash_in_strings(self):
+        code = 'x = "#not a comment"  # a comment\n"""doc"""\ny = \'#\'\n'
+        stripped = strip_comments(code)
+
+        self.assertIn('"#not a comment"', stripped)
+        self.assertIn("'#'", stripped)
+        self.assertNotIn("a comment\n", stripped)
+        self.assertNotIn("doc", stripped)
+
+    def test_count_lines(self):
+        self.assertEqual(count_lines(""), 0)
+        self.assertEqual(count_lines("a\nb"), 2)
+        self.assertEqual(count_lines("a\nb\n"), 2)
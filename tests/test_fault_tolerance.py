@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from benchmarks.synthetic import generate_source
+from src.analysis.pipeline import AnalysisPipeline
+from src.analysis.file_analyzer import FileAnalyzer
+from src.analysis.failures import (FailureLog, AnalysisTimeout, time_budget, ERROR, TIMEOUT, TOO_LARGE)
+
+class TestFaultTolerantPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(self.source_dir)
+        os.makedirs(self.output_dir)
+        for i in range(4):
+            self.write(f"module_{i}.py", f"import os\n\ndef f(x):\n    if x:\n        return {i}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.source_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def pipeline(self, **options):
+        return AnalysisPipeline(self.source_dir, self.output_dir, ['.py'], 0, True, False, **options)
+
+    def test_failing_file_is_isolated(self):
+        bad = os.path.join(self.source_dir, "module_2.py")
+        original = FileAnalyzer.analyze_content
+
+        def analyze_content(analyzer, content, file_path=None):
+            if file_path == bad:
+                raise RuntimeError("boom")
+            return original(analyzer, content, file_path)
+
+        pipeline = self.pipeline()
+        with mock.patch.object(FileAnalyzer, "analyze_content", analyze_content):
+            results = pipeline.run()
+
+        self.assertEqual(len(results), 4)
+        self.assertIsNone(results[bad])
+        self.assertEqual(sum(result is not None for result in results.values()), 3)
+        self.assertEqual(pipeline.failures.failures, {bad: (ERROR, "RuntimeError: boom")})
+        self.assertIn("1 files not analyzed (1 error)", pipeline.generate_summary_report(results))
+
+    def test_slow_file_times_out(self):
+        slow = self.write("generated.py", generate_source(3000))
+        pipeline = self.pipeline(file_time_budget=0.001)
+        results = pipeline.run()
+
+        self.assertIsNone(results[slow])
+        self.assertEqual(pipeline.failures.failures[slow][0], TIMEOUT)
+
+    def test_time_budget_in_worker_processes(self):
+        slow = self.write("generated.py", generate_source(3000))
+        pipeline = self.pipeline(file_time_budget=0.001, workers=2, chunk_size=1)
+        results = pipeline.run()
+
+        self.assertEqual(len(results), 5)
+        self.assertIsNone(results[slow])
+        self.assertEqual(pipeline.failures.failures[slow][0], TIMEOUT)
+
+    def test_size_budget(self):
+        analyzer = FileAnalyzer(True, False, max_content_size=10)
+        digest, result, failure = analyzer.analyze_file_isolated(os.path.join(self.source_dir, "module_0.py"))
+        self.assertIsNone(result)
+        self.assertEqual(failure[0], TOO_LARGE)
+
+    def test_error_stopping_the_run_keeps_partial_results(self):
+        def iter_results():
+            yield "a.py", {"complexity": 1, "lines_of_code": 1, "dependencies": []}
+            raise OSError("disk gone")
+
+        pipeline = self.pipeline()
+        pipeline.iter_results = iter_results
+        results = pipeline.run()
+
+        self.assertEqual(list(results), ["a.py"])
+        self.assertEqual(pipeline.failures.aborted, "OSError: disk gone")
+        # A partial tree is not kept as the baseline for incremental runs
+        self.assertIsNone(pipeline.state)
+
+class TestFailureLog(unittest.TestCase):
+    def test_report_and_dict(self):
+        log = FailureLog()
+        log.add("b.py", TIMEOUT, "took longer than 1s")
+        log.add("a.py", ERROR, "ValueError: x")
+        log.add("c.py", ERROR, "KeyError: y")
+        self.assertEqual(log.summary(), "3 files not analyzed (2 error, 1 timeout)")
+        self.assertEqual([entry["path"] for entry in log.as_dict()["files"]], ["a.py", "b.py", "c.py"])
+        log.discard("c.py")
+        self.assertIn("  b.py: took longer than 1s", log.report())
+        self.assertEqual(FailureLog().report(), "")
+
+    def test_time_budget_only_on_main_thread(self):
+        with self.assertRaises(AnalysisTimeout):
+            with time_budget(0.01):
+                while True:
+                    pass
+
+        finished = []
+
+        def run():
+            with time_budget(0.01):
+                finished.append(sum(range(10 ** 6)))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(finished), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from src.analysis.file_scanner import FileScanner, IgnorePatterns
+import tempfile
+import shutil
+import os
+
+class TestFileScanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = [
+            "main.py",
+            "pkg/module.py",
+            "pkg/sub/deep.py",
+            "pkg/generated_pb2.py",
+            "node_modules/lib/index.js",
+            ".git/hooks/hook.py",
+            "build/out.py",
+            "logs/run.log",
+            "pkg/keep.js",
+        ]
+        for rel_path in self.files:
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("x = 1\n")
+        with open(os.path.join(self.temp_dir, ".gitignore"), 'w') as f:
+            f.write("# generated\n*_pb2.py\nlogs/\n")
+        with open(os.path.join(self.temp_dir, "image.py"), 'wb') as f:
+            f.write(b"\x89PNG\x00\x00")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def scan(self, scanner):
+        return sorted(os.path.relpath(path, self.temp_dir).replace(os.sep, '/') for path in scanner.scan(self.temp_dir))
+
+    def test_prunes_excluded_ignored_and_binary(self):
+        scanner = FileScanner(['.py', '.js'])
+        self.assertEqual(self.scan(scanner), ["main.py", "pkg/keep.js", "pkg/module.py", "pkg/sub/deep.py"])
+        self.assertEqual(scanner.skipped["binary"], 1)
+        self.assertEqual(scanner.skipped["ignored"], 2)
+
+    def test_max_depth(self):
+        scanner = FileScanner(['.py'], max_depth=2)
+        self.assertEqual(self.scan(scanner), ["main.py", "pkg/module.py"])
+
+    def test_max_file_size(self):
+        with open(os.path.join(self.temp_dir, "big.py"), 'w') as f:
+            f.write("x = 1\n" * 100)
+        scanner = FileScanner(['.py'], max_file_size=50)
+        self.assertNotIn("big.py", self.scan(scanner))
+        self.assertEqual(scanner.skipped["too_large"], 1)
+
+    def test_custom_exclude_list(self):
+        scanner = FileScanner(['.py'], excluded_dirs=['pk?'], use_ignore_files=False)
+        self.assertIn("build/out.py", self.scan(scanner))
+        self.assertNotIn("pkg/module.py", self.scan(scanner))
+
+    def test_matches(self):
+        scanner = FileScanner(['.py', '.tar.gz'])
+        self.assertTrue(scanner.matches("a.py"))
+        self.assertTrue(scanner.matches("archive.tar.gz"))
+        self.assertFalse(scanner.matches("a.pyc"))
+
+    def test_ignore_patterns(self):
+        patterns = IgnorePatterns(["/top.py", "docs/**/*.md", "*.tmp", "!keep.tmp", "cache/"])
+        self.assertTrue(patterns.match("top.py", False))
+        self.assertIsNone(patterns.match("src/top.py", False))
+        self.assertTrue(patterns.match("docs/a/b/c.md", False))
+        self.assertTrue(patterns.match("src/x.tmp", False))
+        self.assertFalse(patterns.match("src/keep.tmp", False))
+        self.assertTrue(patterns.match("src/cache", True))
+        self.assertIsNone(patterns.match("src/cache", False))
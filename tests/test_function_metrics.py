@@ -0,0 +1,145 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from src.analysis.engine import AnalysisEngine
+from src.analysis.complexity_analyzer import ComplexityVisitor, FunctionMetricsVisitor, FUNCTION_FIELDS
+from src.analysis.function_index import FunctionIndex
+from src.analysis.pipeline import AnalysisPipeline
+
+SAMPLE = '''
+def simple():
+    return 1
+
+async def fetch(x, y):
+    if x and y or not x:
+        for i in range(3):
+            if i:
+                pass
+    elif y:
+        pass
+    else:
+        pass
+    try:
+        pass
+    except ValueError:
+        while x:
+            x -= 1
+    return [a for a in x if a]
+
+class Shape:
+    def area(self):
+        match self.kind:
+            case 1:
+                return 1
+            case _:
+                return 2 if self.x else 3
+
+    def outer(self):
+        def inner(z):
+            if z:
+                return z
+        return inner
+'''
+
+# The sample has a match statement, which older interpreters cannot parse
+NEEDS_MATCH = unittest.skipIf(sys.version_info < (3, 10), "match statements need Python 3.10")
+
+@NEEDS_MATCH
+class TestFunctionMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics = AnalysisEngine([ComplexityVisitor, FunctionMetricsVisitor]).analyze(SAMPLE)
+        self.complexity = metrics["complexity"]
+        self.rows = {row[0]: dict(zip(FUNCTION_FIELDS, row)) for row in metrics["functions"]}
+
+    def test_rows_for_functions_methods_and_classes(self):
+        self.assertEqual(sorted(self.rows), ["Shape", "Shape.area", "Shape.outer", "Shape.outer.inner",
+                                             "fetch", "simple"])
+        self.assertEqual(self.rows["Shape.area"]["kind"], "method")
+        self.assertEqual(self.rows["Shape.outer.inner"]["kind"], "function")
+        self.assertEqual((self.rows["fetch"]["line"], self.rows["fetch"]["end_line"]), (5, 19))
+
+    def test_cyclomatic(self):
+        # if, two boolean operators, for, if, elif, except, while, comprehension and its filter
+        self.assertEqual(self.rows["fetch"]["cyclomatic"], 11)
+        # two match cases and a conditional expression
+        self.assertEqual(self.rows["Shape.area"]["cyclomatic"], 4)
+        # The nested function's branch is its own
+        self.assertEqual(self.rows["Shape.outer"]["cyclomatic"], 1)
+        self.assertEqual(self.rows["Shape.outer.inner"]["cyclomatic"], 2)
+        # A class sums its methods
+        self.assertEqual(self.rows["Shape"]["cyclomatic"], 5)
+
+    def test_cognitive_and_nesting(self):
+        fetch = self.rows["fetch"]
+        self.assertEqual(fetch["cognitive"], 15)
+        self.assertEqual(fetch["nesting"], 3)
+        self.assertEqual(fetch["statements"], 12)
+        self.assertEqual(self.rows["simple"]["cognitive"], 0)
+
+    def test_file_complexity_counts_every_decision(self):
+        # 1 + 5 functions + fetch's 10 decisions + area's 3 + inner's 1
+        self.assertEqual(self.complexity, 20)
+
+class TestFunctionIndex(unittest.TestCase):
+    def rows(self, prefix, values):
+        return [[f"{prefix}{i}", "function", i, i + 1, 1, value, value * 2, 0] for i, value in enumerate(values)]
+
+    def test_top_n(self):
+        index = FunctionIndex()
+        index.add("a.py", self.rows("a", [3, 9, 1]))
+        index.add("b.py", self.rows("b", [7]))
+        top = index.top("cyclomatic", 2)
+        self.assertEqual([(row["file"], row["name"], row["cyclomatic"]) for row in top],
+                         [("a.py", "a1", 9), ("b.py", "b0", 7)])
+        self.assertEqual(index.top("cognitive", 1)[0]["cognitive"], 18)
+        with self.assertRaises(ValueError):
+            index.top("unknown")
+        with self.assertRaises(ValueError):
+            index.top("line")
+
+    def test_replace_and_remove(self):
+        index = FunctionIndex()
+        index.add("a.py", self.rows("a", [3, 9]))
+        index.add("b.py", self.rows("b", [5]))
+        index.add("a.py", self.rows("new", [1]))
+        # The two dead rows outnumbered the live one, so the arrays were compacted
+        self.assertEqual(index.names, ["b0", "new0"])
+        self.assertEqual([row["name"] for row in index.top("cyclomatic", 5)], ["b0", "new0"])
+        index.remove("b.py")
+        self.assertEqual(len(index), 1)
+        self.assertEqual([row["name"] for row in index.top("cyclomatic", 5)], ["new0"])
+        self.assertEqual(index.rows_for("a.py")[0]["name"], "new0")
+        self.assertEqual(index.file_count(), 1)
+
+    def test_kind_filter(self):
+        index = FunctionIndex()
+        index.add("a.py", [["A", "class", 1, 9, 5, 20, 10, 2], ["A.f", "method", 2, 3, 1, 4, 2, 1]])
+        self.assertEqual([row["name"] for row in index.top("cyclomatic", 5)], ["A.f"])
+        self.assertEqual([row["name"] for row in index.top("cyclomatic", 5, kinds=None)], ["A", "A.f"])
+        self.assertEqual([(row["line"], row["lines"]) for row in index.top("lines", 5, kinds=None)], [(1, 9), (2, 2)])
+
+@NEEDS_MATCH
+class TestPipelineFunctionIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "sample.py"), 'w') as f:
+            f.write(SAMPLE)
+        with open(os.path.join(self.temp_dir, "other.py"), 'w') as f:
+            f.write("def g(x):\n    return x\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_hotspots_without_reparsing(self):
+        pipeline = AnalysisPipeline(self.temp_dir, self.temp_dir, ['.py'], 0, True, False)
+        results = pipeline.run()
+        self.assertTrue(all("functions" not in result for result in results.values()))
+        self.assertEqual(pipeline.function_index.file_count(), 2)
+        worst = pipeline.function_index.top("cyclomatic", 1)[0]
+        self.assertEqual((os.path.basename(worst["file"]), worst["name"]), ("sample.py", "fetch"))
+        self.assertIs(pipeline.state.function_index, pipeline.function_index)
+
+if __name__ == '__main__':
+    unittest.main()
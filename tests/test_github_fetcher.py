@@ -0,0 +1,119 @@
+import io
+import os
+import json
+import base64
+import shutil
+import tarfile
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.github_fetcher import GitHubFetcher, parse_repo_url
+
+FIXTURE_FILES = {
+    'main.py': b"import os\n\ndef main():\n    if os.name:\n        return 1\n",
+    'pkg/util.py': b"import json\n",
+    'pkg/data.bin.py': b"\0\0binary",
+    'README.md': b"# fixture\n",
+    'node_modules/lib/index.py': b"import sys\n",
+    '../escape.py': b"import sys\n",
+}
+
+def build_tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"octo-fixture-abc123/{path}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        prefix = "/repos/octo/fixture"
+        files = {path: data for path, data in FIXTURE_FILES.items() if not path.startswith('../')}
+        if self.path == f"{prefix}/tarball":
+            self.reply(build_tarball(FIXTURE_FILES), "application/gzip")
+        elif self.path == prefix:
+            self.reply(json.dumps({"default_branch": "main"}).encode())
+        elif self.path == f"{prefix}/git/trees/main?recursive=1":
+            tree = [{"path": path, "type": "blob", "sha": str(i), "size": len(data)}
+                    for i, (path, data) in enumerate(files.items())]
+            tree.append({"path": "pkg", "type": "tree", "sha": "t"})
+            self.reply(json.dumps({"tree": tree, "truncated": False}).encode())
+        elif self.path.startswith(f"{prefix}/git/blobs/"):
+            data = list(files.values())[int(self.path.rsplit('/', 1)[1])]
+            self.reply(json.dumps({"content": base64.b64encode(data).decode(), "encoding": "base64"}).encode())
+        else:
+            self.send_error(404)
+
+    def reply(self, body, content_type="application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestGitHubFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), FixtureHandler)
+        cls.api_base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        FixtureHandler.requests_seen.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse_repo_url(self):
+        self.assertEqual(parse_repo_url("https://github.com/octo/fixture"), ("octo", "fixture", None))
+        self.assertEqual(parse_repo_url("https://github.com/octo/fixture.git/"), ("octo", "fixture", None))
+        self.assertEqual(parse_repo_url("https://github.com/octo/fixture/tree/dev"), ("octo", "fixture", "dev"))
+        with self.assertRaises(ValueError):
+            parse_repo_url("https://github.com/octo")
+
+    def test_tarball_and_tree_modes_agree(self):
+        fetched = {}
+        for mode in ("tarball", "tree"):
+            fetcher = GitHubFetcher("https://github.com/octo/fixture", api_base=self.api_base, mode=mode, workers=2)
+            fetched[mode] = dict(fetcher.iter_files(lambda path: path.endswith('.py')))
+            fetcher.close()
+        self.assertEqual(fetched["tarball"], fetched["tree"])
+        self.assertNotIn('../escape.py', fetched["tarball"])
+        self.assertEqual(fetched["tarball"]['pkg/util.py'], b"import json\n")
+
+    def test_tarball_is_a_single_request(self):
+        fetcher = GitHubFetcher("https://github.com/octo/fixture", api_base=self.api_base)
+        list(fetcher.iter_files(lambda path: True))
+        self.assertEqual(FixtureHandler.requests_seen, ["/repos/octo/fixture/tarball"])
+
+    def test_code_analyzer_ingests_repository(self):
+        analyzer = CodeAnalyzer("https://github.com/octo/fixture", self.temp_dir, ['.py'], 0, True, True,
+                                github_api_base=self.api_base)
+        completed = []
+        analyzer.analysis_complete.connect(completed.append)
+        analyzer.run()
+
+        results = completed[0]
+        self.assertEqual(sorted(results), ['main.py', 'pkg/util.py'])
+        self.assertEqual(results['main.py']['dependencies'], ['os'])
+        self.assertEqual(results['main.py']['complexity'], 3)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'pkg', 'util.py')))
+
+if __name__ == '__main__':
+    unittest.main()
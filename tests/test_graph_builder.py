@@ -0,0 +1,53 @@
+import unittest
+from src.visualization.graph_builder import DependencyIndex
+from src.visualization.outputs import graph_limits, LARGE_GRAPH_NODES, LARGE_GRAPH_DEPENDENCY_FANOUT
+
+class TestDependencyIndex(unittest.TestCase):
+    def setUp(self):
+        self.results = {
+            'a.py': {'dependencies': ['os', 'json', 'requests']},
+            'b.py': {'dependencies': ['os', 'json']},
+            'c.py': {'dependencies': ['os', 'numpy']},
+            'd.py': {'dependencies': ['numpy', 'requests']},
+            'e.py': None,
+        }
+        self.index = DependencyIndex()
+        self.index.update(self.results)
+
+    def pairwise_edges(self):
+        edges = {}
+        files = [path for path, data in self.results.items() if data is not None]
+        for i, file1 in enumerate(files):
+            for file2 in files[i + 1:]:
+                shared = set(self.results[file1]['dependencies']) & set(self.results[file2]['dependencies'])
+                if shared:
+                    edges[(file1, file2)] = len(shared)
+        return edges
+
+    def test_matches_pairwise_comparison(self):
+        self.assertEqual(self.index.shared_dependency_edges(), self.pairwise_edges())
+
+    def test_hot_dependency_cap(self):
+        edges = self.index.shared_dependency_edges(max_dependency_fanout=2)
+        self.assertEqual(self.index.hot_dependencies(2), ['os'])
+        self.assertEqual(edges, {('a.py', 'b.py'): 1, ('c.py', 'd.py'): 1, ('a.py', 'd.py'): 1})
+
+    def test_top_edges_per_node(self):
+        edges = self.index.shared_dependency_edges(max_edges_per_node=1)
+        self.assertEqual(edges[('a.py', 'b.py')], 2)
+        self.assertLess(len(edges), len(self.pairwise_edges()))
+        for node in ('a.py', 'b.py', 'c.py', 'd.py'):
+            self.assertTrue(any(node in pair for pair in edges))
+
+    def test_large_graphs_skip_hot_dependencies_by_default(self):
+        self.assertEqual(graph_limits(10), (None, None))
+        self.assertEqual(graph_limits(LARGE_GRAPH_NODES + 1, max_dependency_fanout=5)[0], 5)
+
+        files = LARGE_GRAPH_NODES * 4
+        index = DependencyIndex()
+        for i in range(files):
+            index.add(f"m{i}.py", ["os", "sys", f"pkg{i // 10}"])
+        fanout, per_node = graph_limits(files)
+        self.assertEqual(fanout, LARGE_GRAPH_DEPENDENCY_FANOUT)
+        self.assertEqual(index.pair_count(fanout), files // 10 * 45)
+        self.assertEqual(len(index.shared_dependency_edges(fanout, per_node)), files // 10 * 45)
@@ -0,0 +1,64 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from src.visualization.graph_layout import LAYOUTS, compute_layout, load_positions, save_positions
+from src.visualization.graph_renderer import render_html
+
+class TestGraphLayout(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [f"file{i}.py" for i in range(30)]
+        self.edges = {(self.nodes[i], self.nodes[i + 1]): 1 for i in range(29)}
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_layouts_place_every_node_in_unit_square(self):
+        for layout in LAYOUTS:
+            positions = compute_layout(self.nodes, self.edges, layout)
+            self.assertEqual(set(positions), set(self.nodes))
+            for x, y in positions.values():
+                self.assertTrue(0 <= x <= 1 and 0 <= y <= 1)
+
+    def test_large_graph_uses_approximation(self):
+        nodes = [f"n{i}" for i in range(2000)]
+        edges = {(nodes[i], nodes[(i * 7 + 1) % 2000]): 1 for i in range(2000) if i != (i * 7 + 1) % 2000}
+        positions = compute_layout(nodes, edges, iterations=5)
+        self.assertEqual(len(positions), 2000)
+
+    def test_seeded_layout_keeps_previous_shape(self):
+        first = compute_layout(self.nodes, self.edges)
+        path = os.path.join(self.temp_dir, "layout.json")
+        save_positions(path, "Force-directed", first)
+        previous = load_positions(path, "Force-directed")
+        self.assertEqual(load_positions(path, "Circular"), {})
+
+        nodes = self.nodes + ["new.py"]
+        edges = dict(self.edges)
+        edges[(self.nodes[0], "new.py")] = 1
+        second = compute_layout(nodes, edges, initial_positions=previous, iterations=1)
+        drift = max(abs(second[n][0] - first[n][0]) + abs(second[n][1] - first[n][1]) for n in self.nodes)
+        self.assertLess(drift, 0.5)
+
+    def test_render_html_embeds_graph(self):
+        results = {node: {'complexity': 2, 'lines_of_code': 10} for node in self.nodes}
+        results[self.nodes[0]]['complexity'] = 5
+        positions = compute_layout(self.nodes, self.edges, "Circular")
+        output = render_html(results, self.edges, positions, os.path.join(self.temp_dir, "graph.html"), "Circular")
+        with open(output, encoding='utf-8') as f:
+            html = f.read()
+        data = json.loads(html.split("const GRAPH = ", 1)[1].split(";\n", 1)[0])
+        self.assertEqual(len(data["nodes"]), 30)
+        self.assertEqual(len(data["edges"]), 29)
+        self.assertEqual(data["nodes"][0]["complexity"], 5)
+
+    def test_render_html_escapes_script_end(self):
+        node = "</script>.py"
+        output = render_html({node: {}}, {}, {node: (0.5, 0.5)}, os.path.join(self.temp_dir, "graph.html"), "Circular")
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(f.read().count("</script>"), 1)
+
+if __name__ == '__main__':
+    unittest.main()
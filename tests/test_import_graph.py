@@ -0,0 +1,141 @@
+import os
+import json
+import random
+import shutil
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+from src.analysis import import_graph
+from src.analysis.import_graph import (ImportGraph, build_import_graph, load_or_build_import_graph, module_names,
+                                       INTERNAL, STDLIB, THIRD_PARTY, UNRESOLVED)
+from src.analysis.pipeline import AnalysisPipeline
+
+def result(*dependencies):
+    return {"language": "python", "dependencies": sorted(dependencies)}
+
+def chain_graph(edges, n):
+    offsets, targets = array('l', [0]), array('l')
+    for node in range(n):
+        targets.extend(sorted({target for source, target in edges if source == node}))
+        offsets.append(len(targets))
+    return ImportGraph([f"m{node}.py" for node in range(n)], [f"m{node}" for node in range(n)], offsets, targets)
+
+class TestImportResolution(unittest.TestCase):
+    def setUp(self):
+        root = "repo"
+        self.path = lambda *parts: os.path.join(root, *parts)
+        self.results = {
+            self.path("src", "pkg", "__init__.py"): result(".a"),
+            self.path("src", "pkg", "a.py"): result(".", ".b", "os.path", "numpy"),
+            self.path("src", "pkg", "b.py"): result("pkg.sub.c.function", "collections"),
+            self.path("src", "pkg", "sub", "__init__.py"): result(),
+            self.path("src", "pkg", "sub", "c.py"): result("..a", "src.missing", "...beyond"),
+            self.path("tests", "helper.py"): result("pkg"),
+            self.path("tests", "test_a.py"): result("helper", "src.pkg.b", "pytest"),
+            self.path("web", "app.js"): {"language": "javascript", "dependencies": ["./helper"]},
+            self.path("tests", "broken.py"): None,
+        }
+        self.graph = build_import_graph(self.results, root)
+
+    def imports(self, module):
+        return sorted(self.graph.modules[node] for node in self.graph.imports_of(self.graph.node(module)))
+
+    def test_module_names_follow_packages(self):
+        names = module_names(list(self.results))
+        self.assertEqual(names[self.path("src", "pkg", "sub", "c.py")], "pkg.sub.c")
+        self.assertEqual(names[self.path("src", "pkg", "__init__.py")], "pkg")
+        self.assertEqual(names[self.path("tests", "helper.py")], "helper")
+        # Only Python files are modules; a file that failed is one without imports
+        self.assertEqual(len(self.graph), 8)
+        self.assertEqual(self.imports("broken"), [])
+
+    def test_resolution(self):
+        # `from . import x` lands on the package, `pkg.sub.c.function` on the module
+        self.assertEqual(self.imports("pkg.a"), ["pkg", "pkg.b"])
+        self.assertEqual(self.imports("pkg.b"), ["pkg.sub.c"])
+        self.assertEqual(self.imports("pkg.sub.c"), ["pkg.a"])
+        # The root-relative path works as an alias
+        self.assertEqual(self.imports("test_a"), ["helper", "pkg.b"])
+
+    def test_external_kinds(self):
+        kinds = {spec: kind for imports in self.graph.external.values() for spec, kind in imports}
+        self.assertEqual(kinds, {"os.path": STDLIB, "numpy": THIRD_PARTY, "collections": STDLIB,
+                                 "src.missing": UNRESOLVED, "...beyond": UNRESOLVED, "pytest": THIRD_PARTY})
+        self.assertEqual(self.graph.import_counts(),
+                         {INTERNAL: 8, STDLIB: 2, THIRD_PARTY: 2, UNRESOLVED: 2})
+        self.assertEqual(self.graph.external_packages(), {"numpy": 1, "pytest": 1})
+
+    def test_cycles_and_fan_in(self):
+        self.assertEqual(self.graph.cycles(), [["pkg", "pkg.a", "pkg.b", "pkg.sub.c"]])
+        fan_in = self.graph.fan_in()
+        self.assertEqual(fan_in[self.graph.node("pkg.b")], 2)
+        self.assertEqual(self.graph.reachable("helper"), ["pkg", "pkg.a", "pkg.b", "pkg.sub.c"])
+        self.assertEqual(self.graph.reachable("pkg.b", reverse=True),
+                         ["helper", "pkg", "pkg.a", "pkg.sub.c", "test_a"])
+        summary = self.graph.summary()
+        self.assertEqual(summary["cycle_count"], 1)
+        self.assertEqual([entry["count"] for entry in summary["most_imported"]], [2, 2, 2, 1, 1])
+
+class TestGraphAlgorithms(unittest.TestCase):
+    def test_components_on_a_deep_chain(self):
+        n = 20000
+        graph = chain_graph([(node, node + 1) for node in range(n - 1)] + [(n - 1, n - 2)], n)
+        component, count = graph.components()
+        self.assertEqual(count, n - 1)
+        # Every edge goes to an equal or lower component
+        self.assertTrue(all(component[node] >= component[node + 1] for node in range(n - 1)))
+        self.assertEqual(graph.cycles(), [[f"m{n - 2}", f"m{n - 1}"]])
+        self.assertEqual(graph.transitive_counts()[0], n - 1)
+
+    def test_closure_matches_search(self):
+        rng = random.Random(4)
+        n = 60
+        edges = {(rng.randrange(n), rng.randrange(n)) for _ in range(90)}
+        edges = {(a, b) for a, b in edges if a != b}
+        graph = chain_graph(edges, n)
+        # Small blocks so the closure runs over several of them
+        with mock.patch.object(import_graph, "CLOSURE_BLOCK", 7):
+            forward = graph.transitive_counts()
+            backward = graph.transitive_counts(reverse=True)
+        for node in range(n):
+            self.assertEqual(forward[node], len(graph.reachable(f"m{node}")))
+            self.assertEqual(backward[node], len(graph.reachable(f"m{node}", reverse=True)))
+
+class TestImportGraphCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "import_graph.json")
+        self.results = {"a.py": result("b", "json"), "b.py": result("a"), "c.py": result("a")}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_saved_graph_is_reused_until_imports_change(self):
+        graph = load_or_build_import_graph(self.results, cache_path=self.cache_path)
+        with mock.patch.object(import_graph, "build_import_graph") as build:
+            cached = load_or_build_import_graph(self.results, cache_path=self.cache_path)
+            build.assert_not_called()
+        self.assertEqual(cached.as_dict(), graph.as_dict())
+        self.assertEqual(cached.cycles(), [["a", "b"]])
+        self.assertEqual(list(cached.transitive_counts(reverse=True)), [2, 2, 0])
+
+        self.results["c.py"] = result("json")
+        rebuilt = load_or_build_import_graph(self.results, cache_path=self.cache_path)
+        self.assertEqual(list(rebuilt.fan_in()), [1, 1, 0])
+
+    def test_pipeline_writes_the_graph(self):
+        source_dir = os.path.join(self.temp_dir, "src")
+        os.makedirs(os.path.join(source_dir, "pkg"))
+        files = {"__init__.py": "", "a.py": "from . import b\nimport numpy as np\n", "b.py": "import pkg.a\n"}
+        for name, content in files.items():
+            with open(os.path.join(source_dir, "pkg", name), 'w') as f:
+                f.write(content)
+        pipeline = AnalysisPipeline(source_dir, self.temp_dir, ['.py'], 0, True, False)
+        graph = pipeline.build_import_graph(pipeline.run())
+        self.assertEqual(graph.cycles(), [["pkg.a", "pkg.b"]])
+        with open(self.cache_path) as f:
+            self.assertEqual(len(json.load(f)["modules"]), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.incremental import git_changes
+from src.analysis.summary import SummaryAccumulator
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        write(os.path.join(self.source_dir, "a.py"), "import os\nalpha = 1\n")
+        write(os.path.join(self.source_dir, "b.py"), "import json\nbeta = 2\n")
+        write(os.path.join(self.source_dir, "pkg", "c.py"), "import sys\ngamma = 3\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_analyzer(self, previous_state=None, use_cache=True):
+        analyzer = CodeAnalyzer(self.source_dir, self.output_dir, ['.py'], 0, True, True, use_cache=use_cache,
+                                previous_state=previous_state, keep_file_tokens=not use_cache)
+        batches, removed, completed = [], [], []
+        analyzer.results_batch.connect(lambda batch: (batches.append(batch), analyzer.acknowledge_batch()))
+        analyzer.files_removed.connect(removed.extend)
+        analyzer.analysis_complete.connect(completed.append)
+        analyzer.run()
+        analyzed = {path for batch in batches for path in batch}
+        return analyzer, analyzed, removed, completed[0]
+
+    def modify(self):
+        write(os.path.join(self.source_dir, "a.py"), "import os\nimport re\ndelta = 4\n")
+        os.remove(os.path.join(self.source_dir, "b.py"))
+        write(os.path.join(self.source_dir, "d.py"), "epsilon = 5\n")
+        # Make sure the rewritten file's mtime differs even on coarse clocks
+        stat = os.stat(os.path.join(self.source_dir, "a.py"))
+        os.utime(os.path.join(self.source_dir, "a.py"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def assert_incremental_update(self, first, use_cache=True):
+        a, b, d = (os.path.join(self.source_dir, name) for name in ("a.py", "b.py", "d.py"))
+        analyzer, analyzed, removed, results = self.run_analyzer(first.state, use_cache)
+
+        self.assertEqual(analyzed, {a, d})
+        self.assertEqual(removed, [b])
+        self.assertEqual(sorted(results), sorted([a, d, os.path.join(self.source_dir, "pkg", "c.py")]))
+        self.assertEqual(results[a]['dependencies'], ['os', 're'])
+
+        frequencies = analyzer.token_statistics.frequencies
+        self.assertNotIn('alpha', frequencies)
+        self.assertNotIn('beta', frequencies)
+        self.assertEqual(frequencies['delta'], 1)
+        self.assertEqual(frequencies['epsilon'], 1)
+        self.assertEqual(frequencies['gamma'], 1)
+
+        # Nothing changed since, so the next run has no work
+        _, analyzed, removed, _ = self.run_analyzer(analyzer.state, use_cache)
+        self.assertEqual((analyzed, removed), (set(), []))
+
+    def test_stat_based_update(self):
+        first = self.run_analyzer()[0]
+        self.assertIsNone(first.state.commit)
+        self.modify()
+        self.assert_incremental_update(first)
+
+    def test_update_without_cache_retracts_frequencies(self):
+        first = self.run_analyzer(use_cache=False)[0]
+        self.assertEqual(len(first.state.file_tokens), 3)
+        self.modify()
+        self.assert_incremental_update(first, use_cache=False)
+
+    def test_file_frequencies_kept_only_on_request(self):
+        analyzer = CodeAnalyzer(self.source_dir, self.output_dir, ['.py'], 0, True, True)
+        analyzer.run()
+        self.assertIsNone(analyzer.state.file_tokens)
+
+    @unittest.skipIf(shutil.which('git') is None, "git is not installed")
+    def test_git_diff_update(self):
+        git = ['git', '-C', self.source_dir, '-c', 'user.name=test', '-c', 'user.email=test@example.com']
+        subprocess.run(git + ['init', '-q'], check=True)
+        subprocess.run(git + ['add', '.'], check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'initial'], check=True)
+        first = self.run_analyzer()[0]
+        self.assertIsNotNone(first.state.commit)
+
+        self.modify()
+        subprocess.run(git + ['add', '-A', 'a.py', 'b.py'], check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'change'], check=True)
+        changes = git_changes(self.source_dir, first.state.commit)
+        self.assertEqual(changes.deleted, {os.path.join(self.source_dir, "b.py")})
+        # d.py is untracked but still reported
+        self.assertIn(os.path.join(self.source_dir, "d.py"), changes.changed)
+        self.assert_incremental_update(first)
+
+    @unittest.skipIf(shutil.which('git') is None, "git is not installed")
+    def test_reverted_file_is_reanalyzed(self):
+        git = ['git', '-C', self.source_dir, '-c', 'user.name=test', '-c', 'user.email=test@example.com']
+        subprocess.run(git + ['init', '-q'], check=True)
+        subprocess.run(git + ['add', '.'], check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'initial'], check=True)
+        a = os.path.join(self.source_dir, "a.py")
+        write(a, "import os\nimport json\nalpha = 1\n")
+        first = self.run_analyzer()[0]
+        self.assertEqual(first.state.results[a]['dependencies'], ['json', 'os'])
+
+        subprocess.run(git + ['checkout', '-q', 'a.py'], check=True)
+        stat = os.stat(a)
+        os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        analyzer, analyzed, _, results = self.run_analyzer(first.state)
+        self.assertEqual(analyzed, {a})
+        self.assertEqual(results[a]['dependencies'], ['os'])
+
+    def test_summary_accumulator_replaces_and_removes(self):
+        summary = SummaryAccumulator()
+        summary.add('a.py', {'lines_of_code': 10, 'complexity': 2, 'dependencies': ['os']})
+        summary.add('b.py', {'lines_of_code': 5, 'complexity': 4, 'dependencies': ['os', 'json']})
+        summary.add('a.py', {'lines_of_code': 3, 'complexity': 1, 'dependencies': ['re']})
+        self.assertEqual((summary.total_files, summary.total_lines, summary.total_complexity), (2, 8, 5))
+        self.assertEqual(set(summary.dependencies), {'os', 'json', 're'})
+
+        summary.remove('b.py')
+        self.assertEqual((summary.total_files, summary.total_lines, summary.total_complexity), (1, 3, 1))
+        self.assertEqual(set(summary.dependencies), {'re'})
+
+if __name__ == '__main__':
+    unittest.main()
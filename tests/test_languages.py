@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.analysis.languages import default_registry, PLAIN_TEXT
+from src.analysis.file_analyzer import FileAnalyzer
+from src.analysis.pipeline import AnalysisPipeline
+
+class TestLanguageRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = default_registry()
+
+    def analyze(self, file_path, code):
+        return self.registry.for_path(file_path).analyze(code)
+
+    def test_dispatch_by_extension(self):
+        self.assertEqual(self.registry.for_path("a/b.py").name, "python")
+        self.assertEqual(self.registry.for_path("App.TSX").name, "javascript")
+        self.assertEqual(self.registry.for_path("main.cpp").name, "c")
+        self.assertEqual(self.registry.for_path("README").name, "text")
+        self.assertIs(self.registry.for_path("notes.txt"), PLAIN_TEXT)
+        # Content without a path keeps the historical Python behaviour
+        self.assertEqual(self.registry.for_path(None).name, "python")
+
+    def test_javascript(self):
+        code = '''
+import React, { useState } from "react";
+import './style.css';
+const fs = require('fs');
+export { helper } from "./helper";
+// if (commented) { import "nope"; }
+const label = "if for while";
+function load(a) { if (a) { return 1; } }
+class Store {
+  async fetch(url) {
+    for (const x of url) {}
+  }
+}
+const double = (x) => x * 2;
+'''
+        result = self.analyze("app.js", code)
+        self.assertEqual(result["dependencies"], ['./helper', './style.css', 'fs', 'react'])
+        # function, if, method, for, arrow
+        self.assertEqual(result["complexity"], 6)
+
+    def test_java(self):
+        code = '''
+import java.util.*;
+import static java.lang.Math.max;
+public class Parser {
+    /* if while */
+    public static int parse(String s) throws IOException {
+        if (s == null) { return 0; } else if (s.isEmpty()) { return 1; }
+        char brace = '{';
+        for (int i = 0; i < 3; i++) {}
+        return 2;
+    }
+    public Parser(int x) {
+        while (x > 0) x--;
+    }
+}
+'''
+        result = self.analyze("Parser.java", code)
+        self.assertEqual(result["dependencies"], ['java.lang.Math.max', 'java.util'])
+        # two methods, two ifs, for, while
+        self.assertEqual(result["complexity"], 7)
+
+    def test_c_family(self):
+        code = '''
+#include <vector>
+#include "parser.h"
+int main(int argc, char** argv)
+{
+    if (argc > 1) return 1;
+    return 0;
+}
+std::string Parser::name() const {
+    for (auto& part : parts) {}
+}
+'''
+        result = self.analyze("main.cpp", code)
+        self.assertEqual(result["dependencies"], ['parser.h', 'vector'])
+        self.assertEqual(result["complexity"], 5)
+
+    def test_go_import_block(self):
+        code = '''
+package main
+import "fmt"
+import (
+    "os"
+    str "strings"
+)
+func main() {
+    if true { fmt.Println("for") }
+}
+'''
+        result = self.analyze("main.go", code)
+        self.assertEqual(result["dependencies"], ['fmt', 'os', 'strings'])
+        self.assertEqual(result["complexity"], 3)
+
+    def test_rust_lifetimes_are_not_strings(self):
+        code = '''
+use std::collections::HashMap;
+use std::{io, fs};
+fn longest<'a>(x: &'a str) -> &'a str {
+    if x.len() > 0 { x } else { "while" }
+}
+'''
+        result = self.analyze("lib.rs", code)
+        self.assertEqual(result["dependencies"], ['std', 'std::collections::HashMap'])
+        self.assertEqual(result["complexity"], 3)
+
+    def test_markup_and_styles(self):
+        html = '<script src="app.js"></script><link href="site.css"><!-- <script src="old.js"> -->'
+        self.assertEqual(self.analyze("index.html", html), {"dependencies": ['app.js', 'site.css'], "complexity": 1})
+        css = '@import url("base.css"); @import \'theme.css\'; /* @import "old.css"; */'
+        self.assertEqual(self.analyze("site.css", css)["dependencies"], ['base.css', 'theme.css'])
+
+    def test_python_syntax_error_falls_back(self):
+        code = 'import os, sys\nfrom pkg.mod import name\nprint "python 2"\ndef f():\n    if x: pass\n'
+        result = self.analyze("legacy.py", code)
+        self.assertEqual(result, {"dependencies": ['os', 'pkg.mod', 'sys'], "complexity": 3})
+
+    def test_comment_stripping_keeps_strings(self):
+        language = self.registry.for_path("a.js")
+        self.assertEqual(language.strip_comments('x = "// kept"; // dropped\n/* gone */y'), 'x = "// kept"; \ny')
+
+class TestMixedLanguageAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(self.output_dir)
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        os.makedirs(self.source_dir)
+        files = {
+            "app.py": "import os\n\ndef f(x):\n    if x:\n        return 1\n",
+            "web.js": "import fs from 'fs';\nfunction g(y) { if (y) {} }\n",
+            "Main.java": "import java.util.List;\nclass Main { int f() { return 0; } }\n",
+            "broken.py": "def (:\n",
+            "style.css": "body { color: red; }\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.source_dir, name), 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_mixed_directory_in_one_pass(self):
+        pipeline = AnalysisPipeline(self.source_dir, self.output_dir, ['.py', '.js', '.java', '.css'], 0,
+                                    True, False, use_cache=False)
+        results = pipeline.analyze_directory(self.source_dir)
+        by_name = {os.path.basename(path): result for path, result in results.items()}
+        self.assertEqual(len(by_name), 5)
+        self.assertEqual(by_name["app.py"]["language"], "python")
+        self.assertEqual(by_name["web.js"]["dependencies"], ['fs'])
+        self.assertEqual(by_name["web.js"]["complexity"], 3)
+        self.assertEqual(by_name["Main.java"]["dependencies"], ['java.util.list'])
+        self.assertEqual(by_name["broken.py"]["complexity"], 2)
+        self.assertEqual(by_name["style.css"]["language"], "css")
+
+    def test_cache_key_depends_on_language(self):
+        analyzer = FileAnalyzer(True, True)
+        content = "import os\n"
+        self.assertNotEqual(analyzer.content_key(content, "a.py"), analyzer.content_key(content, "a.js"))
+        self.assertEqual(analyzer.content_key(content, "a.py"), analyzer.content_key(content, "b.py"))
+
+if __name__ == '__main__':
+    unittest.main()
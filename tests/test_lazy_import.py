@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+from unittest.mock import patch
+from src.utils.lazy_import import LazyImport, lazy_import, warm_up
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["openai", "anthropic", "transformers", "torch", "matplotlib", "networkx", "wordcloud"]
+# Generous ceiling for importing the GUI and LLM modules; with the heavy
+# libraries imported eagerly this took several seconds
+STARTUP_IMPORT_BUDGET = 3.0
+
+module_proxy = lazy_import("json")
+function_proxy = lazy_import("json", "dumps")
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_is_deferred_until_first_use(self):
+        proxy = LazyImport("colorsys")
+        sys.modules.pop("colorsys", None)
+        self.assertFalse(proxy.loaded)
+        self.assertNotIn("colorsys", sys.modules)
+
+        self.assertEqual(proxy.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(proxy.loaded)
+        self.assertIn("colorsys", sys.modules)
+
+    def test_attribute_proxy_is_callable(self):
+        self.assertEqual(function_proxy([1, 2]), "[1, 2]")
+
+    def test_patch_through_proxy(self):
+        with patch("tests.test_lazy_import.module_proxy.dumps", return_value="patched"):
+            self.assertEqual(module_proxy.dumps({}), "patched")
+        self.assertEqual(module_proxy.dumps({}), "{}")
+
+    def test_warm_up_skips_missing_modules(self):
+        self.assertEqual(warm_up(["json", "no_such_module_here", function_proxy]),
+                         ["json", repr(function_proxy)])
+
+    def test_warm_up_stops_between_modules(self):
+        checks = []
+
+        def should_stop():
+            checks.append(None)
+            return len(checks) > 1
+
+        self.assertEqual(warm_up(["json", "os", "sys"], should_stop), ["json"])
+
+class TestStartupImports(unittest.TestCase):
+    def measure_import(self, modules):
+        code = ("import sys, time, json; started = time.perf_counter(); "
+                + "; ".join(f"import {module}" for module in modules)
+                + "; print(json.dumps({'seconds': time.perf_counter() - started, "
+                f"'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                   capture_output=True, text=True, timeout=120)
+        if completed.returncode != 0:
+            self.skipTest(f"could not import {modules}: {completed.stderr.strip().splitlines()[-1:]}")
+        return json.loads(completed.stdout)
+
+    def test_llm_modules_defer_client_libraries(self):
+        measured = self.measure_import(["src.llm.feature_suggester", "src.llm.feature_developer"])
+        self.assertEqual(measured["loaded"], [])
+        self.assertLess(measured["seconds"], STARTUP_IMPORT_BUDGET)
+
+    def test_main_window_import_skips_heavy_libraries(self):
+        measured = self.measure_import(["src.gui.main_window"])
+        self.assertEqual(measured["loaded"], [])
+        self.assertLess(measured["seconds"], STARTUP_IMPORT_BUDGET)
+
+if __name__ == '__main__':
+    unittest.main()
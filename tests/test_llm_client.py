@@ -0,0 +1,161 @@
+import json
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.llm.llm_client import LLMClient, LLMRequestError, RateLimiter
+from src.llm.feature_suggester import FeatureSuggester
+
+TOKENS = ["[{'name': 'A', ", "'description': 'first'}", "]"]
+
+# Stands in for both providers: streams TOKENS as server-sent events in the
+# request's provider format, one chunk per event
+class MockProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    requests_seen = []
+    failures_left = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.requests_seen.append((self.path, dict(self.headers), body))
+            fail = cls.failures_left > 0
+            if fail:
+                cls.failures_left -= 1
+        if fail:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        prompt = body["messages"][-1]["content"]
+        tokens = [prompt] if prompt.startswith("echo") else TOKENS
+        if self.path.endswith("/chat/completions"):
+            events = [{"choices": [{"delta": {"content": token}}]} for token in tokens]
+            lines = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        else:
+            events = [{"type": "message_start"}]
+            events += [{"type": "content_block_delta", "delta": {"type": "text_delta", "text": token}}
+                       for token in tokens]
+            events.append({"type": "message_stop"})
+            lines = [f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events]
+        for line in lines:
+            data = line.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+            threading.Event().wait(0.01)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+class TestLLMClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), MockProviderHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_base = f"http://127.0.0.1:{cls.server.server_address[1]}/v1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        MockProviderHandler.requests_seen = []
+        MockProviderHandler.failures_left = 0
+        self.sleeps = []
+
+    def client(self, provider, **kwargs):
+        client = LLMClient(provider, "test-key", api_base=self.api_base, sleep=self.sleeps.append, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_openai_tokens_are_streamed(self):
+        tokens = []
+        text = self.client("OpenAI").complete("hi", system="be brief", on_token=tokens.append)
+
+        self.assertEqual(tokens, TOKENS)
+        self.assertEqual(text, "".join(TOKENS))
+        path, headers, body = MockProviderHandler.requests_seen[0]
+        self.assertEqual(path, "/v1/chat/completions")
+        self.assertEqual(headers["Authorization"], "Bearer test-key")
+        self.assertEqual(body["messages"][0], {"role": "system", "content": "be brief"})
+        self.assertTrue(body["stream"])
+
+    def test_claude_tokens_are_streamed(self):
+        tokens = []
+        text = self.client("Claude").complete("hi", max_tokens=50, on_token=tokens.append)
+
+        self.assertEqual(text, "".join(TOKENS))
+        self.assertEqual(tokens, TOKENS)
+        path, headers, body = MockProviderHandler.requests_seen[0]
+        self.assertEqual(path, "/v1/messages")
+        self.assertEqual(headers["x-api-key"], "test-key")
+        self.assertEqual(body["max_tokens"], 50)
+
+    def test_throttled_requests_are_retried(self):
+        MockProviderHandler.failures_left = 2
+        self.assertEqual(self.client("OpenAI").complete("hi"), "".join(TOKENS))
+        self.assertEqual(len(MockProviderHandler.requests_seen), 3)
+        self.assertEqual(self.sleeps, [0.0, 0.0])
+
+    def test_gives_up_after_max_retries(self):
+        MockProviderHandler.failures_left = 5
+        with self.assertRaises(LLMRequestError):
+            self.client("OpenAI", max_retries=1).complete("hi")
+        self.assertEqual(len(MockProviderHandler.requests_seen), 2)
+
+    def test_prompts_run_concurrently_in_order(self):
+        client = self.client("OpenAI", max_concurrency=3, requests_per_minute=6000)
+        lock = threading.Lock()
+        active = [0, 0]
+        complete = client.complete
+
+        def counting_complete(*args, **kwargs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            try:
+                return complete(*args, **kwargs)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        client.complete = counting_complete
+        prompts = [f"echo {i}" for i in range(6)]
+        self.assertEqual(client.complete_many(prompts), prompts)
+        self.assertEqual(len(MockProviderHandler.requests_seen), 6)
+        self.assertLessEqual(active[1], 3)
+        self.assertGreater(active[1], 1)
+
+    def test_feature_suggester_streams_through_client(self):
+        suggester = FeatureSuggester("OpenAI", "test-key", llm_client=self.client("OpenAI"))
+        tokens = []
+        suggester.token_received.connect(tokens.append)
+        self.assertEqual(suggester.generate_suggestions(), [{'name': 'A', 'description': 'first'}])
+        self.assertEqual(tokens, TOKENS)
+
+class TestRateLimiter(unittest.TestCase):
+    def test_waits_for_tokens_to_refill(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.file_analyzer import FileAnalyzer
+from src.utils.metrics import Metrics, NULL_METRICS
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(self.source_dir)
+        for i in range(4):
+            with open(os.path.join(self.source_dir, f"module_{i}.py"), 'w') as f:
+                f.write("import os\n# note\ndef f(x):\n    return x\n" * (i + 1))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_timers_counters_and_slowest(self):
+        metrics = Metrics(slowest=2)
+        with metrics.timer("stage", file="a.py"):
+            pass
+        with metrics.timer("stage"):
+            pass
+        metrics.count("items", 3)
+        for i, seconds in enumerate([0.3, 0.1, 0.5]):
+            metrics.record_file(f"f{i}.py", seconds)
+        self.assertEqual(list(metrics.timed_iter("produce", range(3))), [0, 1, 2])
+
+        data = metrics.to_dict()
+        self.assertEqual(data["timers"]["stage"]["calls"], 2)
+        self.assertEqual(data["timers"]["produce"]["calls"], 4)
+        self.assertEqual(data["counters"], {"items": 3, "files": 3})
+        self.assertEqual([entry["path"] for entry in data["slowest_files"]], ["f2.py", "f0.py"])
+        self.assertEqual(metrics.trace_events[0]["args"], {"file": "a.py"})
+
+    def test_analyzer_writes_metrics_and_trace(self):
+        metrics = Metrics(profile_every=2)
+        analyzer = CodeAnalyzer(self.source_dir, self.output_dir, ['.py'], 0, False, True, metrics=metrics)
+        log = []
+        analyzer.analysis_progress.connect(log.append)
+        analyzer.run()
+
+        with open(os.path.join(self.output_dir, "analysis_metrics.json")) as f:
+            data = json.load(f)
+        for stage in ("walk", "read", "parse", "visit", "remove_comments", "tokenize", "merge_tokens"):
+            self.assertIn(stage, data["timers"])
+        self.assertEqual(data["counters"]["files"], 4)
+        self.assertEqual(data["profiled_files"], 2)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "analysis_profile.prof")))
+        with open(os.path.join(self.output_dir, "analysis_trace.json")) as f:
+            trace = json.load(f)
+        self.assertTrue(all(event["ph"] == "X" for event in trace["traceEvents"]))
+        # Progress lines arrive batched, several to a message
+        self.assertTrue(any(line.startswith("[metrics] parse:") for line in "\n".join(log).splitlines()))
+
+    def test_disabled_by_default(self):
+        analyzer = CodeAnalyzer(self.source_dir, self.output_dir, ['.py'], 0, True, True)
+        self.assertIs(analyzer.metrics, NULL_METRICS)
+        analyzer.run()
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "analysis_metrics.json")))
+
+    def test_metrics_stay_in_parent_process(self):
+        analyzer = FileAnalyzer(True, True, Metrics(profile_every=1))
+        copy = pickle.loads(pickle.dumps(analyzer))
+        self.assertIs(copy.metrics, NULL_METRICS)
+        self.assertIsInstance(analyzer.metrics, Metrics)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src.llm.model_registry import ModelRegistry, ModelWorker, resolve_model_path
+
+# Picklable stand-in for transformers.pipeline, for the worker process
+def echo_pipeline(task, model):
+    def generate(prompts, **kwargs):
+        if isinstance(prompts, str):
+            return [{'generated_text': f"{model}:{prompts}"}]
+        return [[{'generated_text': f"{model}:{prompt}"}] for prompt in prompts]
+    return generate
+
+# Like a gpt2 text-generation pipeline: no pad token, so no batching
+class UnpaddedPipeline:
+    def __init__(self):
+        self.tokenizer = SimpleNamespace(pad_token_id=None, padding_side="right")
+        self.model = SimpleNamespace(config=SimpleNamespace(eos_token_id=50256))
+
+    def __call__(self, prompts, batch_size=1, **kwargs):
+        if batch_size > 1 and self.tokenizer.pad_token_id is None:
+            raise ValueError("Pipeline with tokenizer without pad_token cannot do batching")
+        return [[{'generated_text': prompt}] for prompt in prompts]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.registry = ModelRegistry(idle_timeout=0, clock=self.clock)
+        self.factory = MagicMock(side_effect=echo_pipeline)
+
+    def test_model_is_loaded_once(self):
+        self.assertEqual(self.registry.generate(["a"], "tiny", factory=self.factory), ["tiny:a"])
+        self.assertEqual(self.registry.generate(["b"], "tiny", factory=self.factory), ["tiny:b"])
+        self.factory.assert_called_once_with("text-generation", model="tiny")
+        self.assertEqual(self.registry.loaded_models(), [("text-generation", "tiny")])
+
+    def test_prompts_are_batched_into_one_call(self):
+        generator = MagicMock(return_value=[[{'generated_text': "x"}], [{'generated_text': "y"}]])
+        texts = self.registry.generate(["1", "2"], "tiny", factory=MagicMock(return_value=generator))
+        self.assertEqual(texts, ["x", "y"])
+        generator.assert_called_once_with(["1", "2"], batch_size=2)
+
+    def test_tokenizer_without_pad_token_can_batch(self):
+        generator = UnpaddedPipeline()
+        texts = self.registry.generate(["1", "2"], "gpt2", factory=MagicMock(return_value=generator))
+        self.assertEqual(texts, ["1", "2"])
+        self.assertEqual((generator.tokenizer.pad_token_id, generator.tokenizer.padding_side), (50256, "left"))
+
+    def test_idle_models_are_evicted(self):
+        self.registry.idle_timeout = 60
+        self.registry.generate(["a"], "tiny", factory=self.factory)
+        self.clock.now = 30
+        self.assertEqual(self.registry.evict_idle(), 0)
+        self.clock.now = 90
+        self.assertEqual(self.registry.evict_idle(), 1)
+        self.assertEqual(self.registry.loaded_models(), [])
+
+        self.registry.generate(["a"], "tiny", factory=self.factory)
+        self.assertEqual(self.factory.call_count, 2)
+
+    def test_local_model_directory_is_used_as_is(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            self.assertEqual(resolve_model_path(model_dir), model_dir)
+        self.assertEqual(resolve_model_path("no-such-org/no-such-model"), "no-such-org/no-such-model")
+
+    def test_worker_process_keeps_its_own_registry(self):
+        worker = ModelWorker("tiny", factory=echo_pipeline)
+        try:
+            self.assertEqual(worker.generate(["a", "b"]), ["tiny:a", "tiny:b"])
+            self.assertEqual(worker.generate(["c"]), ["tiny:c"])
+        finally:
+            worker.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
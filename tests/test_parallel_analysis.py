@@ -0,0 +1,45 @@
+import unittest
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.parallel import iter_chunks, default_chunk_size
+import tempfile
+import shutil
+import os
+
+class TestParallelAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(6):
+            with open(os.path.join(self.temp_dir, f"module_{i}.py"), 'w') as f:
+                f.write(f'''
+import os
+import json
+
+def function_{i}(x):
+    if x > {i}:
+        for item in range(x):
+            print(item)
+    return x
+''')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_matches_serial(self):
+        serial = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, False, False)
+        parallel = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, False, False, workers=2, chunk_size=2)
+
+        serial_results = serial.analyze_directory(self.temp_dir)
+        parallel_results = parallel.analyze_directory(self.temp_dir)
+
+        self.assertEqual(len(parallel_results), 6)
+        self.assertEqual(list(serial_results.keys()), list(parallel_results.keys()))
+        self.assertEqual(serial_results, parallel_results)
+
+    def test_iter_chunks(self):
+        chunks = list(iter_chunks(list(range(5)), 2))
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4]])
+
+    def test_default_chunk_size(self):
+        self.assertEqual(default_chunk_size(10, 4), 1)
+        self.assertEqual(default_chunk_size(800, 2), 100)
+        self.assertEqual(default_chunk_size(10 ** 6, 2), 256)
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.utils.progress import ProgressReporter
+from src.analysis.pipeline import AnalysisPipeline
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestProgressReporter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.messages = []
+        self.progress = []
+        self.reporter = ProgressReporter(self.messages.append, lambda done, total: self.progress.append((done, total)),
+                                         interval=0.1, clock=self.clock)
+
+    def test_events_are_flushed_at_a_fixed_rate(self):
+        self.reporter.set_total(1000)
+        for i in range(1000):
+            self.reporter.advance(f"file_{i}.py")
+            if i % 10 == 0:
+                self.reporter.message(f"checkpoint {i}")
+            self.clock.now += 0.001
+        self.reporter.close()
+
+        # One second of work at 10 flushes a second, plus the first and last
+        self.assertLessEqual(len(self.progress), 12)
+        self.assertEqual(self.progress[0], (0, 1000))
+        self.assertEqual(self.progress[-1], (1000, 1000))
+        lines = "\n".join(self.messages).splitlines()
+        self.assertEqual(lines, [f"checkpoint {i}" for i in range(0, 1000, 10)])
+        self.assertLessEqual(len(self.messages), 12)
+
+    def test_status_and_percent(self):
+        self.assertIsNone(self.reporter.percent())
+        self.reporter.set_total(4)
+        self.reporter.advance("a.py")
+        self.assertEqual(self.reporter.percent(), 25.0)
+        self.assertEqual(self.reporter.status(), "1/4 files (25%), last: a.py")
+
+    def test_unchanged_counts_are_not_resent(self):
+        self.reporter.set_total(2)
+        self.reporter.flush(force=True)
+        self.assertEqual(self.progress, [(0, 2)])
+
+class TestPipelineProgress(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(30):
+            with open(os.path.join(self.temp_dir, f"module_{i}.py"), 'w') as f:
+                f.write(f"import os\n\ndef f_{i}(x):\n    return x\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_reports_against_precounted_total(self):
+        messages, progress = [], []
+        pipeline = AnalysisPipeline(self.temp_dir, None, ['.py'], 0, True, False, progress=messages.append,
+                                    on_progress=lambda done, total: progress.append((done, total)),
+                                    progress_interval=60)
+        pipeline.run()
+
+        self.assertEqual(progress, [(0, 30), (30, 30)])
+        self.assertFalse(any("module_" in message for message in messages))
+
+if __name__ == '__main__':
+    unittest.main()
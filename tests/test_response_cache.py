@@ -0,0 +1,124 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from src.llm.response_cache import ResponseCache, request_key
+from src.llm.feature_developer import FeatureDeveloper
+
+class FakeProvider:
+    def __init__(self, release=None):
+        self.calls = 0
+        self.release = release
+
+    def complete(self, prompt):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return f"answer to {prompt}"
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "responses.sqlite")
+        self.now = 1000.0
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def open_cache(self, **kwargs):
+        return ResponseCache(self.db_path, clock=lambda: self.now, **kwargs)
+
+    def test_response_survives_reopening(self):
+        provider = FakeProvider()
+        cache = self.open_cache()
+        first = cache.fetch("Fake", "m", "hello", {}, lambda: provider.complete("hello"))
+        cache.close()
+
+        cache = self.open_cache()
+        second = cache.fetch("Fake", "m", "hello", {}, lambda: provider.complete("hello"))
+        cache.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(provider.calls, 1)
+
+    def test_key_includes_model_and_parameters(self):
+        self.assertNotEqual(request_key("Fake", "a", "p", {}), request_key("Fake", "b", "p", {}))
+        self.assertNotEqual(request_key("Fake", "a", "p", {"t": 1}), request_key("Fake", "a", "p", {"t": 2}))
+        self.assertEqual(request_key("Fake", "a", "p", {"x": 1, "y": 2}), request_key("Fake", "a", "p", {"y": 2, "x": 1}))
+
+    def test_expired_responses_are_refetched(self):
+        provider = FakeProvider()
+        cache = self.open_cache(ttl=60)
+        cache.fetch("Fake", "m", "hello", {}, lambda: provider.complete("hello"))
+        self.now += 61
+        cache.fetch("Fake", "m", "hello", {}, lambda: provider.complete("hello"))
+        cache.close()
+        self.assertEqual(provider.calls, 2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self.open_cache(max_entries=2)
+        for prompt in ("a", "b", "c"):
+            self.now += 1
+            cache.put(request_key("Fake", "m", prompt), prompt)
+        self.now += 1
+        cache.get(request_key("Fake", "m", "a"))
+
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get(request_key("Fake", "m", "b")))
+        self.assertEqual(cache.get(request_key("Fake", "m", "a")), "a")
+        cache.close()
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        release = threading.Event()
+        provider = FakeProvider(release)
+        cache = self.open_cache()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cache.fetch("Fake", "m", "hello", {}, lambda: provider.complete("hello")))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while provider.calls == 0:
+            release.wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        cache.close()
+
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(results, ["answer to hello"] * 4)
+
+    def test_failed_request_is_not_cached(self):
+        def unavailable():
+            raise RuntimeError("provider down")
+
+        cache = self.open_cache()
+        with self.assertRaises(RuntimeError):
+            cache.fetch("Fake", "m", "hello", {}, unavailable)
+        self.assertEqual(cache.fetch("Fake", "m", "hello", {}, lambda: "ok"), "ok")
+        cache.close()
+
+    def test_reply_that_does_not_parse_is_not_cached(self):
+        replies = iter(["not json", '{"a": 1}'])
+        cache = self.open_cache()
+        self.assertEqual(cache.fetch("Fake", "m", "hello", {}, lambda: next(replies), json.loads), "not json")
+        self.assertEqual(cache.fetch("Fake", "m", "hello", {}, lambda: next(replies), json.loads), '{"a": 1}')
+        self.assertEqual(cache.fetch("Fake", "m", "hello", {}, lambda: "unused", json.loads), '{"a": 1}')
+        cache.close()
+
+    @patch('src.llm.feature_developer.anthropic.Client')
+    def test_feature_developer_reuses_cached_completion(self, mock_client):
+        mock_client.return_value.completion.return_value.completion = '{"method": "def m(self):\\n    pass", "additions": ""}'
+        cache = self.open_cache()
+        developer = FeatureDeveloper({"name": "Test", "description": "d"}, "Claude", "key", cache)
+        first = developer.develop_feature()
+        second = developer.develop_feature()
+        cache.close()
+
+        self.assertEqual(first, second)
+        mock_client.return_value.completion.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
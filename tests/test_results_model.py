@@ -0,0 +1,122 @@
+import time
+import unittest
+from PyQt6.QtCore import Qt, QCoreApplication, QModelIndex, QPersistentModelIndex
+from src.gui.results_model import ResultsModel, FETCH_BATCH, SORT_ROLE
+
+try:
+    from PyQt6.QtTest import QAbstractItemModelTester
+except ImportError:
+    QAbstractItemModelTester = None
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+def make_results(count, offset=0):
+    return {f"src/module_{i:06d}.py": {"complexity": (i * 7) % 50, "lines_of_code": i % 300, "word_count": i,
+                                       "dependencies": ["os", f"dep_{i % 5}"], "word_frequencies": {"x": 1}}
+            for i in range(offset, offset + count)}
+
+class TestResultsModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ResultsModel()
+
+    def check_contract(self):
+        # Checks every signal and index the model produces from here on. Only
+        # for models under one page: the tester calls fetchMore while a reset
+        # is still in flight and then reports the insert as overlapping it.
+        if QAbstractItemModelTester is not None:
+            self.tester = QAbstractItemModelTester(
+                self.model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+
+    def test_rows_are_fetched_in_pages(self):
+        self.model.set_results(make_results(FETCH_BATCH * 2 + 10))
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+        self.model.fetchMore(QModelIndex())
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH * 2 + 10)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+    def test_dependencies_are_child_rows(self):
+        self.check_contract()
+        self.model.set_results(make_results(3))
+        parent = self.model.index(1, 0)
+        self.assertEqual(self.model.rowCount(parent), 2)
+        child = self.model.index(1, 0, parent)
+        self.assertEqual(child.data(), "dep_1")
+        self.assertEqual(self.model.parent(child), parent)
+        self.assertEqual(self.model.index(1, 4).data(), "2")
+
+    def test_word_frequencies_are_not_kept(self):
+        self.model.set_results(make_results(1))
+        self.assertEqual(self.model._files["src/module_000000.py"], (0, 0, 0, ("os", "dep_0")))
+
+    def test_sort_and_filter_keep_selection(self):
+        self.check_contract()
+        self.model.set_results(make_results(50))
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        complexities = [self.model.index(row, 1).data(SORT_ROLE) for row in range(self.model.rowCount())]
+        self.assertEqual(complexities, sorted(complexities, reverse=True))
+
+        tracked = QPersistentModelIndex(self.model.index(10, 0))
+        path = tracked.data()
+        self.model.sort(0, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(tracked.data(), path)
+
+        self.model.set_filter("module_00001", min_complexity=20)
+        paths = self.model.visible_paths()
+        self.assertTrue(paths)
+        self.assertTrue(all("module_00001" in p and self.model._files[p][0] >= 20 for p in paths))
+
+    def test_batches_update_and_remove_in_place(self):
+        self.check_contract()
+        self.model.sort(1, Qt.SortOrder.AscendingOrder)
+        self.model.update_results(make_results(10))
+        self.model.update_results(make_results(10, offset=10))
+        self.assertEqual(self.model.rowCount(), 20)
+
+        changed = {"src/module_000003.py": {"complexity": 99, "lines_of_code": 1, "word_count": 1,
+                                            "dependencies": ["json"]}}
+        self.model.update_results(changed)
+        last = self.model.index(19, 0)
+        self.assertEqual(last.data(), "src/module_000003.py")
+        self.assertEqual(self.model.index(0, 0, last).data(), "json")
+
+        self.model.remove_files(["src/module_000003.py", "src/missing.py"])
+        self.assertEqual(self.model.rowCount(), 19)
+        self.assertIsNone(self.model.row_of("src/module_000003.py"))
+
+    def test_removal_from_a_model_with_several_pages(self):
+        results = make_results(FETCH_BATCH + 500)
+        self.model.set_results(results)
+        paths = sorted(results)
+        removed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        last_visible = QPersistentModelIndex(self.model.index(FETCH_BATCH - 1, 0))
+        # One visible row and one past the fetched window
+        self.model.remove_files([paths[10], paths[FETCH_BATCH + 100]])
+        self.assertEqual(removed, [(10, 10)])
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH - 1)
+        self.assertEqual(last_visible.row(), FETCH_BATCH - 2)
+        self.assertEqual(last_visible.data(), paths[FETCH_BATCH - 1])
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+
+        # The tester fetches the remaining pages when attached, then checks
+        # the next removal
+        self.check_contract()
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH + 498)
+        self.model.remove_files([paths[FETCH_BATCH]])
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH + 497)
+
+    def test_large_result_set_is_fast(self):
+        results = make_results(100000)
+        started = time.perf_counter()
+        self.model.set_results(results)
+        self.model.sort(2, Qt.SortOrder.DescendingOrder)
+        self.model.set_filter("module_09")
+        elapsed = time.perf_counter() - started
+        self.assertEqual(self.model.file_count(), 100000)
+        self.assertEqual(len(self.model.visible_paths()), 10000)
+        self.assertLess(elapsed, 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
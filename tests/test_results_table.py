@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.analysis.results_table import ResultsTable
+from src.analysis.summary import SummaryAccumulator
+
+class TestResultsTable(unittest.TestCase):
+    def setUp(self):
+        self.results = {
+            "a.py": {"language": "python", "lines_of_code": 10, "word_count": 40, "complexity": 3,
+                     "dependencies": ["os", "sys"]},
+            "b.js": {"language": "javascript", "lines_of_code": 30, "word_count": 90, "complexity": 7,
+                     "dependencies": ["fs"]},
+            "broken.py": None,
+            "c.py": {"language": "python", "lines_of_code": 20, "word_count": 10, "complexity": 3,
+                     "dependencies": ["os"]},
+            "d.py": {"lines_of_code": 5, "complexity": 1, "dependencies": []},
+        }
+        self.table = ResultsTable.from_results(self.results)
+
+    def test_columns(self):
+        self.assertEqual(self.table.paths, ["a.py", "b.js", "c.py", "d.py"])
+        self.assertEqual(self.table.column("word_count").tolist(), [40, 90, 10, 0])
+        self.assertEqual(self.table.dependencies_of(0), ["os", "sys"])
+        self.assertEqual(self.table.dependency_counts(), {"os": 2, "sys": 1, "fs": 1})
+        self.assertEqual(self.table.language_counts(), {"python": 2, "javascript": 1})
+        with self.assertRaises(ValueError):
+            self.table.column("dependencies")
+
+    def test_statistics(self):
+        statistics = self.table.statistics()
+        self.assertEqual(statistics["files"], 4)
+        self.assertEqual(statistics["lines_of_code"]["total"], 65)
+        self.assertEqual(statistics["complexity"]["average"], 3.5)
+        self.assertEqual(statistics["complexity"]["max"], 7)
+        self.assertEqual(statistics["complexity"]["percentiles"]["50"], 3.0)
+        self.assertEqual(statistics["unique_dependencies"], 3)
+
+    def test_ranking_keeps_file_order_for_ties(self):
+        self.assertEqual(self.table.ranking("complexity").tolist(), [1, 0, 2, 3])
+        # The partial ranking agrees with the full one at the tie boundary
+        self.assertEqual(self.table.ranking("complexity", 2).tolist(), [1, 0])
+        self.assertEqual([row["path"] for row in self.table.top("lines_of_code", 2)], ["b.js", "c.py"])
+        self.assertEqual(self.table.ranking("complexity", 0).tolist(), [])
+
+    def test_report_matches_summary_accumulator(self):
+        summary = SummaryAccumulator()
+        summary.update(self.results)
+        self.assertEqual(self.table.report(), summary.report())
+        self.assertEqual(ResultsTable.from_results({}).report(), SummaryAccumulator().report())
+
+    def test_save_and_load(self):
+        output_dir = tempfile.mkdtemp()
+        try:
+            path = self.table.save(output_dir)
+            self.assertEqual(os.path.basename(path), "results_table.npz")
+            loaded = ResultsTable.load(path)
+        finally:
+            shutil.rmtree(output_dir)
+        self.assertEqual(loaded.paths, self.table.paths)
+        self.assertEqual(loaded.statistics(), self.table.statistics())
+        self.assertEqual(loaded.dependencies_of(1), ["fs"])
+        self.assertEqual(loaded.report(), self.table.report())
+
+if __name__ == '__main__':
+    unittest.main()
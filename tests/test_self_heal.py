@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from src.llm.self_heal import (Chunk, build_chunks, heal, parse_file_suggestions, rank_files, split_source,
+                               statement_spans)
+from src.llm.response_cache import ResponseCache
+from src.llm.feature_developer import FeatureDeveloper
+
+def make_function(name, body_lines=20):
+    body = "".join(f"    value_{i} = {i} * x\n" for i in range(body_lines))
+    return f"@decorator\ndef {name}(x):\n{body}    return x\n\n"
+
+# Answers every chunk by upper-casing the code it was sent
+def upper_casing_provider(prompt):
+    file_line, code = prompt.split("File: ", 1)[1].split("\n\n", 1)
+    return json.dumps({file_line.split(" (lines")[0]: code.upper()})
+
+class TestChunking(unittest.TestCase):
+    def test_small_file_is_one_whole_chunk(self):
+        chunks = split_source("a.py", "import os\n", max_chunk_tokens=100)
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].whole_file)
+
+    def test_chunks_follow_statement_boundaries(self):
+        source = "# header\nimport os\n\n" + "".join(make_function(f"f{i}") for i in range(6))
+        chunks = split_source("a.py", source, max_chunk_tokens=300)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunk.text for chunk in chunks), source)
+        boundaries = {start for start, _ in statement_spans(source)}
+        for chunk in chunks:
+            self.assertIn(chunk.start_line, boundaries)
+            self.assertLessEqual(chunk.tokens, 300)
+            self.assertFalse(chunk.whole_file)
+
+    def test_oversized_statement_is_split_by_lines(self):
+        source = make_function("huge", body_lines=400)
+        chunks = split_source("a.py", source, max_chunk_tokens=200)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunk.text for chunk in chunks), source)
+
+    def test_form_feed_does_not_shift_boundaries(self):
+        source = "import os\n\x0c\n" + "".join(make_function(f"f{i}") for i in range(6))
+        chunks = split_source("a.py", source, max_chunk_tokens=300)
+        self.assertEqual("".join(chunk.text for chunk in chunks), source)
+        self.assertGreater(len(chunks), 1)
+        # Every chunk holds whole functions
+        for chunk in chunks:
+            self.assertEqual(chunk.text.count("def "), chunk.text.count("return x"))
+
+    def test_files_ranked_by_complexity_within_token_budget(self):
+        results = {"simple.py": {"complexity": 1, "lines_of_code": 10},
+                   "complex.py": {"complexity": 9, "lines_of_code": 5},
+                   "big.py": {"complexity": 1, "lines_of_code": 50},
+                   "failed.py": None}
+        self.assertEqual(rank_files(results), ["complex.py", "big.py", "simple.py"])
+
+        sources = {"complex.py": "x = 1\n" * 40, "big.py": "y = 2\n" * 400, "simple.py": "z = 3\n"}
+        chunks = build_chunks(results, sources.get, max_chunk_tokens=1000, max_total_tokens=100)
+        self.assertEqual([chunk.file_path for chunk in chunks], ["complex.py", "simple.py"])
+
+    def test_parses_fenced_and_literal_replies(self):
+        self.assertEqual(parse_file_suggestions('Sure:\n```json\n{"a.py": "x = 1"}\n```'), {"a.py": "x = 1"})
+        self.assertEqual(parse_file_suggestions("{'a.py': 'x = 1'}"), {"a.py": "x = 1"})
+        with self.assertRaises(ValueError):
+            parse_file_suggestions("no suggestions")
+
+class TestHeal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = "import os\n\n" + "".join(make_function(f"f{i}") for i in range(6))
+        self.path = os.path.join(self.temp_dir, "module.py")
+        with open(self.path, 'w') as f:
+            f.write(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_chunk_suggestions_are_merged_per_file(self):
+        chunks = split_source(self.path, self.source, max_chunk_tokens=300)
+        merged = heal(chunks, upper_casing_provider, max_workers=4)
+        self.assertEqual(merged, {self.path: self.source.upper()})
+
+    def test_edit_during_heal_is_not_mixed_in(self):
+        chunks = split_source(self.path, self.source, max_chunk_tokens=300)
+
+        def provider(prompt):
+            with open(self.path, 'w') as f:
+                f.write("x = 1\n")
+            return upper_casing_provider(prompt)
+
+        self.assertEqual(heal(chunks, provider, max_workers=1), {self.path: self.source.upper()})
+
+    def test_file_with_a_missing_chunk_is_left_out(self):
+        chunks = split_source(self.path, self.source, max_chunk_tokens=300)
+        failing_line = f"lines {chunks[1].start_line}-"
+
+        def provider(prompt):
+            if failing_line in prompt:
+                return "I can't help with that"
+            return upper_casing_provider(prompt)
+
+        messages = []
+        self.assertEqual(heal(chunks, provider, progress=messages.append), {})
+        self.assertEqual(len(messages), 1)
+
+    def test_time_budget_stops_waiting(self):
+        release = threading.Event()
+
+        def slow_provider(prompt):
+            release.wait(5)
+            return upper_casing_provider(prompt)
+
+        chunks = [Chunk(self.path, 1, 1, "import os\n", True)]
+        started = time.monotonic()
+        try:
+            self.assertEqual(heal(chunks, slow_provider, time_budget=0.1), {})
+        finally:
+            release.set()
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_unchanged_chunks_reuse_cached_answers(self):
+        calls = []
+
+        def provider(prompt):
+            calls.append(prompt)
+            return upper_casing_provider(prompt)
+
+        cache = ResponseCache(os.path.join(self.temp_dir, "responses.sqlite"))
+        developer = FeatureDeveloper({"name": "Self Healing", "description": ""}, "OpenAI", "key", cache,
+                                     analysis_results={self.path: {"complexity": 3, "lines_of_code": 100}},
+                                     max_chunk_tokens=300)
+        developer.complete_with_openai = lambda prompt, stream=True, validate=None: cache.fetch(
+            "OpenAI", "test", prompt, {}, lambda: provider(prompt), validate)
+
+        first = developer.develop_feature()
+        sent = len(calls)
+        with open(self.path, 'a') as f:
+            f.write("def added(x):\n    return x\n")
+        second = developer.develop_feature()
+        cache.close()
+
+        self.assertEqual(first, {self.path: self.source.upper()})
+        self.assertTrue(second[self.path].endswith("DEF ADDED(X):\n    RETURN X\n"))
+        # Only the last chunk changed
+        self.assertEqual(len(calls), sent + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+from src.analysis import code_analyzer
+from src.analysis.code_analyzer import CodeAnalyzer
+from src.analysis.summary import SummaryAccumulator
+import tempfile
+import shutil
+import os
+
+class TestStreamingAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(5):
+            with open(os.path.join(self.temp_dir, f"module_{i}.py"), 'w') as f:
+                f.write(f"import os\n\ndef f(x):\n    if x > {i}:\n        return x\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_directory_yields_per_file(self):
+        analyzer = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, True, True)
+        stream = analyzer.iter_directory(self.temp_dir)
+
+        file_path, result = next(stream)
+        self.assertTrue(file_path.endswith('.py'))
+        self.assertEqual(result['complexity'], 3)
+        self.assertEqual(len(list(stream)), 4)
+
+    def test_run_emits_batches(self):
+        analyzer = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, True, True, batch_size=2)
+        batches = []
+        completed = []
+        analyzer.results_batch.connect(lambda batch: (batches.append(batch), analyzer.acknowledge_batch()))
+        analyzer.analysis_complete.connect(completed.append)
+        analyzer.run()
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(len(completed[0]), 5)
+
+    def test_late_acknowledgements_do_not_raise_the_limit(self):
+        analyzer = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, True, True, batch_size=1,
+                                max_pending_batches=1)
+        batches = []
+        analyzer.results_batch.connect(batches.append)
+        # Nothing acknowledges during the run, so every batch after the first
+        # is sent after a timed-out wait and takes no slot
+        with mock.patch.object(code_analyzer, "BATCH_ACK_TIMEOUT", 0.01):
+            analyzer.run()
+        self.assertEqual(len(batches), 5)
+
+        for _ in batches:
+            analyzer.acknowledge_batch()
+        # One slot again, not five
+        self.assertTrue(analyzer._batch_slots.acquire(blocking=False))
+        self.assertFalse(analyzer._batch_slots.acquire(blocking=False))
+
+    def test_summary_accumulator_matches_report(self):
+        analyzer = CodeAnalyzer(self.temp_dir, self.temp_dir, ['.py'], 1, True, True)
+        results = analyzer.analyze_directory(self.temp_dir)
+        summary = SummaryAccumulator()
+        for file_path, result in results.items():
+            summary.add(file_path, result)
+
+        self.assertEqual(summary.report(), analyzer.generate_summary_report(results))
+        self.assertIn("Total files analyzed: 5", summary.report())
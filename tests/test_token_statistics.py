@@ -0,0 +1,32 @@
+import unittest
+from src.analysis.token_statistics import TokenStatistics
+from src.analysis.file_analyzer import FileAnalyzer
+
+class TestTokenStatistics(unittest.TestCase):
+    def test_file_results_carry_frequencies_not_content(self):
+        result = FileAnalyzer(True, False).analyze_content("import os\nOS = os.path.join(os.sep)\n")
+
+        self.assertNotIn('content', result)
+        self.assertEqual(result['word_frequencies']['os'], 4)
+        self.assertEqual(result['word_frequencies']['import'], 1)
+        self.assertEqual(result['word_count'], 8)
+
+    def test_add_and_remove(self):
+        stats = TokenStatistics()
+        stats.add({'os': 2, 'path': 1})
+        stats.add({'os': 1, 'sys': 4})
+        self.assertEqual(stats.most_common(1), [('sys', 4)])
+        self.assertEqual(stats.frequencies['os'], 3)
+
+        stats.remove({'os': 1, 'sys': 4})
+        self.assertNotIn('sys', stats.frequencies)
+        self.assertEqual(stats.frequencies['os'], 2)
+        self.assertEqual(stats.file_count, 1)
+
+    def test_vocabulary_is_bounded(self):
+        stats = TokenStatistics(max_vocabulary=10)
+        stats.add({'common': 100})
+        for i in range(30):
+            stats.add({f'rare{i}': 1})
+        self.assertLessEqual(len(stats.frequencies), 20)
+        self.assertEqual(stats.frequencies['common'], 100)